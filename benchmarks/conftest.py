@@ -0,0 +1,22 @@
+import pytest
+
+from benchmarks.payloads import SIZES, make_matches
+
+
+@pytest.fixture(params=SIZES, ids=lambda n: f"{n}-matches")
+def matches(request):
+    return make_matches(request.param)
+
+
+@pytest.fixture
+def scored(matches):
+    from dizionaut.services.scoring import score
+
+    return [(t, score(t)) for t in matches]
+
+
+@pytest.fixture(params=SIZES, ids=lambda n: f"{n}-matches")
+def response_body(request):
+    from benchmarks.payloads import make_response
+
+    return make_response(request.param)
@@ -0,0 +1,293 @@
+"""
+End-to-end load test for the bot.
+
+Starts a local stand-in for the MyMemory API, then drives simulated users
+through the full `/start → translate → from: → to: → word` flow by feeding
+updates to a dispatcher built from the bot's routers. Outgoing Bot API calls
+are recorded by a fake session instead of being sent to Telegram.
+
+Usage:
+    PYTHONPATH=src python -m benchmarks.loadtest --users 200 --words 5 \\
+        --latency 80 --error-rate 0.02 --matches 20
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import resource
+import time
+import zlib
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.base import BaseSession
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+from aiohttp import web
+
+from benchmarks.payloads import WORDS, make_matches
+from dizionaut.handlers import errors, start, success, translate
+from dizionaut.services import api
+from dizionaut.services.cache import translation_cache
+
+BOT_USER = User(id=1, is_bot=True, first_name="Dizionaut")
+
+
+class FakeMyMemory:
+    """
+    Local stand-in for `api.mymemory.translated.net/get`.
+
+    Args:
+        latency (float): Mean response delay in milliseconds.
+        jitter (float): Random extra delay, up to this many milliseconds.
+        error_rate (float): Fraction of requests answered with HTTP 503.
+        matches (int): Number of matches per response.
+    """
+
+    def __init__(self, latency: float, jitter: float, error_rate: float, matches: int):
+        self.latency = latency / 1000
+        self.jitter = jitter / 1000
+        self.error_rate = error_rate
+        self.matches = matches
+        self.requests = 0
+        self._rng = random.Random(0)
+        self._runner: web.AppRunner | None = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        await asyncio.sleep(self.latency + self._rng.random() * self.jitter)
+        if self._rng.random() < self.error_rate:
+            return web.Response(status=503)
+        seed = zlib.crc32(request.query.get("q", "").encode())
+        return web.json_response(
+            {
+                "responseData": {"translatedText": "", "match": 1},
+                "matches": make_matches(self.matches, seed=seed),
+                "responseStatus": 200,
+            }
+        )
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/get", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/get"
+
+    async def stop(self) -> None:
+        await self._runner.cleanup()
+
+
+class RecordingSession(BaseSession):
+    """
+    Bot session that records API calls and answers them locally.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.calls: Counter[str] = Counter()
+        self._message_ids = itertools.count(1_000_000)
+
+    async def make_request(self, bot, method, timeout=None):
+        self.calls[type(method).__name__] += 1
+        if method.__returning__ is bool:
+            return True
+        chat_id = getattr(method, "chat_id", None) or 0
+        return Message(
+            message_id=next(self._message_ids),
+            date=datetime.now(),
+            chat=Chat(id=chat_id, type="private"),
+            from_user=BOT_USER,
+            text=getattr(method, "text", None) or "",
+        ).as_(bot)
+
+    async def stream_content(self, *args, **kwargs):
+        yield b""
+
+    async def close(self) -> None:
+        pass
+
+
+class SimulatedUser:
+    """
+    One chat going through the translation flow.
+    """
+
+    _update_ids = itertools.count(1)
+    _message_ids = itertools.count(1)
+
+    def __init__(
+        self, user_id: int, dp: Dispatcher, bot: Bot, latencies: dict, stateless: bool
+    ):
+        self.user = User(id=user_id, is_bot=False, first_name=f"user{user_id}")
+        self.chat = Chat(id=user_id, type="private")
+        self.dp = dp
+        self.bot = bot
+        self.latencies = latencies
+        self.stateless = stateless
+
+    def _message(self, text: str, reply_to: Message | None = None) -> Message:
+        return Message(
+            message_id=next(self._message_ids),
+            date=datetime.now(),
+            chat=self.chat,
+            from_user=self.user,
+            text=text,
+            reply_to_message=reply_to,
+        )
+
+    def _bot_message(self, text: str) -> Message:
+        return Message(
+            message_id=next(self._message_ids),
+            date=datetime.now(),
+            chat=self.chat,
+            from_user=BOT_USER,
+            text=text,
+        )
+
+    async def _feed(self, step: str, **event) -> None:
+        update = Update(update_id=next(self._update_ids), **event)
+        started = time.perf_counter()
+        await self.dp.feed_update(self.bot, update, stateless=self.stateless)
+        self.latencies[step].append(time.perf_counter() - started)
+
+    async def _press(self, step: str, data: str) -> None:
+        await self._feed(
+            step,
+            callback_query=CallbackQuery(
+                id=str(next(self._update_ids)),
+                from_user=self.user,
+                chat_instance=str(self.chat.id),
+                data=data,
+                message=self._bot_message("menu"),
+            ),
+        )
+
+    async def run(self, words: list[str], pair: tuple[str, str]) -> None:
+        from_lang, to_lang = pair
+        await self._feed("start", message=self._message("/start"))
+        await self._press("translate", "translate")
+        await self._press("from", f"from:{from_lang}")
+        await self._press("to", f"to:{from_lang}:{to_lang}")
+
+        prompt = self._bot_message(
+            translate.WORD_PROMPT.format(from_lang=from_lang, to_lang=to_lang)
+        )
+        for i, word in enumerate(words):
+            if i and not self.stateless:
+                await self._press("retry", "retry_word")
+            reply_to = prompt if self.stateless else None
+            await self._feed("word", message=self._message(word, reply_to=reply_to))
+
+
+_dispatcher: Dispatcher | None = None
+
+
+def get_dispatcher() -> Dispatcher:
+    """
+    Build the dispatcher once; routers can only be attached to one parent.
+    """
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = Dispatcher()
+        _dispatcher.include_router(translate.router)
+        _dispatcher.include_router(start.router)
+        _dispatcher.include_router(errors.router)
+        _dispatcher.include_router(success.router)
+    return _dispatcher
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run(args: argparse.Namespace) -> dict:
+    upstream = FakeMyMemory(args.latency, args.jitter, args.error_rate, args.matches)
+    api.TRANSLATION_API_URL = await upstream.start()
+    await api.init_client(max_connections=args.connections)
+    translation_cache.configure(max_size=args.cache_size, ttl=3600, negative_ttl=60)
+
+    session = RecordingSession()
+    bot = Bot(token="123456:load-test", session=session)
+    dp = get_dispatcher()
+    latencies: dict[str, list[float]] = defaultdict(list)
+
+    rng = random.Random(args.seed)
+    # Zipf-like popularity: a few words dominate, as in production traffic
+    vocabulary = list(WORDS) + [f"{a} {b}" for a, b in zip(WORDS, reversed(WORDS))]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    pairs = [("en", "it"), ("it", "en"), ("en", "de"), ("ru", "en")]
+    users = [
+        SimulatedUser(i + 100, dp, bot, latencies, args.stateless)
+        for i in range(args.users)
+    ]
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def drive(user: SimulatedUser) -> None:
+        words = rng.choices(vocabulary, weights=weights, k=args.words)
+        async with semaphore:
+            await user.run(words, rng.choice(pairs))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(drive(user) for user in users))
+    elapsed = time.perf_counter() - started
+
+    await api.close_client()
+    await upstream.stop()
+
+    updates = sum(len(v) for v in latencies.values())
+    return {
+        "users": args.users,
+        "elapsed_s": round(elapsed, 3),
+        "updates_per_s": round(updates / elapsed, 1),
+        "lookups_per_s": round(len(latencies["word"]) / elapsed, 1),
+        "upstream_requests": upstream.requests,
+        "bot_api_calls": dict(session.calls),
+        "cache": translation_cache.stats(),
+        "handlers": {
+            step: {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+                "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+                "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+            }
+            for step, values in latencies.items()
+        },
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=100, help="simulated users")
+    parser.add_argument("--words", type=int, default=5, help="lookups per user")
+    parser.add_argument("--concurrency", type=int, default=100, help="users active at once")
+    parser.add_argument("--latency", type=float, default=50, help="upstream latency, ms")
+    parser.add_argument("--jitter", type=float, default=20, help="upstream jitter, ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="upstream 503 rate")
+    parser.add_argument("--matches", type=int, default=10, help="matches per response")
+    parser.add_argument("--connections", type=int, default=20, help="HTTP pool size")
+    parser.add_argument("--cache-size", type=int, default=5000, help="0 disables the cache")
+    parser.add_argument("--stateless", action="store_true", help="use the stateless flow")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", metavar="PATH", help="also write the report to PATH")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Synthetic MyMemory `matches` payloads for benchmarks.
+
+The generated entries mimic real API responses: a mix of translation
+memory, Wikipedia and machine translation sources, single words and longer
+phrases, duplicates differing only by case or whitespace, and the loosely
+typed numeric fields (quality as string or int, missing usage counts).
+"""
+
+import json
+import random
+
+SOURCES = ("MateCat", "Wikipedia", "MT!", "Public_Corpora", "anonymous", "")
+WORDS = (
+    "casa", "gatto", "cane", "libro", "strada", "acqua", "tempo", "mano",
+    "giorno", "notte", "amico", "lavoro", "città", "parola", "mondo", "cuore",
+)
+SIZES = (1, 10, 100, 1000)
+
+
+def make_match(rng: random.Random) -> dict:
+    """
+    Build one realistic match entry.
+    """
+    words = rng.choices(WORDS, k=rng.choice((1, 1, 1, 2, 3, 6)))
+    text = " ".join(words)
+    if rng.random() < 0.2:
+        text = text.capitalize()
+    if rng.random() < 0.15:
+        text += rng.choice((".", "!", ",", "?"))
+
+    return {
+        "id": str(rng.randrange(10**9)),
+        "segment": "house",
+        "translation": text,
+        "source": "en-GB",
+        "target": "it-IT",
+        "quality": rng.choice((str(rng.randint(0, 100)), rng.randint(0, 100), None)),
+        "reference": None,
+        "usage-count": rng.choice((0, 1, 2, 5, 17, None)),
+        "subject": "All",
+        "created-by": rng.choice(SOURCES),
+        "last-updated-by": rng.choice(SOURCES),
+        "create-date": "2024-01-01 00:00:00",
+        "last-update-date": "2024-01-01 00:00:00",
+        "match": round(rng.random(), 2),
+        "penalty": rng.choice((0, 0, 0, 0.1, 0.5)),
+    }
+
+
+def make_matches(n: int, seed: int = 42) -> list[dict]:
+    """
+    Build a deterministic list of `n` match entries.
+
+    Args:
+        n (int): Number of entries.
+        seed (int): Random seed, so runs are comparable.
+
+    Returns:
+        list: Match dicts in MyMemory's response format.
+    """
+    rng = random.Random(seed)
+    return [make_match(rng) for _ in range(n)]
+
+
+def make_response(n: int, seed: int = 42) -> bytes:
+    """
+    Build a complete MyMemory response body with `n` matches.
+
+    Args:
+        n (int): Number of match entries.
+        seed (int): Random seed, so runs are comparable.
+
+    Returns:
+        bytes: JSON document as sent by the API.
+    """
+    matches = make_matches(n, seed)
+    return json.dumps(
+        {
+            "responseData": {"translatedText": matches[0]["translation"], "match": 1},
+            "quotaFinished": False,
+            "mtLangSupported": None,
+            "responseDetails": "",
+            "responseStatus": 200,
+            "responderId": None,
+            "exception_code": None,
+            "matches": matches,
+        }
+    ).encode()
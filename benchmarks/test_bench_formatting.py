@@ -0,0 +1,16 @@
+from dizionaut.languages import get_lang_name
+from dizionaut.services import api
+from dizionaut.services.scoring import quality_marker
+from dizionaut.utils import format_translation_result
+
+
+def test_format_translation_result(benchmark, matches):
+    ranked = api.rank_matches(matches)
+    benchmark(
+        format_translation_result,
+        ranked,
+        "en",
+        "it",
+        lang_name_fn=get_lang_name,
+        quality_marker_fn=quality_marker,
+    )
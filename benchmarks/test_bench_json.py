@@ -0,0 +1,40 @@
+import json
+import tracemalloc
+
+from dizionaut import fastjson
+
+
+def _peak_bytes(fn, *args) -> int:
+    tracemalloc.start()
+    try:
+        result = fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+
+def _retained_bytes(fn, *args) -> int:
+    tracemalloc.start()
+    try:
+        result = fn(*args)
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return retained
+
+
+def test_decode_full_response(benchmark, response_body):
+    benchmark.extra_info["peak_bytes"] = _peak_bytes(json.loads, response_body)
+    benchmark.extra_info["retained_bytes"] = _retained_bytes(json.loads, response_body)
+    benchmark(json.loads, response_body)
+
+
+def test_decode_compact_response(benchmark, response_body):
+    parse = fastjson.parse_translation_response
+    benchmark.extra_info["orjson"] = fastjson.orjson is not None
+    benchmark.extra_info["peak_bytes"] = _peak_bytes(parse, response_body)
+    benchmark.extra_info["retained_bytes"] = _retained_bytes(parse, response_body)
+    benchmark(parse, response_body)
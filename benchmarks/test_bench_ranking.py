@@ -0,0 +1,16 @@
+from operator import itemgetter
+
+from dizionaut.services import api
+
+
+def test_deduplicate_translations(benchmark, scored):
+    benchmark(api._deduplicate_translations, scored)
+
+
+def test_sort_scored(benchmark, scored):
+    deduplicated = api._deduplicate_translations(scored)
+    benchmark(sorted, deduplicated, key=itemgetter(1), reverse=True)
+
+
+def test_rank_matches(benchmark, matches):
+    benchmark(api.rank_matches, matches)
@@ -0,0 +1,10 @@
+from dizionaut.services import scoring
+
+
+def test_score(benchmark, matches):
+    benchmark(lambda: [scoring.score(t) for t in matches])
+
+
+def test_phrase_probability(benchmark, matches):
+    texts = [t["translation"] for t in matches]
+    benchmark(lambda: [scoring.phrase_probability(text) for text in texts])
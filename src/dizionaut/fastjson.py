@@ -0,0 +1,74 @@
+"""
+JSON decoding with orjson when installed, the standard library otherwise.
+
+Also extracts the compact form of MyMemory responses: only the match
+fields used for scoring, deduplication and formatting are kept, so the
+rest of the document is released right after parsing.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional dependency, see the "fast" extra
+    orjson = None
+
+# Match fields read by `scoring.score` and the formatters
+MATCH_FIELDS = ("translation", "match", "quality", "created-by", "usage-count", "penalty")
+
+
+def loads(data: bytes | str) -> Any:
+    """
+    Decode a JSON document.
+
+    Args:
+        data (bytes | str): Raw JSON.
+
+    Returns:
+        Any: Decoded value.
+
+    Raises:
+        ValueError: If the document is not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def compact_matches(matches: Any) -> list[dict]:
+    """
+    Keep the `MATCH_FIELDS` of each match, dropping entries without a translation.
+
+    Args:
+        matches (Any): The "matches" value of a MyMemory response.
+
+    Returns:
+        list: Compact match dicts.
+    """
+    if not isinstance(matches, list):
+        return []
+    return [
+        {field: m[field] for field in MATCH_FIELDS if field in m}
+        for m in matches
+        if isinstance(m, dict) and isinstance(m.get("translation"), str)
+    ]
+
+
+def parse_translation_response(content: bytes) -> dict:
+    """
+    Decode a MyMemory response body into its compact form.
+
+    Args:
+        content (bytes): Response body.
+
+    Returns:
+        dict: {"matches": [compact match, ...]}.
+
+    Raises:
+        ValueError: If the body is not a JSON object.
+    """
+    data = loads(content)
+    if not isinstance(data, dict):
+        raise ValueError("Translation response is not a JSON object")
+    return {"matches": compact_matches(data.get("matches"))}
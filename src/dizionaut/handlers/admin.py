@@ -0,0 +1,54 @@
+"""
+Administrative commands.
+
+Only users listed in the dispatcher's `admin_ids` may use them; messages
+from anyone else fall through to the other routers.
+"""
+
+import os
+import time
+
+from aiogram import Router
+from aiogram.dispatcher.event.bases import SkipHandler
+from aiogram.filters import Command, CommandObject
+from aiogram.types import Message
+
+from ..profiler import profiler
+
+router = Router()
+
+DEFAULT_PROFILE_SECONDS = 30
+MAX_PROFILE_SECONDS = 600
+
+
+@router.message(Command("profile"))
+async def handle_profile_command(
+    message: Message,
+    command: CommandObject,
+    admin_ids: frozenset[int] = frozenset(),
+    profile_dir: str = "profiles",
+):
+    """
+    Start the sampling profiler: `/profile [seconds]`.
+
+    Args:
+        message (Message): Command message.
+        command (CommandObject): Parsed command with optional duration.
+        admin_ids (frozenset): Telegram user ids allowed to profile.
+        profile_dir (str): Directory for profile output files.
+    """
+    if message.from_user is None or message.from_user.id not in admin_ids:
+        raise SkipHandler()
+
+    try:
+        seconds = int(command.args or DEFAULT_PROFILE_SECONDS)
+    except ValueError:
+        await message.answer("Usage: /profile [seconds]")
+        return
+    seconds = max(1, min(seconds, MAX_PROFILE_SECONDS))
+
+    path = os.path.join(profile_dir, f"profile-{time.strftime('%Y%m%d-%H%M%S')}.folded")
+    if profiler.start(seconds, path):
+        await message.answer(f"🔬 Profiling for {seconds}s, writing {path}")
+    else:
+        await message.answer("🔬 A profiling run is already in progress.")
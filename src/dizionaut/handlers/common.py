@@ -4,6 +4,8 @@ Common handlers and UI elements used across the bot.
 This module includes shared buttons and a reusable start handler.
 """
 
+from functools import lru_cache
+
 from aiogram import types
 from aiogram.fsm.context import FSMContext
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
@@ -20,18 +22,120 @@ restart_keyboard = InlineKeyboardMarkup(
 )
 
 
-async def start(message: types.Message, state: FSMContext):
+@lru_cache(maxsize=512)
+def restart_keyboard_for(from_lang: str, to_lang: str) -> InlineKeyboardMarkup:
+    """
+    Build the restart keyboard for stateless mode, with the language pair in the retry button.
+
+    Keyboards are cached per pair and shared between requests.
+
+    Args:
+        from_lang (str): Source language code.
+        to_lang (str): Target language code.
+
+    Returns:
+        InlineKeyboardMarkup: Restart and retry buttons.
+    """
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [InlineKeyboardButton(text="🔁 Restart", callback_data="restart")],
+            [
+                InlineKeyboardButton(
+                    text="✏️ Try another word",
+                    callback_data=f"retry_word:{from_lang}:{to_lang}",
+                )
+            ],
+        ]
+    )
+
+
+def did_you_mean_data(from_lang: str, to_lang: str, phrase: str) -> str | None:
+    """
+    Return the callback data of a "did you mean" button.
+
+    Returns:
+        str | None: "dym:<from>:<to>:<phrase>", or None if it exceeds
+            Telegram's 64-byte limit.
+    """
+    data = f"dym:{from_lang}:{to_lang}:{phrase}"
+    return data if len(data.encode()) <= 64 else None
+
+
+def did_you_mean_keyboard(
+    from_lang: str, to_lang: str, suggestions: list[str], phrase: str | None = None
+) -> InlineKeyboardMarkup:
+    """
+    Build "did you mean" buttons, one per suggested spelling.
+
+    Buttons whose callback data would exceed Telegram's 64-byte limit are left out.
+
+    Args:
+        from_lang (str): Source language code.
+        to_lang (str): Target language code.
+        suggestions (list): Alternative spellings to offer.
+        phrase (str | None): The phrase as typed, offered last as a search
+            of the original spelling.
+
+    Returns:
+        InlineKeyboardMarkup: One button per alternative.
+    """
+    buttons = [(f"✏️ {s}", s) for s in suggestions]
+    if phrase is not None:
+        buttons.append((f"🔍 Search “{phrase}”", phrase))
+    rows = []
+    for text, word in buttons:
+        data = did_you_mean_data(from_lang, to_lang, word)
+        if data is not None:
+            rows.append([InlineKeyboardButton(text=text, callback_data=data)])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+def pages_keyboard(
+    lookup_id: str, page: int, pages: int, keyboard: InlineKeyboardMarkup
+) -> InlineKeyboardMarkup:
+    """
+    Add page navigation buttons above a keyboard.
+
+    Args:
+        lookup_id (str): Id of the saved result list.
+        page (int): Shown page, starting at 1.
+        pages (int): Total number of pages.
+        keyboard (InlineKeyboardMarkup): Buttons shown below the navigation.
+
+    Returns:
+        InlineKeyboardMarkup: Navigation row followed by `keyboard`.
+    """
+    row = []
+    if page > 1:
+        row.append(InlineKeyboardButton(text="◂ back", callback_data=f"page:{lookup_id}:{page - 1}"))
+    if page < pages:
+        row.append(InlineKeyboardButton(text="more ▸", callback_data=f"page:{lookup_id}:{page + 1}"))
+    return InlineKeyboardMarkup(inline_keyboard=[row] + keyboard.inline_keyboard)
+
+
+# Inline keyboard shown with the welcome message
+translate_keyboard = InlineKeyboardMarkup(
+    inline_keyboard=[
+        [InlineKeyboardButton(text="🌍 Translate", callback_data="translate")]
+    ]
+)
+
+
+async def start(message: types.Message, state: FSMContext, stateless: bool = False):
     """
     Entry point for the bot when the user starts or restarts.
 
     Clears previous FSM state, sets to welcome, and sends greeting message.
+    In stateless mode FSM storage is left untouched.
 
     Args:
         message (types.Message): Incoming user message.
         state (FSMContext): Current FSM context.
+        stateless (bool): Skip FSM state transitions.
     """
-    await state.clear()
-    await state.set_state(TranslateState.welcome)
+    if not stateless:
+        await state.clear()
+        await state.set_state(TranslateState.welcome)
     await message.answer(
         format_ml("""
         👋 Welcome to Dizionaut!
@@ -39,9 +143,5 @@ async def start(message: types.Message, state: FSMContext):
 
         Tap the button below to begin.
         """),
-        reply_markup=InlineKeyboardMarkup(
-            inline_keyboard=[
-                [InlineKeyboardButton(text="🌍 Translate", callback_data="translate")]
-            ]
-        ),
+        reply_markup=translate_keyboard,
     )
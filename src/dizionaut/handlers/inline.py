@@ -0,0 +1,132 @@
+"""
+Inline mode: `@dizionaut [en-it] word` in any chat.
+
+Telegram sends a new inline query on every keystroke. Queries are
+debounced per user, and a newer query from the same user cancels the
+lookup still running for the previous one, so only the text the user
+settles on reaches the translation API.
+"""
+
+import asyncio
+import re
+
+from aiogram import Router
+from aiogram.types import (
+    InlineQuery,
+    InlineQueryResultArticle,
+    InputTextMessageContent,
+)
+from loguru import logger
+
+from ..languages import LANG_NAMES, get_lang_name
+from ..services.api import TranslationError, translate_text
+from ..services.scoring import quality_marker
+from ..utils import format_translation_result
+
+router = Router()
+
+MAX_RESULTS = 10
+PAIR_PATTERN = re.compile(r"^([a-z]{2,3})[-:>]([a-z]{2,3})\s+(.+)$", re.S)
+
+# Lookup task per user; a newer query cancels the previous one
+_pending: dict[int, asyncio.Task] = {}
+
+
+def parse_query(text: str, default_pair: tuple[str, str]) -> tuple[str, str, str]:
+    """
+    Split an inline query into language pair and phrase.
+
+    Args:
+        text (str): Raw query, optionally prefixed with "en-it", "en:it" or "en>it".
+        default_pair (tuple): Pair used when the query has no known prefix.
+
+    Returns:
+        tuple: (from_lang, to_lang, phrase).
+    """
+    text = text.strip()
+    match = PAIR_PATTERN.match(text)
+    if match and match[1] in LANG_NAMES and match[2] in LANG_NAMES:
+        return match[1], match[2], match[3].strip()
+    return *default_pair, text
+
+
+@router.inline_query()
+async def handle_inline_query(
+    query: InlineQuery,
+    inline_pair: tuple[str, str] = ("en", "it"),
+    inline_debounce: float = 0.3,
+    inline_cache_time: int = 300,
+):
+    """
+    Schedule the answer to an inline query after a per-user debounce delay.
+
+    Returns right away; the detached per-user task answers the query, so
+    the debounce does not hold an update worker.
+
+    Args:
+        query (InlineQuery): Incoming inline query.
+        inline_pair (tuple): Default language pair.
+        inline_debounce (float): Seconds to wait for the user to stop typing.
+        inline_cache_time (int): Seconds Telegram may cache the answer.
+    """
+    user_id = query.from_user.id
+    previous = _pending.pop(user_id, None)
+    if previous is not None:
+        previous.cancel()
+
+    task = asyncio.create_task(
+        _answer(query, inline_pair, inline_debounce, inline_cache_time)
+    )
+    _pending[user_id] = task
+    task.add_done_callback(lambda done: _forget(user_id, done))
+
+
+def _forget(user_id: int, task: asyncio.Task) -> None:
+    if _pending.get(user_id) is task:
+        del _pending[user_id]
+    if not task.cancelled() and task.exception() is not None:
+        logger.opt(exception=task.exception()).error("Inline answer failed")
+
+
+async def _answer(
+    query: InlineQuery, default_pair: tuple[str, str], debounce: float, cache_time: int
+) -> None:
+    from_lang, to_lang, phrase = parse_query(query.query, default_pair)
+    if not phrase:
+        return
+
+    await asyncio.sleep(debounce)
+    try:
+        translations = await translate_text(from_lang, to_lang, phrase)
+    except TranslationError as e:
+        logger.info(f"Inline translation failed: {e}")
+        await query.answer([], cache_time=min(cache_time, 30))
+        return
+
+    translations = translations[:MAX_RESULTS]
+    full_result = format_translation_result(
+        translations,
+        from_lang,
+        to_lang,
+        lang_name_fn=get_lang_name,
+        quality_marker_fn=quality_marker,
+    )
+    lang_info = f"{get_lang_name(from_lang)} → {get_lang_name(to_lang)}"
+    results = [
+        InlineQueryResultArticle(
+            id="all",
+            title=f"{phrase} → {translations[0][0]['translation']}",
+            description=f"All translations ({lang_info})",
+            input_message_content=InputTextMessageContent(message_text=full_result),
+        )
+    ]
+    results.extend(
+        InlineQueryResultArticle(
+            id=str(i),
+            title=f"{quality_marker(s)} {t['translation']}",
+            description=f"{int(s * 100)}% · {lang_info}",
+            input_message_content=InputTextMessageContent(message_text=t["translation"]),
+        )
+        for i, (t, s) in enumerate(translations)
+    )
+    await query.answer(results, cache_time=cache_time, is_personal=False)
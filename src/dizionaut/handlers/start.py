@@ -17,15 +17,18 @@ router = Router()
 
 
 @router.message(Command("start"))
-async def handle_start_command(message: types.Message, state: FSMContext):
+async def handle_start_command(
+    message: types.Message, state: FSMContext, stateless: bool = False
+):
     """
     Handle the /start command by invoking the shared start routine.
 
     Args:
         message (types.Message): Telegram message object.
         state (FSMContext): FSM context for the current user.
+        stateless (bool): Keep the flow out of FSM storage.
     """
-    await start(message, state)
+    await start(message, state, stateless)
 
 
 @router.callback_query(F.data == "retry_word")
@@ -45,7 +48,7 @@ async def retry_word(callback: CallbackQuery, state: FSMContext):
 
 
 @router.callback_query(F.data == "restart")
-async def restart(callback: CallbackQuery, state: FSMContext):
+async def restart(callback: CallbackQuery, state: FSMContext, stateless: bool = False):
     """
     Handle the "Restart" button.
 
@@ -54,6 +57,7 @@ async def restart(callback: CallbackQuery, state: FSMContext):
     Args:
         callback (CallbackQuery): Callback query object from Telegram.
         state (FSMContext): FSM context.
+        stateless (bool): Keep the flow out of FSM storage.
     """
     await callback.answer()
-    await start(callback.message, state)
+    await start(callback.message, state, stateless)
@@ -4,155 +4,763 @@ and displaying translation results.
 
 This module controls the main user flow: selecting source/target language,
 entering a word, and viewing results from the translation API.
+
+The chosen language pair travels in callback_data ("to:<from>:<to>"). In
+stateless mode (the `stateless` dispatcher flag) the word prompt is sent
+as a forced reply that names the pair, so the word handler recovers it
+from the replied-to message without touching FSM storage.
 """
 
+import math
+import re
+import secrets
+import time
+from dataclasses import replace
+
 from aiogram import Router, types, F
 from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
 from aiogram.types import (
     InlineKeyboardMarkup,
-    InlineKeyboardButton,
     Message,
     CallbackQuery,
+    ForceReply,
 )
 from aiogram.filters import Command
+from aiogram.methods import SendMessage
 from loguru import logger
 
-from dizionaut.utils import LANGUAGES
-from dizionaut.utils import get_lang_name
+from dizionaut.languages import from_keyboard, get_lang_name, to_keyboard
 
 from ..services.scoring import quality_marker
-from .success import handle_success_state
-from ..utils import format_translation_result
-from .errors import handle_error_state
-from ..services.api import TranslationError, translate_text
+from .common import (
+    did_you_mean_data,
+    did_you_mean_keyboard,
+    pages_keyboard,
+    restart_keyboard,
+    restart_keyboard_for,
+)
+from ..utils import format_batch_result, format_translation_result, truncate_utf16
+from ..services.api import (
+    CircuitOpen,
+    NotFound,
+    QuotaExceeded,
+    TranslationError,
+    lookup_local,
+    translate_many,
+    translate_text,
+    unique_phrases,
+)
+from ..services.cache import normalize_phrase
+from ..services.limits import MAX_BATCH_LINES
+from ..services.querylog import QueryLog
+from ..services.spelling import spelling
+from ..metrics import SPELLING_CORRECTIONS
 from ..states import TranslateState
+from ..tracing import span
 
 router = Router()
 
+# Word prompt used in stateless mode; the pair is recovered from replies to it
+WORD_PROMPT = "✏️ Please enter a word to translate [{from_lang} → {to_lang}]:"
+WORD_PROMPT_PATTERN = re.compile(r"\[([a-z]{2,3}) → ([a-z]{2,3})\]:$")
 
-def language_keyboard(prefix: str, excluded_code: str = None) -> InlineKeyboardMarkup:
-    """
-    Generate an inline keyboard for selecting a language.
-
-    Args:
-        prefix (str): Callback data prefix (e.g., "from", "to").
-        excluded_code (str, optional): Language code to exclude.
-
-    Returns:
-        InlineKeyboardMarkup: Keyboard with language options.
-    """
-
-    def is_enabled(code: str) -> bool:
-        return code != excluded_code if excluded_code is not None else True
+# Multi-line (word list) messages, up to MAX_BATCH_LINES lines
+BATCH_EDIT_INTERVAL = 1.0  # seconds between progress edits
+MAX_MESSAGE_LENGTH = 4096  # UTF-16 code units
 
-    return InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text=name, callback_data=f"{prefix}:{code}")]
-            for name, code in LANGUAGES
-            if is_enabled(code)
-        ]
-    )
+# Translations per message; longer ranked lists are saved in FSM storage
+# (a few per chat) and paged from there
+RESULTS_PAGE_SIZE = 5
+RESULTS_KEPT = 3
 
 
 @router.callback_query(F.data == "translate")
-async def start_translation(callback: CallbackQuery, state: FSMContext):
+async def start_translation(
+    callback: CallbackQuery, state: FSMContext, stateless: bool = False
+):
     """
     Start the translation process by asking the user for source language.
 
     Args:
         callback (CallbackQuery): User-initiated callback.
         state (FSMContext): FSM state context.
+        stateless (bool): Keep the flow out of FSM storage.
     """
-    await state.clear()
+    if not stateless:
+        await state.clear()
     await callback.message.edit_text(
-        "Please select source language:", reply_markup=language_keyboard("from")
+        "Please select source language:", reply_markup=from_keyboard()
     )
-    await state.set_state(TranslateState.from_lang)
+    if not stateless:
+        await state.set_state(TranslateState.from_lang)
     await callback.answer()
 
 
 @router.callback_query(F.data.startswith("from:"))
-async def handle_from_lang(callback: CallbackQuery, state: FSMContext):
+async def handle_from_lang(callback: CallbackQuery):
     """
     Handle selection of source language.
 
+    The source language is carried in the target keyboard's callback_data.
+
     Args:
         callback (CallbackQuery): Callback with source language.
-        state (FSMContext): FSM context.
     """
     from_lang = callback.data.split(":")[1]
-    await state.update_data(from_lang=from_lang)
     await callback.message.edit_text(
         "Now select target language:",
-        reply_markup=language_keyboard("to", excluded_code=from_lang),
+        reply_markup=to_keyboard(from_lang),
     )
-    await state.set_state(TranslateState.to_lang)
     await callback.answer()
 
 
 @router.callback_query(F.data.startswith("to:"))
-async def handle_to_lang(callback: CallbackQuery, state: FSMContext):
+async def handle_to_lang(
+    callback: CallbackQuery, state: FSMContext, stateless: bool = False
+):
     """
     Handle selection of target language and prompt for the word.
 
     Args:
-        callback (CallbackQuery): Callback with target language.
+        callback (CallbackQuery): Callback with source and target language.
         state (FSMContext): FSM context.
+        stateless (bool): Keep the flow out of FSM storage.
     """
-    to_lang = callback.data.split(":")[1]
-    await state.update_data(to_lang=to_lang)
-    await callback.message.edit_text("✏️ Please enter a word to translate:")
-    await state.set_state(TranslateState.word)
+    parts = callback.data.split(":")
+    if len(parts) == 3:
+        _, from_lang, to_lang = parts
+    else:
+        # Keyboards sent before the pair was carried: "to:<to>", source in FSM data
+        to_lang = parts[-1]
+        from_lang = (await state.get_data()).get("from_lang")
+        if not from_lang:
+            await callback.answer("This menu is outdated, please /start again.", show_alert=True)
+            return
+    if stateless:
+        await callback.message.edit_text(
+            f"{get_lang_name(from_lang)} → {get_lang_name(to_lang)}"
+        )
+        await ask_word(callback.message, from_lang, to_lang)
+    else:
+        await state.set_data({"from_lang": from_lang, "to_lang": to_lang})
+        await callback.message.edit_text("✏️ Please enter a word to translate:")
+        await state.set_state(TranslateState.word)
     await callback.answer()
 
 
-@router.message(TranslateState.word)
-async def handle_word(message: Message, state: FSMContext):
+@router.callback_query(F.data.startswith("retry_word:"))
+async def retry_word_stateless(callback: CallbackQuery):
+    """
+    Handle "Try another word" in stateless mode, where the button carries the pair.
+
+    Args:
+        callback (CallbackQuery): Callback with source and target language.
+    """
+    _, from_lang, to_lang = callback.data.split(":")
+    await callback.answer()
+    await ask_word(callback.message, from_lang, to_lang)
+
+
+async def ask_word(message: Message, from_lang: str, to_lang: str):
+    """
+    Send the stateless word prompt as a forced reply naming the language pair.
+
+    Args:
+        message (Message): Message in the chat to prompt.
+        from_lang (str): Source language code.
+        to_lang (str): Target language code.
+    """
+    await message.answer(
+        WORD_PROMPT.format(from_lang=from_lang, to_lang=to_lang),
+        reply_markup=ForceReply(input_field_placeholder="Word or phrase"),
+    )
+
+
+@router.message(
+    F.text,
+    F.reply_to_message.text.regexp(WORD_PROMPT_PATTERN, mode="search").as_("pair"),
+)
+async def handle_word_reply(
+    message: Message,
+    state: FSMContext,
+    pair: re.Match,
+    batch_concurrency: int = 8,
+    query_log: QueryLog | None = None,
+    spellcheck: bool = True,
+    webhook_reply: bool = False,
+) -> SendMessage | None:
+    """
+    Receive the word as a reply to the stateless prompt and trigger translation.
+
+    Args:
+        message (Message): User input message.
+        state (FSMContext): FSM context (not used for storage).
+        pair (re.Match): Prompt match holding the language pair.
+        batch_concurrency (int): Parallel lookups for multi-line messages.
+        query_log (QueryLog | None): Log of looked-up phrases.
+        spellcheck (bool): Offer corrections for unknown phrases.
+        webhook_reply (bool): Return the reply for the webhook response.
+
+    Returns:
+        SendMessage | None: The reply, when `webhook_reply` is set.
+    """
+    from_lang, to_lang = pair.groups()
+    return await handle_text_input(
+        message,
+        state,
+        from_lang,
+        to_lang,
+        message.text,
+        stateless=True,
+        batch_concurrency=batch_concurrency,
+        query_log=query_log,
+        spellcheck=spellcheck,
+        webhook_reply=webhook_reply,
+    )
+
+
+@router.message(TranslateState.word, F.text)
+async def handle_word(
+    message: Message,
+    state: FSMContext,
+    batch_concurrency: int = 8,
+    query_log: QueryLog | None = None,
+    spellcheck: bool = True,
+    webhook_reply: bool = False,
+) -> SendMessage | None:
     """
     Receive the word from the user and trigger translation.
 
     Args:
         message (Message): User input message.
         state (FSMContext): FSM context.
+        batch_concurrency (int): Parallel lookups for multi-line messages.
+        query_log (QueryLog | None): Log of looked-up phrases.
+        spellcheck (bool): Offer corrections for unknown phrases.
+        webhook_reply (bool): Return the reply for the webhook response.
+
+    Returns:
+        SendMessage | None: The reply, when `webhook_reply` is set.
     """
-    await state.update_data(word=message.text)
-    await handle_text_input(message, state)
+    with span("storage"):
+        data = await state.get_data()
+    return await handle_text_input(
+        message,
+        state,
+        data.get("from_lang"),
+        data.get("to_lang"),
+        message.text,
+        batch_concurrency=batch_concurrency,
+        query_log=query_log,
+        spellcheck=spellcheck,
+        webhook_reply=webhook_reply,
+    )
+
+
+@router.message(TranslateState.word)
+async def handle_non_text_word(
+    message: Message, webhook_reply: bool = False
+) -> SendMessage | None:
+    """
+    Ask again when something other than text (a sticker, photo...) is sent as the word.
+
+    Args:
+        message (Message): User message without text.
+        webhook_reply (bool): Return the reply for the webhook response.
+
+    Returns:
+        SendMessage | None: The reply, when `webhook_reply` is set.
+    """
+    return await reply(
+        message, "✏️ Please send the word as a text message.", webhook_reply=webhook_reply
+    )
 
 
-async def handle_text_input(message: Message, state: FSMContext):
+async def handle_text_input(
+    message: Message,
+    state: FSMContext,
+    from_lang: str,
+    to_lang: str,
+    phrase: str,
+    stateless: bool = False,
+    batch_concurrency: int = 8,
+    query_log: QueryLog | None = None,
+    spellcheck: bool = False,
+    webhook_reply: bool = False,
+) -> SendMessage | None:
     """
     Fetch translations and show the results to the user.
 
-    Handles success and error states.
+    The result and the restart/retry buttons go out as a single message.
+    A message with several lines is treated as a word list and translated
+    line by line (see `translate_batch`). With `spellcheck`, a phrase not
+    known locally that is close to cached phrases gets "did you mean"
+    buttons answered from the cache, plus one to search it as typed,
+    before any upstream call (see `cached_corrections`); a phrase with no
+    translations gets buttons for close known phrases (see
+    `suggest_corrections`). Nothing is answered for a corrected form until
+    the user picks it. Handles success and error states.
 
     Args:
         message (Message): Message with the word.
         state (FSMContext): FSM context.
+        from_lang (str): Source language code.
+        to_lang (str): Target language code.
+        phrase (str): Text to translate.
+        stateless (bool): Skip FSM state transitions.
+        batch_concurrency (int): Parallel lookups for multi-line messages.
+        query_log (QueryLog | None): Log that records every looked-up phrase.
+        spellcheck (bool): Offer corrections for unknown phrases.
+        webhook_reply (bool): Return the reply instead of sending it (see `reply`).
+
+    Returns:
+        SendMessage | None: The reply, when `webhook_reply` is set.
+    """
+    with logger.contextualize(from_lang=from_lang, to_lang=to_lang):
+        keyboard = next_steps_keyboard(from_lang, to_lang, stateless)
+        phrases = unique_phrases(phrase.splitlines())
+        if not phrases:
+            if stateless:
+                return await reply(
+                    message,
+                    WORD_PROMPT.format(from_lang=from_lang, to_lang=to_lang),
+                    ForceReply(input_field_placeholder="Word or phrase"),
+                    webhook_reply,
+                )
+            return await reply(
+                message, "✏️ Please enter a word to translate:", webhook_reply=webhook_reply
+            )
+        if query_log is not None:
+            for p in phrases:
+                query_log.record(from_lang, to_lang, p)
+        if len(phrases) > 1:
+            await set_outcome_state(state, stateless, success=True)
+            await translate_batch(
+                message, from_lang, to_lang, phrases, batch_concurrency, reply_markup=keyboard
+            )
+            return None
+
+        phrase = phrases[0]
+        cached = cached_corrections(from_lang, to_lang, phrase) if spellcheck else []
+        if cached:
+            await set_outcome_state(state, stateless, success=True)
+            return await show_suggestions(
+                message, from_lang, to_lang, phrase, cached, keyboard, webhook_reply,
+                before_lookup=True,
+            )
+
+        try:
+            translations = await translate_text(from_lang, to_lang, phrase)
+            if not translations:
+                raise NotFound("No translations found.")
+
+            lookup_id = None
+            if len(translations) > RESULTS_PAGE_SIZE:
+                lookup_id = await save_results(state, from_lang, to_lang, translations)
+            result, markup = render_page(from_lang, to_lang, translations, 1, lookup_id, keyboard)
+
+            await set_outcome_state(state, stateless, success=True)
+            return await reply(message, result, markup, webhook_reply)
+
+        except (QuotaExceeded, CircuitOpen) as e:
+            logger.warning(f"No cached translation available and upstream unavailable: {e}")
+            return await reply(
+                message, "⏳ I'm a bit busy right now, please try again shortly.",
+                webhook_reply=webhook_reply,
+            )
+
+        except NotFound as e:
+            suggestions = suggest_corrections(from_lang, phrase) if spellcheck else []
+            if not suggestions:
+                logger.warning(f"Translation error: {e}")
+                await set_outcome_state(state, stateless, success=False)
+                return await reply(
+                    message, "⚠️ Something went wrong while translating.", keyboard, webhook_reply
+                )
+            await set_outcome_state(state, stateless, success=False)
+            return await show_suggestions(
+                message, from_lang, to_lang, phrase, suggestions, keyboard, webhook_reply
+            )
+
+        except TranslationError as e:
+            logger.warning(f"Translation error: {e}")
+            await set_outcome_state(state, stateless, success=False)
+            return await reply(
+                message, "⚠️ Something went wrong while translating.", keyboard, webhook_reply
+            )
+
+
+def cached_corrections(from_lang: str, to_lang: str, phrase: str) -> list[str]:
+    """
+    Find close phrases answerable without the network for a phrase that is not.
+
+    Called before the upstream lookup, so a misspelling of a cached phrase
+    does not cost an upstream request unless the user asks for it.
+
+    Args:
+        from_lang (str): Source language code.
+        to_lang (str): Target language code.
+        phrase (str): Phrase as typed by the user.
+
+    Returns:
+        list: Suggested spellings with cached translations, best first; empty
+            if the phrase itself is known locally or cannot be offered as a
+            button to search as typed.
+    """
+    if did_you_mean_data(from_lang, to_lang, phrase) is None:
+        return []
+    if spelling.knows(from_lang, phrase) or lookup_local(from_lang, to_lang, phrase) is not None:
+        return []
+    return [s for s in suggest_corrections(from_lang, phrase) if lookup_local(from_lang, to_lang, s)]
+
+
+def suggest_corrections(from_lang: str, phrase: str) -> list[str]:
     """
-    data = await state.get_data()
-    from_lang = data.get("from_lang")
-    to_lang = data.get("to_lang")
-    phrase = data.get("word")
+    Find known phrases close to `phrase`.
 
-    try:
-        translations = await translate_text(from_lang, to_lang, phrase)
-        if not translations:
-            raise TranslationError("No translations found.")
+    Args:
+        from_lang (str): Source language code.
+        phrase (str): Phrase as typed by the user.
+
+    Returns:
+        list: Suggested spellings, best first.
+    """
+    return [s for s in spelling.suggest(from_lang, phrase) if s != normalize_phrase(phrase)]
+
+
+async def show_suggestions(
+    message: Message,
+    from_lang: str,
+    to_lang: str,
+    phrase: str,
+    suggestions: list[str],
+    keyboard: InlineKeyboardMarkup,
+    webhook_reply: bool = False,
+    before_lookup: bool = False,
+) -> SendMessage | None:
+    """
+    Offer "did you mean" buttons for a phrase.
+
+    Nothing is translated until the user picks a button.
+
+    Args:
+        message (Message): Message to reply to.
+        from_lang (str): Source language code.
+        to_lang (str): Target language code.
+        phrase (str): Phrase as typed by the user.
+        suggestions (list): Result of `cached_corrections` or `suggest_corrections`.
+        keyboard (InlineKeyboardMarkup): Next-step buttons shown below the suggestions.
+        webhook_reply (bool): Return the reply instead of sending it.
+        before_lookup (bool): The phrase has not been looked up yet; add a
+            button to search it as typed.
 
-        result = format_translation_result(
-            translations,
+    Returns:
+        SendMessage | None: The reply, when `webhook_reply` is set.
+    """
+    SPELLING_CORRECTIONS.inc()
+    if before_lookup:
+        text = f"🔎 I don't know “{phrase}” yet. Did you mean:"
+        alternatives = did_you_mean_keyboard(from_lang, to_lang, suggestions, phrase)
+    else:
+        text = f"🤷 No translations found for “{phrase}”. Did you mean:"
+        alternatives = did_you_mean_keyboard(from_lang, to_lang, suggestions)
+    return await reply(
+        message,
+        text,
+        InlineKeyboardMarkup(
+            inline_keyboard=alternatives.inline_keyboard + keyboard.inline_keyboard
+        ),
+        webhook_reply,
+    )
+
+
+@router.callback_query(F.data.startswith("dym:"))
+async def handle_did_you_mean(
+    callback: CallbackQuery,
+    state: FSMContext,
+    stateless: bool = False,
+    query_log: QueryLog | None = None,
+    webhook_reply: bool = False,
+) -> SendMessage | None:
+    """
+    Translate the alternative picked from the "did you mean" buttons.
+
+    Args:
+        callback (CallbackQuery): Callback with the pair and the phrase.
+        state (FSMContext): FSM context.
+        stateless (bool): Skip FSM state transitions.
+        query_log (QueryLog | None): Log of looked-up phrases.
+        webhook_reply (bool): Return the reply for the webhook response.
+
+    Returns:
+        SendMessage | None: The reply, when `webhook_reply` is set.
+    """
+    _, from_lang, to_lang, phrase = callback.data.split(":", 3)
+    await callback.answer()
+    return await handle_text_input(
+        callback.message,
+        state,
+        from_lang,
+        to_lang,
+        phrase,
+        stateless=stateless,
+        query_log=query_log,
+        webhook_reply=webhook_reply,
+    )
+
+
+def render_page(
+    from_lang: str,
+    to_lang: str,
+    translations: list[tuple[dict, float]],
+    page: int,
+    lookup_id: str | None,
+    keyboard: InlineKeyboardMarkup,
+) -> tuple[str, InlineKeyboardMarkup]:
+    """
+    Format one page of ranked translations and its buttons.
+
+    Args:
+        from_lang (str): Source language code.
+        to_lang (str): Target language code.
+        translations (list): All ranked translations of the lookup.
+        page (int): Page to show, starting at 1 (clamped to the last page).
+        lookup_id (str | None): Id under which `translations` were saved
+            (see `save_results`); None if they are not paged.
+        keyboard (InlineKeyboardMarkup): Next-step buttons.
+
+    Returns:
+        tuple: Message text and keyboard (with navigation if paged).
+    """
+    pages = max(1, math.ceil(len(translations) / RESULTS_PAGE_SIZE))
+    page = min(max(page, 1), pages)
+    start = (page - 1) * RESULTS_PAGE_SIZE
+    with span("format"):
+        text = format_translation_result(
+            translations[start : start + RESULTS_PAGE_SIZE],
             from_lang,
             to_lang,
             lang_name_fn=get_lang_name,
             quality_marker_fn=quality_marker,
+            page=page,
+            pages=pages,
         )
+    if lookup_id is None or pages == 1:
+        return text, keyboard
+    return text, pages_keyboard(lookup_id, page, pages, keyboard)
+
+
+def results_key(state: FSMContext) -> StorageKey:
+    """
+    Return the storage key holding the saved result lists of a chat.
+    """
+    return replace(state.key, destiny="results")
+
+
+async def save_results(
+    state: FSMContext | None,
+    from_lang: str,
+    to_lang: str,
+    translations: list[tuple[dict, float]],
+) -> str | None:
+    """
+    Save a ranked result list in FSM storage for paging.
+
+    The storage is shared between webhook processes, so any of them can
+    serve the next page. Only the `RESULTS_KEPT` most recent lists of a
+    chat are kept; the storage's TTL drops idle ones.
+
+    Args:
+        state (FSMContext | None): FSM context of the chat.
+        from_lang (str): Source language code.
+        to_lang (str): Target language code.
+        translations (list): Ranked translations as shown.
+
+    Returns:
+        str | None: Lookup id for the page buttons, None without storage.
+    """
+    if state is None:
+        return None
+    key = results_key(state)
+    with span("storage"):
+        saved = await state.storage.get_data(key)
+        saved = dict(list(saved.items())[-(RESULTS_KEPT - 1) :])
+        lookup_id = secrets.token_urlsafe(6)
+        saved[lookup_id] = {
+            "pair": [from_lang, to_lang],
+            "translations": [[t, s] for t, s in translations],
+        }
+        await state.storage.set_data(key, saved)
+    return lookup_id
+
+
+async def load_results(
+    state: FSMContext, lookup_id: str
+) -> tuple[str, str, list[tuple[dict, float]]] | None:
+    """
+    Load a result list saved by `save_results`.
+
+    Returns:
+        tuple | None: (from_lang, to_lang, translations), or None if expired.
+    """
+    with span("storage"):
+        entry = (await state.storage.get_data(results_key(state))).get(lookup_id)
+    if entry is None:
+        return None
+    from_lang, to_lang = entry["pair"]
+    return from_lang, to_lang, [(t, s) for t, s in entry["translations"]]
+
+
+@router.callback_query(F.data.startswith("page:"))
+async def handle_page(callback: CallbackQuery, state: FSMContext, stateless: bool = False):
+    """
+    Show another page of a long result list, from saved results only.
+
+    Nothing is looked up again: if the list has expired the user is asked
+    to search again.
+
+    Args:
+        callback (CallbackQuery): Callback with the lookup id and page number.
+        state (FSMContext): FSM context of the chat.
+        stateless (bool): Carry the pair in the retry button instead of FSM state.
+    """
+    parts = callback.data.split(":")
+    entry = await load_results(state, parts[1]) if len(parts) == 3 else None
+    if entry is None:
+        await callback.answer("⌛ These results have expired, please search again.")
+        return
+
+    from_lang, to_lang, translations = entry
+    keyboard = next_steps_keyboard(from_lang, to_lang, stateless)
+    text, markup = render_page(from_lang, to_lang, translations, int(parts[2]), parts[1], keyboard)
+    await callback.answer()
+    with span("send"):
+        await callback.message.edit_text(text, reply_markup=markup)
+
+
+def next_steps_keyboard(from_lang: str, to_lang: str, stateless: bool) -> InlineKeyboardMarkup:
+    """
+    Return the restart/retry buttons attached to translation results.
+
+    Args:
+        from_lang (str): Source language code.
+        to_lang (str): Target language code.
+        stateless (bool): Carry the pair in the retry button instead of FSM state.
+
+    Returns:
+        InlineKeyboardMarkup: Restart and retry buttons.
+    """
+    return restart_keyboard_for(from_lang, to_lang) if stateless else restart_keyboard
+
+
+async def set_outcome_state(state: FSMContext, stateless: bool, success: bool):
+    """
+    Move to the success or error state, unless running stateless.
+
+    Args:
+        state (FSMContext): FSM context.
+        stateless (bool): Skip FSM state transitions.
+        success (bool): Whether the translation succeeded.
+    """
+    if stateless:
+        return
+    with span("storage"):
+        await state.set_state(TranslateState.success if success else TranslateState.error)
+
+
+async def reply(
+    message: Message,
+    text: str,
+    reply_markup: InlineKeyboardMarkup | ForceReply | None = None,
+    webhook_reply: bool = False,
+) -> SendMessage | None:
+    """
+    Answer in the chat of `message`.
+
+    With `webhook_reply` the `SendMessage` call is returned instead of
+    being sent; the handler passes it up so the webhook can answer
+    Telegram's request with it and skip the outbound API call.
+
+    Args:
+        message (Message): Message in the chat to answer.
+        text (str): Message text.
+        reply_markup (InlineKeyboardMarkup | ForceReply | None): Buttons to attach.
+        webhook_reply (bool): Return the call instead of sending it.
+
+    Returns:
+        SendMessage | None: The call, when `webhook_reply` is set.
+    """
+    method = message.answer(text, reply_markup=reply_markup)
+    if webhook_reply:
+        return method
+    with span("send"):
+        await method
+    return None
+
+
+async def translate_batch(
+    message: Message,
+    from_lang: str,
+    to_lang: str,
+    phrases: list[str],
+    concurrency: int,
+    reply_markup: InlineKeyboardMarkup | None = None,
+):
+    """
+    Translate a word list, editing a single reply as lookups finish.
+
+    Edits are rate limited to one per `BATCH_EDIT_INTERVAL` seconds; the
+    final state is always written, together with `reply_markup`.
+
+    Args:
+        message (Message): Message with the word list.
+        from_lang (str): Source language code.
+        to_lang (str): Target language code.
+        phrases (list): Distinct phrases to translate.
+        concurrency (int): Maximum number of simultaneous lookups.
+        reply_markup (InlineKeyboardMarkup | None): Buttons added with the final edit.
+    """
+    if len(phrases) > MAX_BATCH_LINES:
+        await message.answer(f"✂️ Only the first {MAX_BATCH_LINES} lines will be translated.")
+        phrases = phrases[:MAX_BATCH_LINES]
+
+    rows = dict.fromkeys(phrases)
+
+    def render() -> str:
+        with span("format"):
+            text = format_batch_result(
+                list(rows.items()),
+                from_lang,
+                to_lang,
+                lang_name_fn=get_lang_name,
+                quality_marker_fn=quality_marker,
+            )
+        return truncate_utf16(text, MAX_MESSAGE_LENGTH)
+
+    text = render()
+    with span("send"):
+        sent = await message.answer(text)
+    last_edit = time.monotonic()
+    pending = len(rows)
 
-        await state.set_state(TranslateState.success)
-        await message.answer(result)
-        await handle_success_state(message, state)
+    async for phrase, result in translate_many(from_lang, to_lang, phrases, concurrency):
+        rows[phrase] = [] if isinstance(result, NotFound) else result
+        pending -= 1
+        if not pending:
+            break
+        if time.monotonic() - last_edit < BATCH_EDIT_INTERVAL:
+            continue
+        new_text = render()
+        if new_text != text:  # Telegram rejects edits that change nothing
+            text = new_text
+            with span("send"):
+                await sent.edit_text(text)
+            last_edit = time.monotonic()
 
-    except TranslationError as e:
-        logger.warning(f"Translation error: {e}")
-        await state.set_state(TranslateState.error)
-        await message.answer("⚠️ Something went wrong while translating.")
-        await handle_error_state(message, state)
+    new_text = render()
+    with span("send"):
+        if new_text != text:
+            await sent.edit_text(new_text, reply_markup=reply_markup)
+        elif reply_markup is not None:
+            await sent.edit_reply_markup(reply_markup=reply_markup)
@@ -0,0 +1,113 @@
+"""
+Registry of supported languages.
+
+Name lookups and every language selection keyboard are built once at
+import time and shared between requests, so handlers never rebuild them.
+"""
+
+from types import MappingProxyType
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+# Supported languages with flags and codes
+LANGUAGES = (
+    ("🇧🇬 Bulgarian", "bg"),
+    ("🇨🇿 Czech", "cs"),
+    ("🇬🇧 English", "en"),
+    ("🇫🇷 French", "fr"),
+    ("🇩🇪 German", "de"),
+    ("🇭🇷 Croatian", "hr"),
+    ("🇮🇹 Italian", "it"),
+    ("🇵🇱 Polish", "pl"),
+    ("🇵🇹 Portuguese", "pt"),
+    ("🇷🇺 Russian", "ru"),
+    ("🇷🇸 Serbian", "sr"),
+    ("🇸🇰 Slovak", "sk"),
+    ("🇪🇸 Spanish", "es"),
+    ("🇺🇦 Ukrainian", "uk"),
+)
+
+LANG_NAMES = MappingProxyType({code: name for name, code in LANGUAGES})
+
+
+def get_lang_name(lang_code: str) -> str:
+    """
+    Return the language name (with flag) for a given language code.
+
+    Args:
+        lang_code (str): ISO language code.
+
+    Returns:
+        str: Human-readable language name with flag, or raw code if not found.
+    """
+    return LANG_NAMES.get(lang_code, lang_code)
+
+
+def parse_pair(text: str) -> tuple[str, str]:
+    """
+    Parse a language pair written as "<from>-<to>", e.g. "en-it".
+
+    Args:
+        text (str): Pair to parse.
+
+    Returns:
+        tuple: (from_lang, to_lang).
+
+    Raises:
+        ValueError: If the text is not two different supported language codes.
+    """
+    from_lang, sep, to_lang = text.strip().lower().partition("-")
+    if not sep or from_lang not in LANG_NAMES or to_lang not in LANG_NAMES or from_lang == to_lang:
+        raise ValueError(f"Expected a language pair like 'en-it', got {text!r}")
+    return from_lang, to_lang
+
+
+def build_language_keyboard(
+    prefix: str, excluded_code: str = None
+) -> InlineKeyboardMarkup:
+    """
+    Build an inline keyboard for selecting a language.
+
+    Args:
+        prefix (str): Callback data prefix (e.g., "from", "to:en").
+        excluded_code (str, optional): Language code to exclude.
+
+    Returns:
+        InlineKeyboardMarkup: Keyboard with language options.
+    """
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [InlineKeyboardButton(text=name, callback_data=f"{prefix}:{code}")]
+            for name, code in LANGUAGES
+            if code != excluded_code
+        ]
+    )
+
+
+FROM_KEYBOARD = build_language_keyboard("from")
+TO_KEYBOARDS = MappingProxyType(
+    {code: build_language_keyboard(f"to:{code}", excluded_code=code) for _, code in LANGUAGES}
+)
+
+
+def from_keyboard() -> InlineKeyboardMarkup:
+    """
+    Return the shared source language keyboard.
+    """
+    return FROM_KEYBOARD
+
+
+def to_keyboard(from_lang: str) -> InlineKeyboardMarkup:
+    """
+    Return the shared target language keyboard for a source language.
+
+    Args:
+        from_lang (str): Selected source language code, excluded from the options.
+
+    Returns:
+        InlineKeyboardMarkup: Keyboard with callback_data "to:<from_lang>:<code>".
+    """
+    keyboard = TO_KEYBOARDS.get(from_lang)
+    if keyboard is None:
+        keyboard = build_language_keyboard(f"to:{from_lang}", excluded_code=from_lang)
+    return keyboard
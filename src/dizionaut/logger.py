@@ -1,11 +1,146 @@
-from loguru import logger
+"""
+Logging setup.
+
+The "dev" profile writes colored, human-readable lines to stdout. The
+"prod" profile hands records to a background thread that writes one JSON
+object per line, and samples repeated exceptions so that an upstream
+outage does not turn logging into the hot path.
+"""
+
+import json
 import sys
+import time
+from typing import IO
 
-logger.remove()  # Remove default handler
+from loguru import logger
+
+from .metrics import LOG_EXCEPTIONS
 
-logger.add(
-    sys.stdout,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{module}</cyan> - <level>{message}</level>",
-    level="INFO",
-    colorize=True
+DEV_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | "
+    "<cyan>{module}</cyan> - <level>{message}</level>"
 )
+
+
+class ExceptionSampler:
+    """
+    Log filter letting through at most `burst` records per `window` seconds
+    for each exception type raised at the same place.
+
+    Records without an exception always pass. The first record let through
+    after suppression carries the number of dropped ones as `suppressed`.
+
+    Args:
+        burst (int): Records logged per window and call site.
+        window (float): Window length in seconds.
+        clock (callable): Monotonic time source.
+    """
+
+    def __init__(self, burst: int = 5, window: float = 60.0, clock=time.monotonic):
+        self.burst = burst
+        self.window = window
+        self.clock = clock
+        self._sites: dict[tuple, list] = {}
+
+    def __call__(self, record: dict) -> bool:
+        exception = record["exception"]
+        if exception is None or exception.type is None:
+            return True
+
+        name = exception.type.__name__
+        key = (record["name"], record["line"], name)
+        now = self.clock()
+        site = self._sites.get(key)
+        if site is None or now - site[0] >= self.window:
+            suppressed = site[2] if site is not None else 0
+            site = self._sites[key] = [now, 0, 0]
+            if suppressed:
+                record["extra"]["suppressed"] = suppressed
+        if site[1] >= self.burst:
+            site[2] += 1
+            LOG_EXCEPTIONS.labels(name, "suppressed").inc()
+            return False
+        site[1] += 1
+        LOG_EXCEPTIONS.labels(name, "logged").inc()
+        return True
+
+
+class JsonSink:
+    """
+    Write records as JSON lines.
+
+    Used with `enqueue=True`, so serialization runs in loguru's writer
+    thread. Context bound with `logger.contextualize` becomes top-level
+    fields; `update_started` is turned into the update latency so far.
+    The traceback of a logged exception is taken from the formatted
+    message, since the queued record no longer holds the traceback object.
+
+    Args:
+        stream (IO): Output stream.
+    """
+
+    def __init__(self, stream: IO[str] = sys.stdout):
+        self.stream = stream
+
+    def __call__(self, message) -> None:
+        record = message.record
+        entry = {
+            "time": record["time"].isoformat(),
+            "level": record["level"].name,
+            "logger": record["name"],
+            "function": record["function"],
+            "line": record["line"],
+            "message": record["message"],
+        }
+        extra = dict(record["extra"])
+        started = extra.pop("update_started", None)
+        if started is not None:
+            entry["latency_ms"] = round((record["time"].timestamp() - started) * 1000, 1)
+        entry.update(extra)
+        exception = record["exception"]
+        if exception is not None and exception.type is not None:
+            entry["exception"] = {
+                "type": exception.type.__name__,
+                "value": str(exception.value),
+                "traceback": str(message)[len(record["message"]) :].strip("\n"),
+            }
+        self.stream.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        self.stream.flush()
+
+
+def setup_logging(
+    profile: str = "dev",
+    level: str = "INFO",
+    exception_burst: int = 5,
+    exception_window: float = 60.0,
+) -> None:
+    """
+    Replace all log handlers with the given profile.
+
+    Args:
+        profile (str): "dev" for colored text, "prod" for queued JSON lines.
+        level (str): Minimum level.
+        exception_burst (int): Exceptions logged per window and call site ("prod").
+        exception_window (float): Sampling window in seconds ("prod").
+
+    Raises:
+        ValueError: If the profile is unknown.
+    """
+    logger.remove()
+    if profile == "dev":
+        logger.add(sys.stdout, format=DEV_FORMAT, level=level, colorize=True)
+    elif profile == "prod":
+        logger.add(
+            JsonSink(),
+            format="{message}",
+            level=level,
+            enqueue=True,
+            backtrace=False,
+            diagnose=False,
+            filter=ExceptionSampler(exception_burst, exception_window),
+        )
+    else:
+        raise ValueError(f"Unknown logging profile: {profile!r}")
+
+
+setup_logging()
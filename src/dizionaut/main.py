@@ -6,15 +6,37 @@ This script initializes the bot, sets up update handling, and routes incoming
 Telegram updates to the appropriate FSM (finite state machine) logic.
 """
 import os
+import sys
+import signal
 import asyncio
+import multiprocessing
 from aiogram import Bot, Dispatcher, types
 from aiogram.types import Update
 from aiohttp import web
 from dotenv import load_dotenv
+from pydantic import ValidationError
 
-from .logger import logger
-from .handlers import translate, start, errors, success
-
+from .logger import logger, setup_logging
+from .handlers import translate, start, errors, success, admin, inline
+from .languages import parse_pair
+from .services import api
+from .services.cache import translation_cache
+from .services.store import TranslationStore
+from .services.limits import UpstreamBudget
+from .services.resilience import CircuitBreaker, UpstreamPolicy, OPEN, HALF_OPEN
+from .services.backends import create_strategy
+from .services.dictionary import load_indexes
+from .services.querylog import CachePrewarmer, QueryLog
+from .services.spelling import spelling
+from .middlewares.throttling import ChatThrottlingMiddleware
+from .updates import UpdateQueue, webhook_reply_payload
+from .storage import create_storage
+from . import metrics
+from .middlewares.metrics import HandlerMetricsMiddleware
+from .middlewares.logcontext import LogContextMiddleware
+from .tracing import TracingMiddleware
+from .fastjson import loads
+from .profiler import profiler
 
 
 load_dotenv()
@@ -22,61 +44,580 @@ load_dotenv()
 TOKEN = os.getenv("TELEGRAM_TOKEN")
 MODE = os.getenv("MODE", "poll")
 WEBHOOK_URL = os.getenv("WEBHOOK_URL")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+
+# Logging: "dev" (colored text) or "prod" (queued JSON lines, sampled exceptions)
+LOG_PROFILE = os.getenv("LOG_PROFILE", "dev")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_EXCEPTION_BURST = int(os.getenv("LOG_EXCEPTION_BURST", "5"))
+LOG_EXCEPTION_WINDOW = float(os.getenv("LOG_EXCEPTION_WINDOW", "60"))
+
+setup_logging(
+    LOG_PROFILE,
+    level=LOG_LEVEL,
+    exception_burst=LOG_EXCEPTION_BURST,
+    exception_window=LOG_EXCEPTION_WINDOW,
+)
+
+# Webhook update queue: worker pool size, queue bound and drain timeout
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "8"))
+WEBHOOK_QUEUE_SIZE = int(os.getenv("WEBHOOK_QUEUE_SIZE", "1000"))
+WEBHOOK_DRAIN_TIMEOUT = float(os.getenv("WEBHOOK_DRAIN_TIMEOUT", "10"))
+
+# Answer with the reply in the webhook response instead of queueing updates
+WEBHOOK_REPLY = os.getenv("WEBHOOK_REPLY", "false").lower() in ("1", "true", "yes")
+WEBHOOK_REPLY_TIMEOUT = float(os.getenv("WEBHOOK_REPLY_TIMEOUT", "2"))
+
+# Webhook server: port and number of processes sharing it via SO_REUSEPORT
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8080"))
+WEBHOOK_PROCESSES = int(os.getenv("WEBHOOK_PROCESSES", "1"))
+
+# FSM storage (memory://, sqlite:///path or redis://...) and idle state TTL
+FSM_STORAGE_URL = os.getenv("FSM_STORAGE_URL", "memory://")
+FSM_STATE_TTL = float(os.getenv("FSM_STATE_TTL", str(24 * 3600)))
+
+# Standalone /metrics listener (0 = disabled). In polling mode and with a
+# single webhook process /metrics is also served by the webhook server;
+# several webhook processes listen on METRICS_PORT + process index each
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+# Updates slower than this are logged with their span breakdown (0 = off)
+TRACE_SLOW_MS = float(os.getenv("TRACE_SLOW_MS", "1000"))
+
+# Sampling profiler: admins may run /profile; PROFILE_ON_START profiles the
+# first N seconds after startup
+ADMIN_IDS = frozenset(int(i) for i in os.getenv("ADMIN_IDS", "").split(",") if i.strip())
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_ON_START = float(os.getenv("PROFILE_ON_START", "0"))
+
+# Inline mode: default pair, per-user debounce and Telegram-side cache time
+INLINE_DEFAULT_PAIR = parse_pair(os.getenv("INLINE_DEFAULT_PAIR", "en-it"))
+INLINE_DEBOUNCE_MS = float(os.getenv("INLINE_DEBOUNCE_MS", "300"))
+INLINE_CACHE_TIME = int(os.getenv("INLINE_CACHE_TIME", "300"))
+
+# Parallel lookups when a message contains a word list (one per line)
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+# Carry the language pair in messages instead of FSM storage
+STATELESS_FLOW = os.getenv("STATELESS_FLOW", "false").lower() in ("1", "true", "yes")
+
+# Connection pool settings for the translation API client
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+HTTP2 = os.getenv("HTTP2", "false").lower() in ("1", "true", "yes")
+
+# Translation cache settings
+CACHE_MAX_SIZE = int(os.getenv("CACHE_MAX_SIZE", "5000"))
+CACHE_TTL = float(os.getenv("CACHE_TTL", str(24 * 3600)))
+CACHE_NEGATIVE_TTL = float(os.getenv("CACHE_NEGATIVE_TTL", "300"))
+
+# Best translations kept per lookup (0 = all)
+RESULTS_TOP_K = int(os.getenv("RESULTS_TOP_K", "30"))
+
+# Persistent translation store, disabled unless STORE_PATH is set
+STORE_PATH = os.getenv("STORE_PATH")
+STORE_TTL = float(os.getenv("STORE_TTL", str(7 * 24 * 3600)))
+STORE_MAX_AGE = float(os.getenv("STORE_MAX_AGE", str(90 * 24 * 3600)))
+STORE_COMPACT_INTERVAL = float(os.getenv("STORE_COMPACT_INTERVAL", "3600"))
+
+store: TranslationStore | None = None
+
+# Upstream quota (0 = unlimited, split between webhook processes) and
+# per-chat lookup rate (0 = no throttling)
+UPSTREAM_REQUESTS_PER_DAY = int(os.getenv("UPSTREAM_REQUESTS_PER_DAY", "0"))
+UPSTREAM_CHARS_PER_DAY = int(os.getenv("UPSTREAM_CHARS_PER_DAY", "0"))
+CHAT_RATE_PER_MINUTE = float(os.getenv("CHAT_RATE_PER_MINUTE", "20"))
+CHAT_BURST = int(os.getenv("CHAT_BURST", "5"))
+
+# Upstream deadline, retries, hedging and circuit breaker (0 = disabled)
+UPSTREAM_DEADLINE = float(os.getenv("UPSTREAM_DEADLINE", "15"))
+UPSTREAM_RETRIES = int(os.getenv("UPSTREAM_RETRIES", "1"))
+UPSTREAM_BACKOFF_MS = float(os.getenv("UPSTREAM_BACKOFF_MS", "200"))
+UPSTREAM_HEDGE = os.getenv("UPSTREAM_HEDGE", "false").lower() in ("1", "true", "yes")
+UPSTREAM_HEDGE_MIN_MS = float(os.getenv("UPSTREAM_HEDGE_MIN_MS", "50"))
+BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES", "5"))
+BREAKER_RESET = float(os.getenv("BREAKER_RESET", "30"))
+
+# Translation backends, queried concurrently when more than one is listed
+TRANSLATION_BACKENDS = [
+    b.strip() for b in os.getenv("TRANSLATION_BACKENDS", "mymemory").split(",") if b.strip()
+]
+BACKEND_STRATEGY = os.getenv("BACKEND_STRATEGY", "race")
+BACKEND_DEADLINE = float(os.getenv("BACKEND_DEADLINE", "0"))
+DICTIONARY_DIR = os.getenv("DICTIONARY_DIR")
+HTTP_BACKEND_URL = os.getenv("HTTP_BACKEND_URL")
+
+# Compiled "<from>-<to>.idx" dictionary indexes answered without a network hop
+DICTIONARY_INDEX_DIR = os.getenv("DICTIONARY_INDEX_DIR")
+
+dictionaries: dict = {}
+
+# "Did you mean" suggestions for phrases without translations, from phrases
+# already translated and (opt-in, ~3 KB each per process) dictionary phrases
+SPELLCHECK = os.getenv("SPELLCHECK", "true").lower() in ("1", "true", "yes")
+SPELL_DICTIONARY_WORDS = int(os.getenv("SPELL_DICTIONARY_WORDS", "0"))
+SPELL_INDEX_MAX_PHRASES = int(os.getenv("SPELL_INDEX_MAX_PHRASES", "20000"))
+
+# Query log and pre-warming of the most popular phrases (0 = no pre-warming)
+QUERY_LOG_PATH = os.getenv("QUERY_LOG_PATH")
+QUERY_LOG_MAX_BYTES = int(os.getenv("QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+QUERY_LOG_BACKUPS = int(os.getenv("QUERY_LOG_BACKUPS", "3"))
+PREWARM_TOP_N = int(os.getenv("PREWARM_TOP_N", "100"))
+PREWARM_WINDOW = float(os.getenv("PREWARM_WINDOW", str(7 * 24 * 3600)))
+PREWARM_INTERVAL = float(os.getenv("PREWARM_INTERVAL", "3600"))
+PREWARM_RESERVE = int(os.getenv("PREWARM_RESERVE", "100"))
+PREWARM_CHARS_RESERVE = int(os.getenv("PREWARM_CHARS_RESERVE", "1000"))
+
+query_log = (
+    QueryLog(QUERY_LOG_PATH, max_bytes=QUERY_LOG_MAX_BYTES, backups=QUERY_LOG_BACKUPS)
+    if QUERY_LOG_PATH
+    else None
+)
+prewarmer = (
+    CachePrewarmer(
+        query_log,
+        top_n=PREWARM_TOP_N,
+        window=PREWARM_WINDOW,
+        interval=PREWARM_INTERVAL,
+        reserve=PREWARM_RESERVE,
+        chars_reserve=PREWARM_CHARS_RESERVE,
+    )
+    if query_log is not None and PREWARM_TOP_N > 0
+    else None
+)
 
 bot = Bot(token=TOKEN)
-dp = Dispatcher()
+dp = Dispatcher(
+    storage=create_storage(FSM_STORAGE_URL, ttl=FSM_STATE_TTL),
+    stateless=STATELESS_FLOW,
+    admin_ids=ADMIN_IDS,
+    profile_dir=PROFILE_DIR,
+    inline_pair=INLINE_DEFAULT_PAIR,
+    inline_debounce=INLINE_DEBOUNCE_MS / 1000,
+    inline_cache_time=INLINE_CACHE_TIME,
+    batch_concurrency=BATCH_CONCURRENCY,
+    query_log=query_log,
+    spellcheck=SPELLCHECK,
+    webhook_reply=WEBHOOK_REPLY and MODE == "webhook",
+)
+dp.update.outer_middleware(LogContextMiddleware())
+if TRACE_SLOW_MS > 0:
+    dp.update.outer_middleware(TracingMiddleware(slow_threshold=TRACE_SLOW_MS / 1000))
+handler_metrics = HandlerMetricsMiddleware()
+dp.message.middleware(handler_metrics)
+dp.callback_query.middleware(handler_metrics)
+dp.inline_query.middleware(handler_metrics)
+if CHAT_RATE_PER_MINUTE > 0:
+    translate.router.message.middleware(
+        ChatThrottlingMiddleware(rate=CHAT_RATE_PER_MINUTE / 60, burst=CHAT_BURST)
+    )
+dp.include_router(admin.router)
+dp.include_router(inline.router)
 dp.include_router(translate.router)
 dp.include_router(start.router)
 dp.include_router(errors.router)
 dp.include_router(success.router)
+update_queue = UpdateQueue(
+    dp, bot, workers=WEBHOOK_WORKERS, maxsize=WEBHOOK_QUEUE_SIZE
+)
+# Updates handled inside webhook requests (WEBHOOK_REPLY); beyond this they are queued
+webhook_replies = asyncio.Semaphore(WEBHOOK_WORKERS)
+
+metrics.CallbackMetric(
+    "dizionaut_update_queue_depth", "Updates waiting in the webhook queue",
+    lambda: update_queue.depth,
+)
+metrics.CallbackMetric(
+    "dizionaut_update_queue_rejected_total", "Updates shed because the queue was full",
+    lambda: update_queue.rejected, kind="counter",
+)
+metrics.CallbackMetric(
+    "dizionaut_spelling_phrases", "Phrases in the typo-tolerant lookup indexes",
+    lambda: sum(len(index) for index in spelling.indexes.values()),
+)
+metrics.CallbackMetric(
+    "dizionaut_cache_hits_total", "Translation cache hits",
+    lambda: translation_cache.hits, kind="counter",
+)
+metrics.CallbackMetric(
+    "dizionaut_cache_misses_total", "Translation cache misses",
+    lambda: translation_cache.misses, kind="counter",
+)
+metrics.CallbackMetric(
+    "dizionaut_cache_evictions_total", "Translation cache LRU evictions",
+    lambda: translation_cache.evictions, kind="counter",
+)
+metrics.CallbackMetric(
+    "dizionaut_cache_size", "Entries in the translation cache",
+    lambda: len(translation_cache),
+)
+metrics.CallbackMetric(
+    "dizionaut_cache_hit_ratio", "Translation cache hit ratio since startup",
+    lambda: translation_cache.stats()["hit_rate"],
+)
+metrics.CallbackMetric(
+    "dizionaut_circuit_state", "Upstream circuit breaker state (0 closed, 1 half-open, 2 open)",
+    lambda: {OPEN: 2, HALF_OPEN: 1}.get(getattr(api.get_policy().breaker, "state", None), 0),
+)
+metrics.CallbackMetric(
+    "dizionaut_lookups_coalesced_total", "Lookups that joined an in-flight request",
+    lambda: api.lookups.coalesced, kind="counter",
+)
 
 
 async def webhook_handler(request: web.Request):
     """
     Handle incoming webhook requests from Telegram.
 
-    Parses the incoming JSON payload into an Update object and dispatches it.
+    Validates the incoming JSON payload, queues the Update for the worker
+    pool and acknowledges it right away. With `WEBHOOK_REPLY` up to
+    `WEBHOOK_WORKERS` updates are handled within their request instead
+    (see `reply_in_webhook`); further ones take the queued path.
 
     Args:
         request (web.Request): Incoming HTTP POST request.
 
     Returns:
-        web.Response: Simple "OK" response.
+        web.Response: "OK" or the reply, or 429 when the update queue is full.
     """    
-    data = await request.json
-    # Convert raw JSON to Update object and feed it into the dispatcher
-    update = Update.model_validate(data)
-    await dp.feed_update(bot, update)
+    if (
+        WEBHOOK_SECRET
+        and request.headers.get("X-Telegram-Bot-Api-Secret-Token") != WEBHOOK_SECRET
+    ):
+        return web.Response(status=403)
+
+    try:
+        update = Update.model_validate(loads(await request.read()), context={"bot": bot})
+    except (ValueError, ValidationError):
+        logger.warning("Rejected malformed webhook payload")
+        return web.Response(status=400)
+
+    if WEBHOOK_REPLY and not webhook_replies.locked():
+        async with webhook_replies:
+            return await reply_in_webhook(update)
+
+    if not update_queue.try_put(update):
+        logger.warning(f"Update queue full, shedding update {update.update_id}")
+        return web.Response(status=429, headers={"Retry-After": "1"})
     return web.Response(text="OK")
 
-async def on_startup(_):
+async def reply_in_webhook(update: Update) -> web.Response:
+    """
+    Handle an update within its webhook request and return the reply.
+
+    The handler's reply is returned as the response body so Telegram sends
+    it without an outbound Bot API call; handlers still running after
+    `WEBHOOK_REPLY_TIMEOUT` continue in the background. Errors are logged
+    and acknowledged, so Telegram does not deliver the update again.
+
+    Args:
+        update (Update): Validated update.
+
+    Returns:
+        web.Response: The reply as JSON, or "OK".
+    """
+    try:
+        result = await dp.feed_webhook_update(bot, update, _timeout=WEBHOOK_REPLY_TIMEOUT)
+        if result is None:
+            return web.Response(text="OK")
+        payload = webhook_reply_payload(bot, result)
+        if payload is None:
+            await bot(result)
+            return web.Response(text="OK")
+        return web.json_response(payload)
+    except Exception:
+        logger.exception(f"Failed to handle update {update.update_id} in the webhook request")
+        return web.Response(text="OK")
+
+async def metrics_handler(request: web.Request):
+    """
+    Serve metrics in the Prometheus text format.
+
+    Args:
+        request (web.Request): Incoming HTTP GET request.
+
+    Returns:
+        web.Response: Metrics text.
+    """
+    return web.Response(text=metrics.render(), content_type="text/plain", charset="utf-8")
+
+async def start_metrics_server(port: int) -> web.AppRunner:
+    """
+    Start a standalone HTTP listener serving /metrics (used in polling mode).
+
+    Args:
+        port (int): TCP port to listen on.
+
+    Returns:
+        web.AppRunner: Runner to clean up on shutdown.
+    """
+    app = web.Application()
+    app.router.add_get("/metrics", metrics_handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, port=port).start()
+    logger.info(f"Serving metrics on port {port}")
+    return runner
+
+async def init_services(processes: int = 1):
+    """
+    Create long-lived resources shared by all handlers.
+
+    Args:
+        processes (int): Webhook processes sharing the upstream quota; each
+            gets an equal share of it.
+    """
+    if PROFILE_ON_START > 0:
+        profiler.start(
+            PROFILE_ON_START, os.path.join(PROFILE_DIR, "profile-startup.folded")
+        )
+    translation_cache.configure(
+        max_size=CACHE_MAX_SIZE, ttl=CACHE_TTL, negative_ttl=CACHE_NEGATIVE_TTL
+    )
+    spelling.configure(max_phrases=SPELL_INDEX_MAX_PHRASES)
+    api.set_top_k(RESULTS_TOP_K or None)
+    await api.init_client(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        connect_timeout=HTTP_CONNECT_TIMEOUT,
+        read_timeout=HTTP_READ_TIMEOUT,
+        http2=HTTP2,
+    )
+    api.set_policy(
+        UpstreamPolicy(
+            deadline=UPSTREAM_DEADLINE or None,
+            retries=UPSTREAM_RETRIES,
+            backoff_base=UPSTREAM_BACKOFF_MS / 1000,
+            hedge=UPSTREAM_HEDGE,
+            hedge_min_delay=UPSTREAM_HEDGE_MIN_MS / 1000,
+            breaker=(
+                CircuitBreaker(BREAKER_FAILURES, BREAKER_RESET)
+                if BREAKER_FAILURES > 0
+                else None
+            ),
+        )
+    )
+    global dictionaries
+    if DICTIONARY_INDEX_DIR:
+        dictionaries = load_indexes(DICTIONARY_INDEX_DIR)
+        api.set_dictionaries(dictionaries)
+        logger.info(
+            f"Mapped {len(dictionaries)} dictionary indexes, "
+            f"{sum(map(len, dictionaries.values()))} entries"
+        )
+        if SPELLCHECK and SPELL_DICTIONARY_WORDS > 0:
+            for (from_lang, _), index in dictionaries.items():
+                words = index.sample(SPELL_DICTIONARY_WORDS)
+                await asyncio.to_thread(spelling.get(from_lang).add_many, words)
+            logger.info(f"Spelling indexes built: {spelling.stats()}")
+    if TRANSLATION_BACKENDS != ["mymemory"]:
+        api.set_strategy(
+            create_strategy(
+                TRANSLATION_BACKENDS,
+                mode=BACKEND_STRATEGY,
+                deadline=BACKEND_DEADLINE or None,
+                dictionary_dir=DICTIONARY_DIR,
+                http_url=HTTP_BACKEND_URL,
+            )
+        )
+    api.set_budget(
+        UpstreamBudget(
+            requests_per_day=process_share(UPSTREAM_REQUESTS_PER_DAY, processes),
+            chars_per_day=process_share(UPSTREAM_CHARS_PER_DAY, processes),
+        )
+    )
+
+    global store
+    if STORE_PATH:
+        store = TranslationStore(
+            STORE_PATH,
+            ttl=STORE_TTL,
+            max_age=STORE_MAX_AGE,
+            compact_interval=STORE_COMPACT_INTERVAL,
+        )
+        await store.open()
+        api.set_store(store)
+        warmed = await api.warm_cache(CACHE_MAX_SIZE)
+        logger.info(f"Translation cache warmed with {warmed} stored entries")
+
+    if query_log is not None:
+        query_log.start()
+    if prewarmer is not None:
+        prewarmer.start()
+
+def process_share(limit: int, processes: int) -> int:
+    """
+    Split a daily limit between processes (0 stays unlimited).
+
+    Args:
+        limit (int): Limit for the whole bot.
+        processes (int): Number of processes enforcing it independently.
+
+    Returns:
+        int: Limit for one process.
+    """
+    if limit <= 0:
+        return limit
+    return max(1, limit // processes)
+
+async def close_services():
+    """
+    Release resources created by `init_services`.
+    """
+    global store, dictionaries
+    if prewarmer is not None:
+        await prewarmer.stop()
+    if query_log is not None:
+        await query_log.close()
+    await api.close_client()
+    api.set_dictionaries({})
+    for index in dictionaries.values():
+        index.close()
+    dictionaries = {}
+    if store is not None:
+        api.set_store(None)
+        await store.close()
+        store = None
+    logger.info(f"Translation cache stats: {translation_cache.stats()}")
+    logger.info(f"Coalesced lookup stats: {api.lookups.stats()}")
+    logger.info(f"Spelling index stats: {spelling.stats()}")
+
+async def on_startup(app):
     """
     Called when the aiohttp app starts.
 
-    Sets the Telegram webhook.
+    Initializes shared services and, in the primary process, sets the
+    Telegram webhook.
     """    
     logger.info("Starting up...")
-    await bot.set_webhook(WEBHOOK_URL + "/webhook")
+    await init_services(app["processes"])
+    if app["metrics_port"]:
+        app["metrics_runner"] = await start_metrics_server(app["metrics_port"])
+    update_queue.start()
+    if app["primary"]:
+        await bot.set_webhook(WEBHOOK_URL + "/webhook", secret_token=WEBHOOK_SECRET)
 
 async def on_shutdown(app):
     """
     Called when the aiohttp app shuts down.
 
-    Deletes the webhook and closes the bot session.
+    Deletes the webhook (primary process only), drains queued updates, then
+    closes the bot session, FSM storage and shared services.
     """    
     logger.info("Shutting down...")
-    await bot.delete_webhook()
+    if app["primary"]:
+        await bot.delete_webhook()
+    await update_queue.stop(timeout=WEBHOOK_DRAIN_TIMEOUT)
     await bot.session.close()
+    await dp.storage.close()
+    if "metrics_runner" in app:
+        await app["metrics_runner"].cleanup()
+    await close_services()
 
-def run_webhook():
+def serve_webhook(
+    primary: bool = True, reuse_port: bool = False, processes: int = 1, index: int = 0
+):
+    """
+    Run one aiohttp server process handling Telegram webhooks.
+
+    Metrics, the upstream quota and the circuit breaker live in process
+    memory, so with several processes a scrape of the shared port would
+    reach a random one; each process then serves /metrics on its own port
+    (`METRICS_PORT` + index) instead.
+
+    Args:
+        primary (bool): Whether this process registers and removes the webhook.
+        reuse_port (bool): Bind with SO_REUSEPORT so several processes share the port.
+        processes (int): Number of server processes sharing the port.
+        index (int): Index of this process, from 0.
     """
-    Run the aiohttp server to handle Telegram webhooks.
-    """    
     app = web.Application()
+    app["primary"] = primary
+    app["processes"] = processes
+    app["metrics_port"] = METRICS_PORT + index if processes > 1 and METRICS_PORT else None
     app.router.add_post("/webhook", webhook_handler)
+    if processes <= 1:
+        app.router.add_get("/metrics", metrics_handler)
     app.on_startup.append(on_startup)
     app.on_shutdown.append(on_shutdown)
-    web.run_app(app, port=8080)
+    web.run_app(app, port=WEBHOOK_PORT, reuse_port=reuse_port or None)
+
+def per_process_settings() -> list[str]:
+    """
+    List enabled settings whose state lives in process memory.
+
+    The per-chat throttler and the inline debounce would let each chat go
+    N times faster with N processes, and the query log (with pre-warming)
+    cannot be rotated safely by several writers.
+
+    Returns:
+        list: Names of the enabled settings.
+    """
+    enabled = {
+        "CHAT_RATE_PER_MINUTE": CHAT_RATE_PER_MINUTE > 0,
+        "INLINE_DEBOUNCE_MS": INLINE_DEBOUNCE_MS > 0,
+        "QUERY_LOG_PATH": bool(QUERY_LOG_PATH),
+    }
+    return [name for name, on in enabled.items() if on]
+
+def run_webhook(processes: int = WEBHOOK_PROCESSES):
+    """
+    Run the webhook server, optionally in several processes sharing one port.
+
+    Multiple processes require an FSM storage shared between them
+    (`FSM_STORAGE_URL` pointing at SQLite or Redis) and get an equal share
+    of the upstream quota each. Features keeping their state in process
+    memory (see `per_process_settings`) must be turned off, otherwise a
+    single process is run.
+
+    Args:
+        processes (int): Number of server processes.
+    """    
+    if processes > 1 and FSM_STORAGE_URL.startswith("memory://"):
+        logger.warning("In-memory FSM storage cannot be shared, running a single process")
+        processes = 1
+    local = per_process_settings()
+    if processes > 1 and local:
+        logger.warning(
+            f"{', '.join(local)} keep their state per process and would not be shared, "
+            "running a single process; set them to 0/unset to run several"
+        )
+        processes = 1
+    if processes <= 1:
+        serve_webhook()
+        return
+
+    logger.info(f"Starting {processes} webhook processes on port {WEBHOOK_PORT}")
+    if METRICS_PORT:
+        logger.info(f"Serving metrics on ports {METRICS_PORT}-{METRICS_PORT + processes - 1}")
+    else:
+        logger.warning("METRICS_PORT is not set, metrics are not served with several processes")
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    ctx = multiprocessing.get_context("spawn")
+    workers = [
+        ctx.Process(
+            target=serve_webhook, args=(i == 0, True, processes, i), name=f"webhook-{i}"
+        )
+        for i in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    finally:
+        # SIGTERM lets aiohttp in each worker shut down gracefully
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        for worker in workers:
+            worker.join(WEBHOOK_DRAIN_TIMEOUT + 5)
+            if worker.is_alive():
+                worker.kill()
 
 async def run_polling():
     """
@@ -84,7 +625,15 @@ async def run_polling():
     """    
     # Disable webhook to switch to polling mode
     await bot.delete_webhook(drop_pending_updates=True)
-    await dp.start_polling(bot)
+    await init_services()
+    metrics_runner = await start_metrics_server(METRICS_PORT) if METRICS_PORT else None
+    try:
+        await dp.start_polling(bot)
+    finally:
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
+        await dp.storage.close()
+        await close_services()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,213 @@
+"""
+Minimal Prometheus-compatible metrics.
+
+Counters and histograms are plain Python numbers updated from the event
+loop thread, so recording needs no locks. Labelled children are created
+once and looked up from a dict, keeping the hot path allocation-free.
+Values computed elsewhere (cache statistics, queue depth) are exposed
+through callbacks evaluated only when `/metrics` is scraped.
+"""
+
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        REGISTRY.append(self)
+
+    def labels(self, *values: str):
+        """
+        Return the child metric for the given label values, creating it once.
+        """
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Counter(_Metric):
+    """
+    Monotonically increasing counter.
+    """
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """
+        Increment the unlabelled counter.
+        """
+        self.labels().inc(amount)
+
+    def _samples(self) -> Iterable[str]:
+        for values, child in self._children.items():
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {child.value}"
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Histogram(_Metric):
+    """
+    Histogram with fixed upper bounds.
+
+    Args:
+        buckets (tuple): Sorted bucket upper bounds; +Inf is implied.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Iterable[str] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """
+        Record a value in the unlabelled histogram.
+        """
+        self.labels().observe(value)
+
+    def _samples(self) -> Iterable[str]:
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), child.counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, f'le="{bound}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {child.sum}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class CallbackMetric(_Metric):
+    """
+    Gauge or counter whose value is read from a callback at scrape time.
+
+    Args:
+        fn (callable): Returns the current value.
+        kind (str): "gauge" or "counter".
+    """
+
+    def __init__(self, name: str, help: str, fn: Callable[[], float], kind: str = "gauge"):
+        super().__init__(name, help)
+        self.fn = fn
+        self.kind = kind
+
+    def _samples(self) -> Iterable[str]:
+        yield f"{self.name} {float(self.fn())}"
+
+
+REGISTRY: list[_Metric] = []
+
+
+def render() -> str:
+    """
+    Render all registered metrics in the Prometheus text exposition format.
+
+    Returns:
+        str: Metrics text.
+    """
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+# Metrics recorded by the bot
+HANDLER_SECONDS = Histogram(
+    "dizionaut_handler_seconds", "Handler latency", labelnames=("handler",)
+)
+UPSTREAM_SECONDS = Histogram(
+    "dizionaut_upstream_seconds", "Translation API request latency"
+)
+UPSTREAM_RESPONSES = Counter(
+    "dizionaut_upstream_responses_total",
+    "Translation API responses by HTTP status ('error' for transport failures)",
+    labelnames=("status",),
+)
+UPSTREAM_MATCHES = Histogram(
+    "dizionaut_upstream_matches",
+    "Number of matches per translation API response",
+    buckets=SIZE_BUCKETS,
+)
+TRANSLATION_ERRORS = Counter(
+    "dizionaut_translation_errors_total",
+    "Translation errors by reason",
+    labelnames=("reason",),
+)
+UPSTREAM_RETRIES = Counter(
+    "dizionaut_upstream_retries_total", "Translation API requests retried after a failure"
+)
+UPSTREAM_HEDGES = Counter(
+    "dizionaut_upstream_hedges_total", "Hedged (duplicate) translation API requests sent"
+)
+SPELLING_CORRECTIONS = Counter(
+    "dizionaut_spelling_corrections_total",
+    "Phrases without translations answered with spelling suggestions",
+)
+LOG_EXCEPTIONS = Counter(
+    "dizionaut_log_exceptions_total",
+    "Logged exceptions by type and whether sampling let them through",
+    labelnames=("type", "outcome"),
+)
+DICTIONARY_HITS = Counter(
+    "dizionaut_dictionary_lookups_total",
+    "Offline dictionary index lookups by result",
+    labelnames=("result",),
+)
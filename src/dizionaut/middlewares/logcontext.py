@@ -0,0 +1,37 @@
+"""
+Middleware binding per-update context to log records.
+"""
+
+import time
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+from loguru import logger
+
+
+class LogContextMiddleware(BaseMiddleware):
+    """
+    Attach the update id, chat id and start time to every record logged
+    while the update is handled.
+
+    Values are stored as-is with `logger.contextualize`; sinks format them
+    (the JSON sink also derives the latency from the start time). Register
+    as an outer middleware on `dp.update`.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: dict[str, Any],
+    ) -> Any:
+        chat = data.get("event_chat")
+        user = data.get("event_from_user")
+        with logger.contextualize(
+            update_id=event.update_id,
+            chat_id=chat.id if chat is not None else None,
+            user_id=user.id if user is not None else None,
+            update_started=time.time(),
+        ):
+            return await handler(event, data)
@@ -0,0 +1,42 @@
+"""
+Middleware recording handler latency metrics.
+"""
+
+import time
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from ..metrics import HANDLER_SECONDS
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """
+    Observe the latency of every handler call, labelled "<module>.<function>".
+
+    Register as an inner middleware on the dispatcher's event observers
+    (e.g. `dp.message.middleware(...)`) so it applies to all routers.
+    """
+
+    def __init__(self):
+        self._children: dict[Callable, Any] = {}
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        callback = data["handler"].callback
+        child = self._children.get(callback)
+        if child is None:
+            module = callback.__module__.rsplit(".", 1)[-1]
+            child = HANDLER_SECONDS.labels(f"{module}.{callback.__name__}")
+            self._children[callback] = child
+
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            child.observe(time.perf_counter() - started)
@@ -0,0 +1,68 @@
+"""
+Per-chat throttling middleware for translation requests.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import Message
+
+from ..services.api import unique_phrases
+from ..services.limits import MAX_BATCH_LINES, KeyedRateLimiter
+
+
+class ChatThrottlingMiddleware(BaseMiddleware):
+    """
+    Drop messages from chats that exceed their lookup rate.
+
+    A word list is charged one lookup per distinct line. The first
+    throttled message in a row gets a short reply; further ones are ignored
+    silently until the chat is allowed again. A chat is forgotten once its
+    bucket would have refilled, so idle chats do not pile up.
+
+    Args:
+        rate (float): Allowed lookups per second per chat.
+        burst (int): Lookups a chat may send in quick succession.
+        clock (callable): Monotonic time source.
+    """
+
+    def __init__(
+        self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic
+    ):
+        self.limiter = KeyedRateLimiter(rate=rate, burst=burst, clock=clock)
+        self._clock = clock
+        # Chat id -> time of the "too many requests" reply, oldest first
+        self._notified: OrderedDict[int, float] = OrderedDict()
+        self._refill = burst / rate if rate > 0 else float("inf")
+        self.throttled = 0
+
+    async def __call__(
+        self,
+        handler: Callable[[Message, dict[str, Any]], Awaitable[Any]],
+        event: Message,
+        data: dict[str, Any],
+    ) -> Any:
+        chat_id = event.chat.id
+        lookups = len(unique_phrases(event.text.splitlines())) if event.text else 1
+        if self.limiter.hit(chat_id, min(max(lookups, 1), MAX_BATCH_LINES)):
+            self._notified.pop(chat_id, None)
+            return await handler(event, data)
+
+        self.throttled += 1
+        now = self._clock()
+        self._expire(now)
+        if chat_id not in self._notified:
+            self._notified[chat_id] = now
+            if len(self._notified) > self.limiter.max_keys:
+                self._notified.popitem(last=False)
+            await event.answer("⏳ Too many requests, please try again shortly.")
+        return None
+
+    def _expire(self, now: float) -> None:
+        while self._notified:
+            chat_id, notified_at = next(iter(self._notified.items()))
+            if now - notified_at < self._refill:
+                break
+            del self._notified[chat_id]
@@ -0,0 +1,81 @@
+"""
+Sampling profiler that can be switched on in a running process.
+
+A background thread periodically captures the stack of the event loop
+thread and counts identical stacks. The result is written in the
+"collapsed stacks" format (`frame;frame;frame count` per line) understood
+by flamegraph.pl, speedscope and inferno.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from loguru import logger
+
+
+class SamplingProfiler:
+    """
+    Sample one thread's stack at a fixed interval for a limited time.
+
+    Args:
+        interval (float): Seconds between samples.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration: float, path: str, thread_id: int | None = None) -> bool:
+        """
+        Start profiling in the background.
+
+        Args:
+            duration (float): Seconds to sample for.
+            path (str): Output file for collapsed stacks.
+            thread_id (int, optional): Thread to sample; defaults to the caller's.
+
+        Returns:
+            bool: False if a profiling run is already in progress.
+        """
+        if self.running:
+            return False
+        target = thread_id if thread_id is not None else threading.get_ident()
+        self._thread = threading.Thread(
+            target=self._run, args=(target, duration, path), name="profiler", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def _run(self, target: int, duration: float, path: str) -> None:
+        stacks: Counter[str] = Counter()
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            frame = sys._current_frames().get(target)
+            if frame is not None:
+                stacks[_collapse(frame)] += 1
+            time.sleep(self.interval)
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        logger.info(f"Profile with {sum(stacks.values())} samples written to {path}")
+
+
+def _collapse(frame) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+profiler = SamplingProfiler()
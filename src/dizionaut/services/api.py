@@ -5,11 +5,36 @@ Handles API requests, response parsing, translation ranking,
 and basic error handling.
 """
 
+import asyncio
+import heapq
+import time
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Hashable, Iterable
+
 import httpx
 from loguru import logger
 from operator import itemgetter
 
+from dizionaut.fastjson import parse_translation_response
+from dizionaut.metrics import (
+    DICTIONARY_HITS,
+    TRANSLATION_ERRORS,
+    UPSTREAM_HEDGES,
+    UPSTREAM_MATCHES,
+    UPSTREAM_RESPONSES,
+    UPSTREAM_RETRIES,
+    UPSTREAM_SECONDS,
+)
+from dizionaut.services.cache import make_key, normalize_phrase, translation_cache
+from dizionaut.services.dictionary import DictionaryIndex
+from dizionaut.services.limits import UpstreamBudget
+from dizionaut.services.resilience import UpstreamPolicy, backoff_delay
 from dizionaut.services.scoring import score
+from dizionaut.services.spelling import spelling
+from dizionaut.services.store import TranslationStore
+from dizionaut.tracing import span
+
+if TYPE_CHECKING:
+    from dizionaut.services.backends import BackendStrategy
 
 
 class TranslationError(Exception):
@@ -19,9 +44,346 @@ class TranslationError(Exception):
     pass
 
 
+class NotFound(TranslationError):
+    """
+    Raised when a lookup succeeded but returned no translations.
+    """
+    pass
+
+
+class QuotaExceeded(TranslationError):
+    """
+    Raised when a lookup would exceed the upstream API budget.
+    """
+    pass
+
+
+class CircuitOpen(TranslationError):
+    """
+    Raised when the circuit breaker rejects a call to an unhealthy upstream.
+    """
+    pass
+
+
 TRANSLATION_API_URL = "https://api.mymemory.translated.net/get"
 
 
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one shared task.
+
+    Waiters await the shared task through `asyncio.shield`, so cancelling
+    one waiter never cancels the work the others are waiting for, and an
+    exception raised by the task is delivered to every waiter. Only when
+    the last waiter is cancelled is the shared task cancelled too, so
+    abandoned lookups (e.g. superseded inline queries) stop early.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._waiters: dict[asyncio.Task, int] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.abandoned = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        """
+        Run `fn()` for `key`, or join the call already in flight.
+
+        Args:
+            key (Hashable): Identity of the call.
+            fn (callable): Coroutine factory performing the work.
+
+        Returns:
+            Any: Result of the shared call.
+        """
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.coalesced += 1
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1 and not task.done():
+                task.cancel()
+                self.abandoned += 1
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark as retrieved even if every waiter left
+
+    def stats(self) -> dict:
+        """
+        Return call counters.
+
+        Returns:
+            dict: Total, coalesced and abandoned calls, and calls in flight.
+        """
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "abandoned": self.abandoned,
+            "inflight": len(self._inflight),
+        }
+
+
+# Shared HTTP client, created once per process (see `init_client`)
+_client: httpx.AsyncClient | None = None
+
+# Optional persistent store of raw matches (see `set_store`)
+_store: TranslationStore | None = None
+
+# Background stale-while-revalidate refreshes, by cache key
+_refreshing: dict[tuple[str, str, str], asyncio.Task] = {}
+
+# Optional daily upstream budget (see `set_budget`)
+_budget: UpstreamBudget | None = None
+
+# Deadline, retry, hedging and circuit breaker settings (see `set_policy`)
+_policy = UpstreamPolicy()
+
+# Optional multi-backend strategy; MyMemory alone when unset
+_strategy: "BackendStrategy | None" = None
+
+# Number of ranked translations kept per lookup (None = all)
+_top_k: int | None = None
+
+# Offline dictionary indexes per language pair, consulted before any lookup
+_dictionaries: dict[tuple[str, str], DictionaryIndex] = {}
+
+# Concurrent cache misses for the same key share one lookup
+lookups = SingleFlight()
+
+
+def create_client(
+    max_connections: int = 20,
+    max_keepalive_connections: int = 10,
+    keepalive_expiry: float = 30.0,
+    connect_timeout: float = 5.0,
+    read_timeout: float = 10.0,
+    http2: bool = False,
+) -> httpx.AsyncClient:
+    """
+    Build an HTTP client with a keep-alive connection pool for the translation API.
+
+    Args:
+        max_connections (int): Upper bound on concurrently open connections.
+        max_keepalive_connections (int): Idle connections kept in the pool.
+        keepalive_expiry (float): Seconds an idle connection is kept alive.
+        connect_timeout (float): Seconds allowed to establish a connection.
+        read_timeout (float): Seconds allowed to wait for response data.
+        http2 (bool): Enable HTTP/2 (requires the optional `h2` package).
+
+    Returns:
+        httpx.AsyncClient: Configured client.
+    """
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP/2 requested but 'h2' is not installed, using HTTP/1.1")
+            http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=read_timeout,
+            pool=connect_timeout,
+        ),
+    )
+
+
+async def init_client(**kwargs) -> httpx.AsyncClient:
+    """
+    Create the shared HTTP client, replacing (and closing) any existing one.
+
+    Args:
+        **kwargs: Options passed to `create_client`.
+
+    Returns:
+        httpx.AsyncClient: The shared client.
+    """
+    global _client
+    await close_client()
+    _client = create_client(**kwargs)
+    return _client
+
+
+async def close_client() -> None:
+    """
+    Close the shared HTTP client and release pooled connections.
+    """
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Return the shared HTTP client, creating one with default settings if needed.
+
+    Returns:
+        httpx.AsyncClient: The shared client.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_client()
+    return _client
+
+
+def set_store(store: TranslationStore | None) -> None:
+    """
+    Attach (or detach, with None) the persistent translation store.
+
+    Args:
+        store (TranslationStore | None): Opened store instance.
+    """
+    global _store
+    _store = store
+
+
+def set_budget(budget: UpstreamBudget | None) -> None:
+    """
+    Attach (or detach, with None) the daily upstream request/character budget.
+
+    Args:
+        budget (UpstreamBudget | None): Budget applied to `fetch_translation_data`.
+    """
+    global _budget
+    _budget = budget
+
+
+def get_budget() -> UpstreamBudget | None:
+    """
+    Return the upstream budget, if one is set.
+    """
+    return _budget
+
+
+def set_policy(policy: UpstreamPolicy) -> None:
+    """
+    Replace the deadline/retry/hedging/circuit breaker policy for upstream calls.
+
+    Args:
+        policy (UpstreamPolicy): Policy applied by `fetch_translation_data`.
+    """
+    global _policy
+    _policy = policy
+
+
+def get_policy() -> UpstreamPolicy:
+    """
+    Return the active upstream policy.
+    """
+    return _policy
+
+
+def set_strategy(strategy: "BackendStrategy | None") -> None:
+    """
+    Set (or clear) the strategy used to query translation backends.
+
+    Args:
+        strategy (BackendStrategy | None): Strategy, or None for MyMemory only.
+    """
+    global _strategy
+    _strategy = strategy
+
+
+def set_top_k(k: int | None) -> None:
+    """
+    Set how many of the best translations are kept per lookup.
+
+    Args:
+        k (int | None): Number of translations, or None to keep all.
+    """
+    global _top_k
+    _top_k = k
+
+
+def set_dictionaries(indexes: dict[tuple[str, str], DictionaryIndex]) -> None:
+    """
+    Replace the offline dictionary indexes.
+
+    Args:
+        indexes (dict): {(from_lang, to_lang): DictionaryIndex}.
+    """
+    global _dictionaries
+    _dictionaries = indexes
+
+
+def make_match(
+    translation: str,
+    source: str,
+    match: float = 1.0,
+    quality: int = 100,
+    usage_count: int = 0,
+) -> dict:
+    """
+    Build a match entry in the normalized (MyMemory) shape.
+
+    Args:
+        translation (str): Translated text.
+        source (str): Backend name, stored as "created-by".
+        match (float): Match value, 0.0–1.0.
+        quality (int): Quality value, 0–100.
+        usage_count (int): How often the translation was used.
+
+    Returns:
+        dict: Match entry.
+    """
+    return {
+        "translation": translation,
+        "match": match,
+        "quality": quality,
+        "created-by": source,
+        "usage-count": usage_count,
+        "penalty": 0,
+    }
+
+
+async def warm_cache(limit: int) -> int:
+    """
+    Fill the in-process cache with the freshest entries from the persistent store.
+
+    Args:
+        limit (int): Maximum number of entries to load.
+
+    Returns:
+        int: Number of cached entries.
+    """
+    if _store is None:
+        return 0
+
+    warmed = 0
+    for key, matches, updated_at in reversed(await _store.load_recent(limit)):
+        if _store.is_fresh(updated_at):
+            _remember(key, rank_matches(matches))
+            warmed += 1
+    return warmed
+
+
 def _deduplicate_translations(
     scored_translations: list[tuple[dict, float]],
 ) -> list[tuple[dict, float]]:
@@ -48,6 +410,13 @@ async def translate_text(
     """
     Perform a translation request using the MyMemory API.
 
+    Results, including empty ones, are served from `translation_cache`
+    when available, skipping both the network request and scoring.
+    On a cache miss the persistent store, if attached, is consulted next;
+    stale stored entries are returned immediately and refreshed in the
+    background. Concurrent misses for the same key share a single lookup.
+    Phrases found in an offline dictionary index skip the network entirely.
+
     Args:
         from_lang (str): Source language code (e.g., 'en').
         to_lang (str): Target language code (e.g., 'it').
@@ -57,21 +426,229 @@ async def translate_text(
         list: List of (translation_dict, score) tuples, sorted by score (descending).
 
     Raises:
-        TranslationError: If no translations are returned or request fails.
+        NotFound: If no translations are returned.
+        TranslationError: If the request fails.
+    """
+    key = make_key(from_lang, to_lang, phrase)
+    ranked = translation_cache.get(key)
+    if ranked is None:
+        ranked = _lookup_dictionary(key)
+    if ranked is None:
+        ranked = await lookups.do(
+            key, lambda: _lookup(key, from_lang, to_lang, phrase)
+        )
+
+    if not ranked:
+        TRANSLATION_ERRORS.labels("not_found").inc()
+        raise NotFound("No translations found.")
+    return ranked
+
+
+def lookup_local(
+    from_lang: str, to_lang: str, phrase: str
+) -> list[tuple[dict, float]] | None:
     """
-    data = await fetch_translation_data(from_lang, to_lang, phrase)
-    matches = data.get("matches", [])
-    if not matches:
-        raise TranslationError("No translations found.")
+    Answer from the in-process cache or a dictionary index, never the network.
 
-    scored = [(t, score(t)) for t in matches]
-    scored = _deduplicate_translations(scored)
-    return sorted(scored, key=itemgetter(1), reverse=True)
+    Args:
+        from_lang (str): Source language code.
+        to_lang (str): Target language code.
+        phrase (str): Text to translate.
+
+    Returns:
+        list | None: Ranked translations (empty if known to have none),
+            or None if the phrase is not known locally.
+    """
+    key = make_key(from_lang, to_lang, phrase)
+    ranked = translation_cache.get(key)
+    if ranked is None:
+        ranked = _lookup_dictionary(key)
+    return ranked
+
+
+def unique_phrases(phrases: Iterable[str]) -> list[str]:
+    """
+    Strip phrases and drop empty ones and duplicates (by normalized form).
+
+    Args:
+        phrases (Iterable[str]): Raw phrases, e.g. lines of a message.
+
+    Returns:
+        list: First occurrence of each distinct phrase, in input order.
+    """
+    seen = {}
+    for phrase in phrases:
+        phrase = phrase.strip()
+        if phrase:
+            seen.setdefault(normalize_phrase(phrase), phrase)
+    return list(seen.values())
+
+
+async def translate_many(
+    from_lang: str, to_lang: str, phrases: Iterable[str], concurrency: int = 8
+) -> AsyncIterator[tuple[str, list[tuple[dict, float]] | TranslationError]]:
+    """
+    Translate several phrases concurrently, yielding results as they complete.
+
+    Phrases are deduplicated with `unique_phrases` and looked up through
+    `translate_text`, so the cache, coalescing and quota apply to each.
+    At most `concurrency` lookups run at once. Leaving the iteration early
+    cancels the remaining lookups.
+
+    Args:
+        from_lang (str): Source language code.
+        to_lang (str): Target language code.
+        phrases (Iterable[str]): Texts to translate.
+        concurrency (int): Maximum number of simultaneous lookups.
+
+    Yields:
+        tuple: (phrase, ranked translations) or (phrase, TranslationError).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def lookup(phrase: str):
+        async with semaphore:
+            try:
+                return phrase, await translate_text(from_lang, to_lang, phrase)
+            except TranslationError as e:
+                return phrase, e
+
+    tasks = [asyncio.create_task(lookup(p)) for p in unique_phrases(phrases)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _remember(key: tuple[str, str, str], ranked: list[tuple[dict, float]]) -> None:
+    """
+    Cache a ranking and make non-empty results known to the typo index.
+    """
+    translation_cache.set(key, ranked)
+    if ranked:
+        spelling.add(key[0], key[2])
+
+
+def _lookup_dictionary(key: tuple[str, str, str]) -> list[tuple[dict, float]] | None:
+    """
+    Answer from the offline dictionary index of the language pair, if any.
+    """
+    index = _dictionaries.get(key[:2])
+    if index is None:
+        return None
+    translations = index.lookup(key[2])
+    DICTIONARY_HITS.labels("hit" if translations else "miss").inc()
+    if not translations:
+        return None
+
+    ranked = rank_matches([make_match(t, "Dictionary") for t in translations])
+    _remember(key, ranked)
+    return ranked
+
+
+async def _lookup(
+    key: tuple[str, str, str], from_lang: str, to_lang: str, phrase: str
+) -> list[tuple[dict, float]]:
+    """
+    Resolve a cache miss from the persistent store or the API.
+    """
+    stored = await _load_stored(key)
+    if stored is None:
+        return await _fetch_and_rank(key, from_lang, to_lang, phrase)
+
+    matches, updated_at = stored
+    if not _store.is_fresh(updated_at):
+        _schedule_refresh(key, from_lang, to_lang, phrase)
+    ranked = rank_matches(matches)
+    _remember(key, ranked)
+    return ranked
+
+
+async def _fetch_and_rank(
+    key: tuple[str, str, str], from_lang: str, to_lang: str, phrase: str
+) -> list[tuple[dict, float]]:
+    """
+    Fetch matches from the backends, persist and cache their ranking.
+    """
+    if _strategy is None:
+        data = await fetch_translation_data(from_lang, to_lang, phrase)
+        matches = data.get("matches", [])
+    else:
+        matches = await _strategy.lookup(from_lang, to_lang, phrase)
+    if matches and _store is not None:
+        _store.put(key, matches)
+
+    ranked = rank_matches(matches)
+    _remember(key, ranked)
+    return ranked
+
+
+async def _load_stored(key: tuple[str, str, str]) -> tuple[list[dict], float] | None:
+    """
+    Read an entry from the persistent store, treating store failures as misses.
+    """
+    if _store is None:
+        return None
+    try:
+        return await _store.get(key)
+    except Exception:
+        logger.exception("Failed to read translation store")
+        return None
+
+
+def _schedule_refresh(
+    key: tuple[str, str, str], from_lang: str, to_lang: str, phrase: str
+) -> None:
+    """
+    Refresh a stale entry in the background, at most once per key at a time.
+    """
+    if key in _refreshing:
+        return
+
+    async def refresh():
+        try:
+            await _fetch_and_rank(key, from_lang, to_lang, phrase)
+        except TranslationError:
+            logger.warning(f"Background refresh failed for {key}, keeping stale entry")
+        finally:
+            _refreshing.pop(key, None)
+
+    _refreshing[key] = asyncio.create_task(refresh())
+
+
+def rank_matches(matches: list[dict]) -> list[tuple[dict, float]]:
+    """
+    Score, deduplicate and sort raw translation matches.
+
+    When a top-k limit is set (see `set_top_k`) and there are more
+    translations, only the k best are selected, with a heap instead of
+    a full sort.
+
+    Args:
+        matches (list): Raw `matches` entries from the API response.
+
+    Returns:
+        list: List of (translation_dict, score) tuples, sorted by score (descending).
+    """
+    with span("score"):
+        scored = [(t, score(t)) for t in matches]
+        scored = _deduplicate_translations(scored)
+        if _top_k is not None and len(scored) > _top_k:
+            return heapq.nlargest(_top_k, scored, key=itemgetter(1))
+        return sorted(scored, key=itemgetter(1), reverse=True)
 
 
 async def fetch_translation_data(from_lang: str, to_lang: str, phrase: str) -> dict:
     """
-    Fetch raw translation response from MyMemory API.
+    Fetch translation matches from MyMemory API.
+
+    The active `UpstreamPolicy` (see `set_policy`) bounds the whole call by a
+    deadline, retries transport errors, 429 and 5xx responses with jittered
+    backoff, optionally hedges slow requests and fails fast while the
+    circuit breaker is open. Only those failures and missed deadlines
+    count towards opening the circuit.
 
     Args:
         from_lang (str): Source language code.
@@ -79,19 +656,130 @@ async def fetch_translation_data(from_lang: str, to_lang: str, phrase: str) -> d
         phrase (str): Text to translate.
 
     Returns:
-        dict: Raw JSON response.
+        dict: {"matches": [...]} with only the match fields used for ranking
+            (see `fastjson.parse_translation_response`).
 
     Raises:
+        QuotaExceeded: If the upstream budget is exhausted.
+        CircuitOpen: If the circuit breaker rejects the call.
         TranslationError: If the request fails or the response is invalid.
     """
+    breaker = _policy.breaker
+    if breaker is not None and not breaker.allow():
+        TRANSLATION_ERRORS.labels("circuit_open").inc()
+        raise CircuitOpen("Upstream circuit open")
+
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                TRANSLATION_API_URL,
-                params={"q": phrase, "langpair": f"{from_lang}|{to_lang}"},
-            )
-            response.raise_for_status()
-            return response.json()
+        with span("fetch"):
+            async with asyncio.timeout(_policy.deadline):
+                data = await _fetch_with_retries(from_lang, to_lang, phrase)
+    except QuotaExceeded:
+        if breaker is not None:
+            breaker.release()
+        raise
     except Exception as e:
+        if breaker is not None:
+            # A 4xx or an unparsable body says nothing about upstream health
+            if _is_retryable(e) or isinstance(e, TimeoutError):
+                breaker.record_failure()
+            else:
+                breaker.release()
+        TRANSLATION_ERRORS.labels("upstream").inc()
         logger.exception("Failed to fetch translation data")
         raise TranslationError("API request failed") from e
+    except BaseException:
+        if breaker is not None:
+            breaker.release()
+        raise
+
+    if breaker is not None:
+        breaker.record_success()
+    UPSTREAM_MATCHES.observe(len(data.get("matches") or ()))
+    return data
+
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Tell whether a failed request may succeed if repeated.
+    """
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+async def _fetch_with_retries(from_lang: str, to_lang: str, phrase: str) -> dict:
+    """
+    Make the request, retrying retryable failures with jittered backoff.
+    """
+    for attempt in range(_policy.retries + 1):
+        try:
+            return await _fetch_hedged(from_lang, to_lang, phrase)
+        except Exception as e:
+            if attempt == _policy.retries or not _is_retryable(e):
+                raise
+            delay = backoff_delay(attempt, _policy.backoff_base, _policy.backoff_max)
+            UPSTREAM_RETRIES.inc()
+            logger.warning(
+                f"Upstream attempt {attempt + 1} failed ({e!r}), retrying in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+
+async def _fetch_hedged(from_lang: str, to_lang: str, phrase: str) -> dict:
+    """
+    Make the request; if it is slower than the recent p95, race a second one.
+    """
+    delay = _policy.hedge_delay()
+    if delay is None:
+        return await _request(from_lang, to_lang, phrase)
+
+    first = asyncio.create_task(_request(from_lang, to_lang, phrase))
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result()
+
+    UPSTREAM_HEDGES.inc()
+    tasks = {first, asyncio.create_task(_request(from_lang, to_lang, phrase))}
+    pending = tasks
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _request(from_lang: str, to_lang: str, phrase: str) -> dict:
+    """
+    Send one HTTP request to the API, charging the upstream budget.
+    """
+    if _budget is not None and not _budget.try_spend(len(phrase)):
+        TRANSLATION_ERRORS.labels("quota").inc()
+        raise QuotaExceeded("Upstream budget exhausted")
+
+    started = time.perf_counter()
+    try:
+        response = await get_client().get(
+            TRANSLATION_API_URL,
+            params={"q": phrase, "langpair": f"{from_lang}|{to_lang}"},
+        )
+    except Exception:
+        UPSTREAM_RESPONSES.labels("error").inc()
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        UPSTREAM_SECONDS.observe(elapsed)
+
+    UPSTREAM_RESPONSES.labels(str(response.status_code)).inc()
+    response.raise_for_status()
+    _policy.latency.add(elapsed)
+    return parse_translation_response(response.content)
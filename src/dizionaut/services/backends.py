@@ -0,0 +1,330 @@
+"""
+Pluggable translation backends and strategies for combining them.
+
+Every backend returns matches normalized to the MyMemory `matches` item
+shape consumed by `scoring.score` and `api._deduplicate_translations`:
+
+    {"translation": str, "match": float, "quality": int,
+     "created-by": str, "usage-count": int, "penalty": float}
+
+A `BackendStrategy` either races its backends and keeps the first good
+answer, or queries them all and merges the answers for rescoring.
+"""
+
+import asyncio
+import csv
+import math
+import os
+
+from loguru import logger
+
+from dizionaut.services import api
+from dizionaut.services.api import TranslationError, make_match
+from dizionaut.services.cache import normalize_phrase
+
+RACE = "race"
+MERGE = "merge"
+
+
+class TranslationBackend:
+    """
+    Base class for translation backends.
+    """
+
+    name = "backend"
+
+    async def lookup(self, from_lang: str, to_lang: str, phrase: str) -> list[dict]:
+        """
+        Look up translations.
+
+        Args:
+            from_lang (str): Source language code.
+            to_lang (str): Target language code.
+            phrase (str): Text to translate.
+
+        Returns:
+            list: Normalized match entries (possibly empty).
+
+        Raises:
+            TranslationError: If the backend fails.
+        """
+        raise NotImplementedError
+
+
+class MyMemoryBackend(TranslationBackend):
+    """
+    The MyMemory API, with all policies of `api.fetch_translation_data`.
+    """
+
+    name = "mymemory"
+
+    async def lookup(self, from_lang: str, to_lang: str, phrase: str) -> list[dict]:
+        data = await api.fetch_translation_data(from_lang, to_lang, phrase)
+        return data.get("matches") or []
+
+
+class DictionaryBackend(TranslationBackend):
+    """
+    In-memory bilingual dictionary.
+
+    Args:
+        entries (dict): {(from_lang, to_lang, normalized phrase): [translations]}.
+    """
+
+    name = "dictionary"
+    source = "Dictionary"
+
+    def __init__(self, entries: dict[tuple[str, str, str], list[str]] | None = None):
+        self.entries = entries or {}
+
+    @classmethod
+    def from_directory(cls, path: str) -> "DictionaryBackend":
+        """
+        Load every "<from>-<to>.tsv" file in a directory.
+
+        Each line holds a phrase and its translation separated by a tab;
+        repeated phrases collect several translations.
+
+        Args:
+            path (str): Directory with TSV files.
+
+        Returns:
+            DictionaryBackend: Backend with the loaded entries.
+        """
+        backend = cls()
+        for filename in sorted(os.listdir(path)):
+            stem, ext = os.path.splitext(filename)
+            if ext != ".tsv" or "-" not in stem:
+                continue
+            from_lang, to_lang = stem.split("-", 1)
+            with open(os.path.join(path, filename), encoding="utf-8", newline="") as f:
+                for row in csv.reader(f, delimiter="\t"):
+                    if len(row) >= 2 and row[0].strip() and row[1].strip():
+                        backend.add(from_lang, to_lang, row[0], row[1].strip())
+        return backend
+
+    def add(self, from_lang: str, to_lang: str, phrase: str, translation: str) -> None:
+        """
+        Add one dictionary entry.
+        """
+        key = (from_lang, to_lang, normalize_phrase(phrase))
+        self.entries.setdefault(key, []).append(translation)
+
+    async def lookup(self, from_lang: str, to_lang: str, phrase: str) -> list[dict]:
+        translations = self.entries.get((from_lang, to_lang, normalize_phrase(phrase)), ())
+        return [make_match(t, self.source) for t in translations]
+
+
+class HttpBackend(TranslationBackend):
+    """
+    Generic JSON-over-HTTP translation service.
+
+    Sends `GET url?q=<phrase>&source=<from>&target=<to>` and accepts either
+    a list or an object with a "translations" or "matches" list, whose items
+    are strings or objects with "translation"/"text" and an optional
+    "score" (0.0–1.0).
+
+    Args:
+        url (str): Endpoint URL.
+        name (str): Backend name, also used as the match source.
+    """
+
+    def __init__(self, url: str, name: str = "http"):
+        self.url = url
+        self.name = name
+
+    async def lookup(self, from_lang: str, to_lang: str, phrase: str) -> list[dict]:
+        try:
+            response = await api.get_client().get(
+                self.url, params={"q": phrase, "source": from_lang, "target": to_lang}
+            )
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            raise TranslationError(f"{self.name} request failed") from e
+
+        if isinstance(data, dict):
+            data = data.get("translations") or data.get("matches") or []
+        if not isinstance(data, list):
+            raise TranslationError(f"{self.name} returned an unexpected response")
+        matches = []
+        for item in data:
+            if isinstance(item, str):
+                matches.append(make_match(item, self.name))
+            elif isinstance(item, dict):
+                text = item.get("translation") or item.get("text")
+                if not text or not isinstance(text, str):
+                    continue
+                try:
+                    score = float(item.get("score", 1.0) or 0)
+                except (TypeError, ValueError):
+                    score = math.nan
+                if not math.isfinite(score):
+                    logger.warning(f"{self.name} returned an invalid score for {text!r}, skipped")
+                    continue
+                score = min(max(score, 0.0), 1.0)
+                matches.append(make_match(text, self.name, score, int(score * 100)))
+        return matches
+
+
+class BackendStrategy:
+    """
+    Query several backends concurrently.
+
+    In `race` mode the first backend returning a non-empty answer wins and
+    the others are cancelled. In `merge` mode all answers that arrive
+    before the deadline are combined, to be rescored and deduplicated by
+    the caller. An empty result is only returned when every backend
+    answered; if some failed or missed the deadline it is an error, so
+    that it is not cached as "not found".
+
+    Args:
+        backends (list): Backends to query.
+        mode (str): "race" or "merge".
+        deadline (float | None): Seconds to wait for answers.
+    """
+
+    def __init__(
+        self,
+        backends: list[TranslationBackend],
+        mode: str = RACE,
+        deadline: float | None = None,
+    ):
+        if mode not in (RACE, MERGE):
+            raise ValueError(f"Unknown backend strategy: {mode!r}")
+        self.backends = backends
+        self.mode = mode
+        self.deadline = deadline
+
+    async def lookup(self, from_lang: str, to_lang: str, phrase: str) -> list[dict]:
+        """
+        Look up translations using the configured mode.
+
+        Returns:
+            list: Normalized match entries.
+
+        Raises:
+            TranslationError: If no backend found translations and not all
+                of them answered; the original error if all failed the same way.
+        """
+        if len(self.backends) == 1:
+            return await self.backends[0].lookup(from_lang, to_lang, phrase)
+
+        tasks = {
+            asyncio.create_task(backend.lookup(from_lang, to_lang, phrase)): backend
+            for backend in self.backends
+        }
+        try:
+            if self.mode == RACE:
+                return await self._race(tasks)
+            return await self._merge(tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _race(self, tasks: dict[asyncio.Task, TranslationBackend]) -> list[dict]:
+        pending = set(tasks)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline if self.deadline else None
+        errors = []
+        while pending:
+            timeout = max(deadline - loop.time(), 0) if deadline else None
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for task in done:
+                if task.exception() is not None:
+                    errors.append(task.exception())
+                    logger.warning(f"Backend {tasks[task].name} failed: {task.exception()!r}")
+                elif task.result():
+                    return task.result()
+        for task in pending:
+            logger.warning(f"Backend {tasks[task].name} missed the deadline")
+        _check_complete(errors, len(pending), len(tasks))
+        return []
+
+    async def _merge(self, tasks: dict[asyncio.Task, TranslationBackend]) -> list[dict]:
+        done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+        for task in pending:
+            logger.warning(f"Backend {tasks[task].name} missed the deadline")
+
+        matches = []
+        errors = []
+        for task in done:
+            if task.exception() is not None:
+                errors.append(task.exception())
+                logger.warning(f"Backend {tasks[task].name} failed: {task.exception()!r}")
+            else:
+                matches.extend(task.result())
+        if not matches:
+            _check_complete(errors, len(pending), len(tasks))
+        return matches
+
+
+def _check_complete(errors: list[BaseException], missed: int, total: int) -> None:
+    """
+    Raise unless every backend answered, so an empty result can be trusted.
+
+    Args:
+        errors (list): Exceptions raised by failed backends.
+        missed (int): Backends that missed the deadline.
+        total (int): Backends queried.
+
+    Raises:
+        TranslationError: If some backend failed or missed the deadline. When
+            all failed with the same `TranslationError` type (e.g. QuotaExceeded,
+            CircuitOpen), the first of those errors is re-raised.
+    """
+    if len(errors) == total and all(type(e) is type(errors[0]) for e in errors):
+        if isinstance(errors[0], TranslationError):
+            raise errors[0]
+    if len(errors) == total:
+        raise TranslationError("All translation backends failed") from errors[0]
+    if errors or missed:
+        raise TranslationError(
+            f"No complete answer: {len(errors)} backends failed, {missed} missed the deadline"
+        )
+
+
+def create_strategy(
+    names: list[str],
+    mode: str = RACE,
+    deadline: float | None = None,
+    dictionary_dir: str | None = None,
+    http_url: str | None = None,
+) -> BackendStrategy:
+    """
+    Build a strategy from backend names.
+
+    Args:
+        names (list): Backend names: "mymemory", "dictionary", "http".
+        mode (str): "race" or "merge".
+        deadline (float | None): Seconds to wait for answers.
+        dictionary_dir (str | None): Directory with TSV files for "dictionary".
+        http_url (str | None): Endpoint URL for "http".
+
+    Returns:
+        BackendStrategy: Configured strategy.
+
+    Raises:
+        ValueError: If a backend is unknown or misconfigured.
+    """
+    backends: list[TranslationBackend] = []
+    for name in names:
+        if name == "mymemory":
+            backends.append(MyMemoryBackend())
+        elif name == "dictionary":
+            if not dictionary_dir:
+                raise ValueError("The dictionary backend needs DICTIONARY_DIR")
+            backends.append(DictionaryBackend.from_directory(dictionary_dir))
+        elif name == "http":
+            if not http_url:
+                raise ValueError("The http backend needs HTTP_BACKEND_URL")
+            backends.append(HttpBackend(http_url))
+        else:
+            raise ValueError(f"Unknown translation backend: {name!r}")
+    if not backends:
+        raise ValueError("No translation backends configured")
+    return BackendStrategy(backends, mode=mode, deadline=deadline)
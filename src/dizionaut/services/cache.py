@@ -0,0 +1,161 @@
+"""
+In-process cache for scored translation results.
+
+Entries are keyed by language pair and normalized phrase, evicted in
+least-recently-used order once the size limit is reached, and expire
+after a configurable time to live.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+
+def normalize_phrase(phrase: str) -> str:
+    """
+    Normalize a phrase for use in cache keys.
+
+    Collapses internal whitespace, trims the ends and folds case.
+
+    Args:
+        phrase (str): Raw user input.
+
+    Returns:
+        str: Normalized phrase.
+    """
+    return " ".join(phrase.split()).casefold()
+
+
+def make_key(from_lang: str, to_lang: str, phrase: str) -> tuple[str, str, str]:
+    """
+    Build a cache key for a translation lookup.
+
+    Args:
+        from_lang (str): Source language code.
+        to_lang (str): Target language code.
+        phrase (str): Text to translate.
+
+    Returns:
+        tuple: (from_lang, to_lang, normalized phrase).
+    """
+    return from_lang, to_lang, normalize_phrase(phrase)
+
+
+class TranslationCache:
+    """
+    Bounded LRU cache with per-entry expiry.
+
+    Empty results ("No translations found") are stored with a separate,
+    usually shorter, time to live so that misses are retried sooner.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 5000,
+        ttl: float = 24 * 3600,
+        negative_ttl: float = 300,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._data: OrderedDict[Hashable, tuple[float, list]] = OrderedDict()
+        self._clock = clock
+        self.configure(max_size=max_size, ttl=ttl, negative_ttl=negative_ttl)
+
+    def configure(self, max_size: int, ttl: float, negative_ttl: float) -> None:
+        """
+        Apply new limits and drop all cached entries and counters.
+
+        Args:
+            max_size (int): Maximum number of entries (0 disables caching).
+            ttl (float): Lifetime of non-empty results, in seconds.
+            negative_ttl (float): Lifetime of empty results, in seconds.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.clear()
+
+    def clear(self) -> None:
+        """
+        Remove all entries and reset counters.
+        """
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > self._clock()
+
+    def get(self, key: Hashable) -> list | None:
+        """
+        Look up a cached result and mark it as recently used.
+
+        Args:
+            key (Hashable): Key built with `make_key`.
+
+        Returns:
+            list | None: Cached result, or None on miss or expiry.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: list) -> None:
+        """
+        Store a result, evicting the least recently used entries if full.
+
+        Args:
+            key (Hashable): Key built with `make_key`.
+            value (list): Scored translations; an empty list marks "not found".
+        """
+        if self.max_size <= 0:
+            return
+
+        ttl = self.ttl if value else self.negative_ttl
+        if ttl <= 0:
+            return
+
+        self._data[key] = (self._clock() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """
+        Return cache counters.
+
+        Returns:
+            dict: Size, hits, misses, evictions, expirations and hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Process-wide cache used by `services.api.translate_text`
+translation_cache = TranslationCache()
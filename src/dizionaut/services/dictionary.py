@@ -0,0 +1,232 @@
+"""
+Memory-mapped bilingual dictionary index.
+
+An index file holds one language pair as a sorted string table:
+
+    header   b"DZX1", entry count (uint32)
+    offsets  count + 1 little-endian uint64, relative to the table
+    table    records "<normalized phrase>\\0<translation>\\x1f<translation>..."
+
+Records are sorted by the UTF-8 bytes of the phrase, so lookups are a
+binary search over the mapped file and nothing is loaded into Python
+objects up front. Compile word lists with:
+
+    python -m dizionaut.services.dictionary en-it.tsv -o dictionaries/en-it.idx
+"""
+
+import argparse
+import csv
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator
+
+from dizionaut.services.cache import normalize_phrase
+
+MAGIC = b"DZX1"
+_HEADER = struct.Struct("<4sI")
+_OFFSET = struct.Struct("<Q")
+_KEY_END = b"\x00"
+_SEPARATOR = b"\x1f"
+
+
+def compile_index(pairs: Iterable[tuple[str, str]], path: str) -> int:
+    """
+    Write an index from (phrase, translation) pairs.
+
+    Phrases are normalized like cache keys; repeated phrases collect
+    their distinct translations in input order.
+
+    Args:
+        pairs (Iterable): (phrase, translation) pairs.
+        path (str): Output file.
+
+    Returns:
+        int: Number of distinct phrases written.
+    """
+    entries: dict[bytes, list[str]] = {}
+    for phrase, translation in pairs:
+        key = normalize_phrase(phrase).encode()
+        translation = translation.strip()
+        if not key or not translation:
+            continue
+        translations = entries.setdefault(key, [])
+        if translation not in translations:
+            translations.append(translation)
+
+    keys = sorted(entries)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(keys)))
+        offset = 0
+        for key in keys:
+            f.write(_OFFSET.pack(offset))
+            offset += len(key) + 1 + len(_SEPARATOR.join(t.encode() for t in entries[key]))
+        f.write(_OFFSET.pack(offset))
+        for key in keys:
+            f.write(key + _KEY_END + _SEPARATOR.join(t.encode() for t in entries[key]))
+    os.replace(tmp, path)
+    return len(keys)
+
+
+def read_pairs(path: str) -> Iterable[tuple[str, str]]:
+    """
+    Read (phrase, translation) pairs from a TSV or CSV word list.
+
+    Args:
+        path (str): Word list; ".csv" files are comma-separated, others tab-separated.
+
+    Yields:
+        tuple: (phrase, translation).
+    """
+    delimiter = "," if path.endswith(".csv") else "\t"
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.reader(f, delimiter=delimiter):
+            if len(row) >= 2:
+                yield row[0], row[1]
+
+
+class DictionaryIndex:
+    """
+    Read-only view of a compiled index file.
+
+    Args:
+        path (str): Index file.
+
+    Raises:
+        ValueError: If the file is not a dictionary index.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a dictionary index")
+        self._table = _HEADER.size + (self._count + 1) * _OFFSET.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def _bounds(self, i: int) -> tuple[int, int]:
+        start, end = struct.unpack_from("<QQ", self._mm, _HEADER.size + i * _OFFSET.size)
+        return self._table + start, self._table + end
+
+    def _key(self, i: int) -> bytes:
+        start, end = self._bounds(i)
+        return self._mm[start : self._mm.find(_KEY_END, start, end)]
+
+    def _translations(self, i: int) -> list[str]:
+        start, end = self._bounds(i)
+        value = self._mm[self._mm.find(_KEY_END, start, end) + 1 : end]
+        return [t.decode() for t in value.split(_SEPARATOR)]
+
+    def _bisect(self, key: bytes) -> int:
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def keys(self) -> Iterator[str]:
+        """
+        Iterate over the indexed phrases in sorted order.
+        """
+        for i in range(self._count):
+            yield self._key(i).decode()
+
+    def sample(self, n: int) -> list[str]:
+        """
+        Return up to `n` phrases spread evenly over the whole index.
+
+        Args:
+            n (int): Number of phrases.
+
+        Returns:
+            list: Phrases in sorted order, covering the alphabet rather than
+                only its beginning.
+        """
+        if n <= 0 or not self._count:
+            return []
+        step = max(1.0, self._count / n)
+        return [self._key(int(i * step)).decode() for i in range(min(n, self._count))]
+
+    def lookup(self, phrase: str) -> list[str]:
+        """
+        Find the translations of a phrase.
+
+        Args:
+            phrase (str): Phrase, normalized before the search.
+
+        Returns:
+            list: Translations, empty if the phrase is not in the index.
+        """
+        key = normalize_phrase(phrase).encode()
+        i = self._bisect(key)
+        if i < self._count and self._key(i) == key:
+            return self._translations(i)
+        return []
+
+    def prefix(self, prefix: str, limit: int = 10) -> list[tuple[str, list[str]]]:
+        """
+        List entries whose phrase starts with a prefix, in sorted order.
+
+        Args:
+            prefix (str): Phrase prefix, normalized before the search.
+            limit (int): Maximum number of entries.
+
+        Returns:
+            list: (phrase, translations) pairs.
+        """
+        key = normalize_phrase(prefix).encode()
+        results = []
+        i = self._bisect(key)
+        while i < self._count and len(results) < limit:
+            found = self._key(i)
+            if not found.startswith(key):
+                break
+            results.append((found.decode(), self._translations(i)))
+            i += 1
+        return results
+
+
+def load_indexes(directory: str) -> dict[tuple[str, str], DictionaryIndex]:
+    """
+    Map every "<from>-<to>.idx" file in a directory.
+
+    Args:
+        directory (str): Directory with index files.
+
+    Returns:
+        dict: {(from_lang, to_lang): DictionaryIndex}.
+    """
+    indexes = {}
+    for filename in sorted(os.listdir(directory)):
+        stem, ext = os.path.splitext(filename)
+        if ext == ".idx" and "-" in stem:
+            from_lang, to_lang = stem.split("-", 1)
+            indexes[from_lang, to_lang] = DictionaryIndex(os.path.join(directory, filename))
+    return indexes
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compile word lists into a dictionary index.")
+    parser.add_argument("sources", nargs="+", help="TSV or CSV files: phrase, translation")
+    parser.add_argument("-o", "--output", required=True, help="index file, e.g. en-it.idx")
+    args = parser.parse_args(argv)
+
+    pairs = (pair for source in args.sources for pair in read_pairs(source))
+    count = compile_index(pairs, args.output)
+    print(f"{args.output}: {count} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Token-bucket rate limiting for upstream quota and per-chat throttling.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+DAY = 24 * 3600
+
+# Lines of a word list translated from one message, each charged as a lookup
+MAX_BATCH_LINES = 50
+
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to `capacity` tokens, refilled continuously.
+
+    Args:
+        capacity (float): Maximum number of tokens (burst size).
+        refill_rate (float): Tokens added per second.
+        clock (callable): Monotonic time source.
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        refill_rate: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    @property
+    def tokens(self) -> float:
+        """
+        Number of tokens currently available.
+        """
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self, amount: float = 1, allow_debt: bool = False) -> bool:
+        """
+        Take `amount` tokens if available.
+
+        Args:
+            amount (float): Tokens to take.
+            allow_debt (bool): Take the whole amount as soon as one token is
+                available, leaving the bucket negative until it refills. Lets
+                a request costing more than the capacity through once.
+
+        Returns:
+            bool: True if the tokens were taken, False if the bucket is short.
+        """
+        self._refill()
+        if self._tokens < (min(amount, 1) if allow_debt else amount):
+            return False
+        self._tokens -= amount
+        return True
+
+    def refund(self, amount: float = 1) -> None:
+        """
+        Return tokens taken by `try_acquire` that ended up unused.
+        """
+        self._tokens = min(self._tokens + amount, self.capacity)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_rate)
+            self._updated = now
+
+
+class UpstreamBudget:
+    """
+    Daily request and character budget for the translation API.
+
+    Both limits refill evenly over a day; a limit of 0 disables it.
+
+    Args:
+        requests_per_day (int): Maximum upstream requests per day.
+        chars_per_day (int): Maximum characters sent upstream per day.
+        clock (callable): Monotonic time source.
+    """
+
+    def __init__(
+        self,
+        requests_per_day: int = 0,
+        chars_per_day: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.requests = (
+            TokenBucket(requests_per_day, requests_per_day / DAY, clock)
+            if requests_per_day > 0
+            else None
+        )
+        self.chars = (
+            TokenBucket(chars_per_day, chars_per_day / DAY, clock)
+            if chars_per_day > 0
+            else None
+        )
+        self.rejected = 0
+
+    def try_spend(self, chars: int) -> bool:
+        """
+        Account for one upstream request of `chars` characters.
+
+        Args:
+            chars (int): Length of the query text.
+
+        Returns:
+            bool: True if the request fits in the budget.
+        """
+        if self.requests is not None and not self.requests.try_acquire(1):
+            self.rejected += 1
+            return False
+        if self.chars is not None and not self.chars.try_acquire(chars):
+            if self.requests is not None:
+                self.requests.refund(1)
+            self.rejected += 1
+            return False
+        return True
+
+    def stats(self) -> dict:
+        """
+        Return remaining budget and rejection count.
+
+        Returns:
+            dict: Remaining requests and characters (None if unlimited), rejections.
+        """
+        return {
+            "requests_left": int(self.requests.tokens) if self.requests else None,
+            "chars_left": int(self.chars.tokens) if self.chars else None,
+            "rejected": self.rejected,
+        }
+
+
+class KeyedRateLimiter:
+    """
+    Per-key token buckets, keeping at most `max_keys` recently seen keys.
+
+    Args:
+        rate (float): Allowed events per second per key.
+        burst (float): Bucket capacity per key.
+        max_keys (int): Number of tracked keys before the oldest are dropped.
+        clock (callable): Monotonic time source.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_keys: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: OrderedDict[Hashable, TokenBucket] = OrderedDict()
+
+    def hit(self, key: Hashable, cost: int = 1) -> bool:
+        """
+        Record an event for `key`.
+
+        An event costing more than one token is allowed whenever one token
+        is available; the rest is taken as debt that delays later events.
+
+        Args:
+            key (Hashable): Identity being limited (e.g. chat id).
+            cost (int): Tokens the event uses (e.g. lookups it triggers).
+
+        Returns:
+            bool: True if the event is allowed.
+        """
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.burst, self.rate, self._clock)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.try_acquire(cost, allow_debt=True)
@@ -0,0 +1,236 @@
+"""
+Query log of translation lookups and cache pre-warming from it.
+
+Lookups are buffered in memory and appended to a JSON-lines file in
+batches from a worker thread; the file rotates by size. The pre-warmer
+periodically counts the most popular phrases per language pair over a
+sliding window and fetches the ones missing from the cache, one at a
+time and only while the upstream budget has room to spare.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from typing import Callable
+
+from loguru import logger
+
+from dizionaut.services import api
+from dizionaut.services.api import CircuitOpen, NotFound, QuotaExceeded, TranslationError
+from dizionaut.services.cache import make_key, normalize_phrase, translation_cache
+
+
+class QueryLog:
+    """
+    Batched, size-rotated log of (time, from_lang, to_lang, phrase) records.
+
+    Args:
+        path (str): Log file path; rotated files get ".1", ".2", ... suffixes.
+        max_bytes (int): Size at which the file is rotated.
+        backups (int): Number of rotated files to keep.
+        flush_interval (float): Seconds between batched writes.
+        clock (callable): Wall-clock time source.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 10 * 1024 * 1024,
+        backups: int = 3,
+        flush_interval: float = 1.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self._pending: list[str] = []
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """
+        Start the background flush loop.
+        """
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        """
+        Stop the flush loop and write pending records.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    def record(self, from_lang: str, to_lang: str, phrase: str) -> None:
+        """
+        Queue one lookup for writing; never blocks.
+        """
+        self._pending.append(
+            json.dumps([round(self.clock(), 3), from_lang, to_lang, phrase], ensure_ascii=False)
+        )
+
+    async def flush(self) -> None:
+        """
+        Append all pending records in one write.
+        """
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        try:
+            await asyncio.to_thread(self._write, batch)
+        except OSError:
+            logger.exception("Failed to write query log batch")
+
+    async def top_phrases(self, window: float, n: int) -> dict[tuple[str, str], list[str]]:
+        """
+        Count the most frequent phrases per language pair.
+
+        Args:
+            window (float): Seconds of history to consider.
+            n (int): Phrases to return per language pair.
+
+        Returns:
+            dict: {(from_lang, to_lang): [normalized phrase, ...]}, most frequent first.
+        """
+        counts = await asyncio.to_thread(self._count, self.clock() - window)
+        return {pair: [p for p, _ in c.most_common(n)] for pair, c in counts.items()}
+
+    def _write(self, batch: list[str]) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(batch) + "\n")
+            size = f.tell()
+        if size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        for i in range(self.backups, 0, -1):
+            source = f"{self.path}.{i - 1}" if i > 1 else self.path
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i}")
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _count(self, since: float) -> dict[tuple[str, str], Counter]:
+        counts: dict[tuple[str, str], Counter] = defaultdict(Counter)
+        paths = [self.path] + [f"{self.path}.{i}" for i in range(1, self.backups + 1)]
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        ts, from_lang, to_lang, phrase = json.loads(line)
+                    except ValueError:
+                        continue
+                    if ts >= since:
+                        counts[from_lang, to_lang][normalize_phrase(phrase)] += 1
+        return counts
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+
+class CachePrewarmer:
+    """
+    Keep the most popular phrases in the translation cache.
+
+    Args:
+        log (QueryLog): Source of popularity data.
+        top_n (int): Phrases per language pair to keep warm.
+        window (float): Seconds of history to rank phrases over.
+        interval (float): Seconds between runs after the startup run.
+        reserve (int): Upstream requests left in the daily budget below
+            which pre-warming stops, keeping them for users.
+        chars_reserve (int): The same for the daily character budget.
+        pause (float): Seconds between fetches.
+    """
+
+    def __init__(
+        self,
+        log: QueryLog,
+        top_n: int = 100,
+        window: float = 7 * 24 * 3600,
+        interval: float = 3600.0,
+        reserve: int = 100,
+        chars_reserve: int = 1000,
+        pause: float = 0.1,
+    ):
+        self.log = log
+        self.top_n = top_n
+        self.window = window
+        self.interval = interval
+        self.reserve = reserve
+        self.chars_reserve = chars_reserve
+        self.pause = pause
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """
+        Start pre-warming now and then every `interval` seconds.
+        """
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """
+        Cancel the background task.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _budget_allows(self, phrase: str) -> bool:
+        budget = api.get_budget()
+        if budget is None:
+            return True
+        stats = budget.stats()
+        requests_left, chars_left = stats["requests_left"], stats["chars_left"]
+        if requests_left is not None and requests_left <= self.reserve:
+            return False
+        return chars_left is None or chars_left - len(phrase) >= self.chars_reserve
+
+    async def run_once(self) -> int:
+        """
+        Fetch popular phrases missing from the cache.
+
+        Returns:
+            int: Number of phrases now cached; failed lookups are not counted.
+        """
+        top = await self.log.top_phrases(self.window, self.top_n)
+        warmed = 0
+        for (from_lang, to_lang), phrases in top.items():
+            for phrase in phrases:
+                if make_key(from_lang, to_lang, phrase) in translation_cache:
+                    continue
+                if not self._budget_allows(phrase):
+                    logger.info("Pre-warming paused to preserve the upstream budget")
+                    return warmed
+                try:
+                    await api.translate_text(from_lang, to_lang, phrase)
+                    warmed += 1
+                except NotFound:
+                    warmed += 1  # the empty answer is cached as well
+                except (QuotaExceeded, CircuitOpen):
+                    return warmed
+                except TranslationError:
+                    pass
+                await asyncio.sleep(self.pause)
+        return warmed
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                warmed = await self.run_once()
+                if warmed:
+                    logger.info(f"Pre-warmed {warmed} popular phrases")
+            except Exception:
+                logger.exception("Cache pre-warming failed")
+            await asyncio.sleep(self.interval)
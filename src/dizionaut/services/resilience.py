@@ -0,0 +1,185 @@
+"""
+Tail-latency and failure controls for upstream calls.
+
+Provides a circuit breaker, a rolling latency tracker used to pick the
+hedging delay, jittered exponential backoff, and `UpstreamPolicy`, which
+bundles the settings applied by `services.api.fetch_translation_data`.
+"""
+
+import random
+import time
+from collections import deque
+from typing import Callable
+
+from loguru import logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stop calling an unhealthy upstream for a while after repeated failures.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls are rejected for `reset_timeout` seconds. Then one trial call is
+    let through (half-open): success closes the circuit, failure reopens it,
+    and a trial that ends without a verdict (cancelled, over quota) is
+    released so the next call can try again.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the circuit.
+        reset_timeout (float): Seconds to stay open before a trial call.
+        clock (callable): Monotonic time source.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """
+        Tell whether a call may be made now.
+
+        Returns:
+            bool: False while the circuit is open or a trial call is running.
+        """
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and self._clock() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            logger.info("Circuit half-open, sending a trial upstream request")
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            logger.info("Circuit closed, upstream recovered")
+        self.state = CLOSED
+        self.failures = 0
+
+    def release(self) -> None:
+        """
+        Give back a half-open trial that ended without a success or failure.
+
+        The circuit goes back to open with its reset timeout already
+        elapsed, so the next call becomes the new trial.
+        """
+        if self.state == HALF_OPEN:
+            self.state = OPEN
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                logger.warning(
+                    f"Circuit open after {self.failures} failures, "
+                    f"rejecting upstream calls for {self.reset_timeout}s"
+                )
+            self.state = OPEN
+            self.opened_at = self._clock()
+
+
+class LatencyTracker:
+    """
+    Rolling window of recent latencies with a cached percentile estimate.
+
+    Args:
+        window (int): Number of samples kept.
+        quantile (float): Quantile reported by `estimate`.
+        refresh_every (int): Recompute the estimate after this many samples.
+    """
+
+    def __init__(self, window: int = 200, quantile: float = 0.95, refresh_every: int = 20):
+        self.quantile = quantile
+        self.refresh_every = refresh_every
+        self._samples: deque[float] = deque(maxlen=window)
+        self._since_refresh = 0
+        self._estimate: float | None = None
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self._since_refresh += 1
+        if self._estimate is None or self._since_refresh >= self.refresh_every:
+            ordered = sorted(self._samples)
+            self._estimate = ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))]
+            self._since_refresh = 0
+
+    def estimate(self) -> float | None:
+        """
+        Return the latency quantile over the window, or None without samples.
+        """
+        return self._estimate
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        attempt (int): Zero-based retry number.
+        base (float): Delay scale in seconds.
+        cap (float): Maximum delay in seconds.
+
+    Returns:
+        float: Random delay in [0, min(cap, base * 2**attempt)].
+    """
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class UpstreamPolicy:
+    """
+    Deadline, retry, hedging and circuit breaker settings for upstream calls.
+
+    Args:
+        deadline (float | None): Total seconds allowed per lookup, retries included.
+        retries (int): Extra attempts after a retryable failure.
+        backoff_base (float): Backoff scale in seconds.
+        backoff_max (float): Maximum backoff in seconds.
+        hedge (bool): Send a second request if the first is slower than usual.
+        hedge_min_delay (float): Lower bound for the hedging delay, in seconds.
+        breaker (CircuitBreaker | None): Circuit breaker, or None to disable.
+    """
+
+    def __init__(
+        self,
+        deadline: float | None = None,
+        retries: int = 0,
+        backoff_base: float = 0.2,
+        backoff_max: float = 2.0,
+        hedge: bool = False,
+        hedge_min_delay: float = 0.05,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.deadline = deadline
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        self.breaker = breaker
+        self.latency = LatencyTracker()
+
+    def hedge_delay(self) -> float | None:
+        """
+        Seconds to wait before hedging: the recent p95 latency, or None
+        while hedging is disabled or there are no samples yet.
+        """
+        if not self.hedge:
+            return None
+        estimate = self.latency.estimate()
+        if estimate is None:
+            return None
+        return max(estimate, self.hedge_min_delay)
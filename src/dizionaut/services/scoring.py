@@ -5,14 +5,17 @@ SOURCE_WEIGHTS = {
     "MateCat": 0.8,
     "Wikipedia": 0.5,
     "MT!": 0.3,
+    "Dictionary": 0.9,
 }
 DEFAULT_SOURCE_WEIGHT = 0.2
 
+_PUNCTUATION_RE = re.compile(r"[!?.,\"“”«»]")
+
 
 def phrase_probability(text: str) -> float:
     """Estimate how likely the text is a full phrase rather than a single word."""
     words = len(text.split())
-    has_punctuation = bool(re.search(r"[!?.,\"“”«»]", text))
+    has_punctuation = bool(_PUNCTUATION_RE.search(text))
 
     score = 0.0
     if words >= 3:
@@ -0,0 +1,266 @@
+"""
+Typo-tolerant lookup of known phrases (symmetric delete, SymSpell-style).
+
+Every known phrase is indexed under the strings obtained by deleting up to
+`max_distance` characters from its prefix. A misspelled query generates the
+same deletes, so candidates are found with a few dictionary lookups and
+only those are verified with an edit distance. Short phrases only match at
+distance 1: at distance 2 most short words are close to many others.
+Each language index holds at most `max_phrases` phrases; the least
+recently added or used ones are dropped first.
+"""
+
+import sys
+import time
+from typing import Iterable
+
+from dizionaut.services.cache import normalize_phrase
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus transpositions).
+
+    Args:
+        a (str): First string.
+        b (str): Second string.
+        limit (int): Distances above this are reported as `limit + 1`.
+
+    Returns:
+        int: Distance, capped at `limit + 1`.
+    """
+    # Common prefixes and suffixes never change the distance
+    start = 0
+    end_a, end_b = len(a), len(b)
+    while start < end_a and start < end_b and a[start] == b[start]:
+        start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if not a or not b:
+        return min(len(a) + len(b), limit + 1)
+
+    previous2: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] * (len(b) + 1)
+        row_min = i
+        char_a = a[i - 1]
+        for j in range(1, len(b) + 1):
+            value = previous[j - 1] + (char_a != b[j - 1])
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == b[j - 1]:
+                if previous2[j - 2] + 1 < value:
+                    value = previous2[j - 2] + 1
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class SpellIndex:
+    """
+    Symmetric delete index over the phrases of one language.
+
+    Args:
+        max_distance (int): Maximum edit distance of suggestions.
+        prefix_length (int): Characters of each phrase used for deletes.
+        max_length (int): Longer phrases are not indexed.
+        short_length (int): Phrases up to this length match at distance 1 only.
+        max_phrases (int): Phrases kept before the least recently used are dropped.
+    """
+
+    def __init__(
+        self,
+        max_distance: int = 2,
+        prefix_length: int = 7,
+        max_length: int = 40,
+        short_length: int = 5,
+        max_phrases: int = 20000,
+    ):
+        self.max_distance = max_distance
+        self.short_length = short_length
+        self.max_phrases = max_phrases
+        self.evictions = 0
+        self.prefix_length = prefix_length
+        self.max_length = max_length
+        self.words: dict[str, int] = {}
+        self.deletes: dict[str, list[str]] = {}
+        self.build_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, phrase: str) -> bool:
+        return normalize_phrase(phrase) in self.words
+
+    def _variants(self, prefix: str) -> set[str]:
+        variants = {prefix}
+        frontier = {prefix}
+        for _ in range(self.max_distance):
+            frontier = {w[:i] + w[i + 1 :] for w in frontier for i in range(len(w))}
+            variants |= frontier
+        return variants
+
+    def add(self, phrase: str) -> None:
+        """
+        Index a phrase, or bump its frequency and recency if already known.
+        """
+        phrase = normalize_phrase(phrase)
+        if not phrase or len(phrase) > self.max_length:
+            return
+        if phrase in self.words:
+            # Re-insert to move the phrase to the most recent end
+            self.words[phrase] = self.words.pop(phrase) + 1
+            return
+        self.words[phrase] = 1
+        for variant in self._variants(phrase[: self.prefix_length]):
+            self.deletes.setdefault(variant, []).append(phrase)
+        while len(self.words) > self.max_phrases:
+            self._evict(next(iter(self.words)))
+
+    def _evict(self, phrase: str) -> None:
+        del self.words[phrase]
+        for variant in self._variants(phrase[: self.prefix_length]):
+            candidates = self.deletes[variant]
+            candidates.remove(phrase)
+            if not candidates:
+                del self.deletes[variant]
+        self.evictions += 1
+
+    def add_many(self, phrases: Iterable[str]) -> None:
+        """
+        Index many phrases, accounting the time in `build_seconds`.
+        """
+        started = time.perf_counter()
+        for phrase in phrases:
+            self.add(phrase)
+        self.build_seconds += time.perf_counter() - started
+
+    def suggest(self, phrase: str, limit: int = 3) -> list[str]:
+        """
+        Find known phrases close to a (possibly misspelled) one.
+
+        Args:
+            phrase (str): Query.
+            limit (int): Maximum number of suggestions.
+
+        Returns:
+            list: Known phrases ordered by distance, then frequency.
+        """
+        phrase = normalize_phrase(phrase)
+        if not phrase or len(phrase) > self.max_length:
+            return []
+        if phrase in self.words:
+            return [phrase]
+        max_distance = self.max_distance
+        if len(phrase) <= self.short_length:
+            max_distance = min(max_distance, 1)
+
+        candidates = set()
+        for variant in self._variants(phrase[: self.prefix_length]):
+            candidates.update(self.deletes.get(variant, ()))
+        scored = []
+        for candidate in candidates:
+            if abs(len(candidate) - len(phrase)) > max_distance:
+                continue
+            distance = edit_distance(phrase, candidate, max_distance)
+            if distance <= max_distance:
+                scored.append((distance, -self.words[candidate], candidate))
+        return [candidate for _, _, candidate in sorted(scored)[:limit]]
+
+    def memory_bytes(self) -> int:
+        """
+        Estimate the memory held by the index containers and their keys.
+        """
+        size = sys.getsizeof(self.words) + sys.getsizeof(self.deletes)
+        size += sum(sys.getsizeof(w) for w in self.words)
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in self.deletes.items())
+        return size
+
+
+class SpellIndexes:
+    """
+    One `SpellIndex` per source language, created on first use.
+
+    Args:
+        max_distance (int): Maximum edit distance of suggestions.
+        max_phrases (int): Phrases kept per language.
+    """
+
+    def __init__(self, max_distance: int = 2, max_phrases: int = 20000):
+        self.max_distance = max_distance
+        self.max_phrases = max_phrases
+        self.indexes: dict[str, SpellIndex] = {}
+
+    def configure(self, max_phrases: int) -> None:
+        """
+        Change the per-language bound, shrinking existing indexes if needed.
+        """
+        self.max_phrases = max_phrases
+        for index in self.indexes.values():
+            index.max_phrases = max_phrases
+            while len(index.words) > max_phrases:
+                index._evict(next(iter(index.words)))
+
+    def get(self, lang: str) -> SpellIndex:
+        """
+        Return the index of a language, creating an empty one if needed.
+        """
+        index = self.indexes.get(lang)
+        if index is None:
+            index = self.indexes[lang] = SpellIndex(
+                self.max_distance, max_phrases=self.max_phrases
+            )
+        return index
+
+    def add(self, lang: str, phrase: str) -> None:
+        """
+        Index a phrase of a language.
+        """
+        self.get(lang).add(phrase)
+
+    def knows(self, lang: str, phrase: str) -> bool:
+        """
+        Tell whether a phrase of a language is indexed.
+        """
+        index = self.indexes.get(lang)
+        return index is not None and phrase in index
+
+    def suggest(self, lang: str, phrase: str, limit: int = 3) -> list[str]:
+        """
+        Suggest known phrases of a language close to `phrase`.
+        """
+        index = self.indexes.get(lang)
+        return index.suggest(phrase, limit) if index is not None else []
+
+    def stats(self) -> dict[str, dict]:
+        """
+        Return size, estimated memory and build time per language.
+
+        Returns:
+            dict: {lang: {"phrases", "deletes", "evictions", "memory_bytes",
+                "build_seconds"}}.
+        """
+        return {
+            lang: {
+                "phrases": len(index),
+                "deletes": len(index.deletes),
+                "evictions": index.evictions,
+                "memory_bytes": index.memory_bytes(),
+                "build_seconds": round(index.build_seconds, 3),
+            }
+            for lang, index in self.indexes.items()
+        }
+
+
+spelling = SpellIndexes()
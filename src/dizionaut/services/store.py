@@ -0,0 +1,230 @@
+"""
+Persistent SQLite store for raw translation matches.
+
+The store keeps the `matches` payloads returned by the translation API so
+that the in-process cache can be warmed after a restart and stale results
+can be served while the upstream service is slow or unavailable.
+
+All database access runs in a worker thread; writes are buffered and
+flushed in batches so the event loop never waits on disk I/O.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+
+from loguru import logger
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    from_lang  TEXT NOT NULL,
+    to_lang    TEXT NOT NULL,
+    phrase     TEXT NOT NULL,
+    matches    TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (from_lang, to_lang, phrase)
+) WITHOUT ROWID
+"""
+
+
+class TranslationStore:
+    """
+    SQLite-backed store of raw translation matches keyed like the in-process cache.
+
+    Args:
+        path (str): Database file path.
+        ttl (float): Seconds an entry is considered fresh.
+        max_age (float): Seconds after which entries are removed by `compact`.
+        flush_interval (float): Seconds between batched writes.
+        compact_interval (float): Seconds between compaction runs.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 7 * 24 * 3600,
+        max_age: float = 90 * 24 * 3600,
+        flush_interval: float = 1.0,
+        compact_interval: float = 3600.0,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_age = max_age
+        self.flush_interval = flush_interval
+        self.compact_interval = compact_interval
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[str, str, str], tuple[list[dict], float]] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    async def open(self) -> None:
+        """
+        Open the database, enable WAL mode and start background jobs.
+        """
+        await asyncio.to_thread(self._open)
+        self._tasks = [
+            asyncio.create_task(self._flush_loop()),
+            asyncio.create_task(self._compact_loop()),
+        ]
+
+    async def close(self) -> None:
+        """
+        Stop background jobs, flush pending writes and close the database.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.flush()
+        if self._conn is not None:
+            await asyncio.to_thread(self._close)
+
+    def put(self, key: tuple[str, str, str], matches: list[dict]) -> None:
+        """
+        Queue matches for writing; the next flush persists them.
+
+        Args:
+            key (tuple): (from_lang, to_lang, normalized phrase).
+            matches (list): Raw `matches` entries from the API response.
+        """
+        self._pending[key] = (matches, time.time())
+
+    async def get(self, key: tuple[str, str, str]) -> tuple[list[dict], float] | None:
+        """
+        Look up stored matches.
+
+        Args:
+            key (tuple): (from_lang, to_lang, normalized phrase).
+
+        Returns:
+            tuple | None: (matches, updated_at) or None if not stored.
+        """
+        if key in self._pending:
+            return self._pending[key]
+        if self._conn is None:
+            return None
+        return await asyncio.to_thread(self._get, key)
+
+    def is_fresh(self, updated_at: float) -> bool:
+        """
+        Tell whether an entry written at `updated_at` is still within its TTL.
+        """
+        return time.time() - updated_at < self.ttl
+
+    async def load_recent(
+        self, limit: int
+    ) -> list[tuple[tuple[str, str, str], list[dict], float]]:
+        """
+        Load the most recently updated entries, newest first.
+
+        Args:
+            limit (int): Maximum number of entries.
+
+        Returns:
+            list: (key, matches, updated_at) tuples.
+        """
+        if self._conn is None or limit <= 0:
+            return []
+        return await asyncio.to_thread(self._load_recent, limit)
+
+    async def flush(self) -> None:
+        """
+        Write all pending entries in a single transaction.
+        """
+        if not self._pending or self._conn is None:
+            return
+        batch, self._pending = self._pending, {}
+        try:
+            await asyncio.to_thread(self._write, batch)
+        except sqlite3.Error:
+            logger.exception("Failed to write translation store batch")
+
+    async def compact(self) -> int:
+        """
+        Remove entries older than `max_age` and truncate the write-ahead log.
+
+        Returns:
+            int: Number of removed entries.
+        """
+        if self._conn is None:
+            return 0
+        return await asyncio.to_thread(self._compact, time.time() - self.max_age)
+
+    def _open(self) -> None:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_SCHEMA)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS translations_updated_at "
+            "ON translations (updated_at)"
+        )
+        conn.commit()
+        self._conn = conn
+
+    def _close(self) -> None:
+        with self._lock:
+            conn, self._conn = self._conn, None
+            conn.close()
+
+    def _get(self, key: tuple[str, str, str]) -> tuple[list[dict], float] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT matches, updated_at FROM translations "
+                "WHERE from_lang = ? AND to_lang = ? AND phrase = ?",
+                key,
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def _load_recent(
+        self, limit: int
+    ) -> list[tuple[tuple[str, str, str], list[dict], float]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT from_lang, to_lang, phrase, matches, updated_at "
+                "FROM translations ORDER BY updated_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [((f, t, p), json.loads(m), u) for f, t, p, m, u in rows]
+
+    def _write(self, batch: dict) -> None:
+        rows = [
+            (*key, json.dumps(matches, ensure_ascii=False), updated_at)
+            for key, (matches, updated_at) in batch.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations "
+                "(from_lang, to_lang, phrase, matches, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def _compact(self, cutoff: float) -> int:
+        with self._lock:
+            with self._conn:
+                removed = self._conn.execute(
+                    "DELETE FROM translations WHERE updated_at < ?", (cutoff,)
+                ).rowcount
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return removed
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def _compact_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.compact_interval)
+            try:
+                removed = await self.compact()
+                if removed:
+                    logger.info(f"Translation store compacted, {removed} entries removed")
+            except sqlite3.Error:
+                logger.exception("Translation store compaction failed")
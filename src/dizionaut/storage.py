@@ -0,0 +1,170 @@
+"""
+FSM storage backends.
+
+The default aiogram `MemoryStorage` keeps every user's state forever and
+cannot be shared between processes. The backends here can be shared by
+several worker processes and forget users who have been idle longer than
+a configurable time to live.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Mapping
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fsm (
+    key        TEXT PRIMARY KEY,
+    state      TEXT,
+    data       TEXT NOT NULL DEFAULT '{}',
+    updated_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+
+def _key(key: StorageKey) -> str:
+    return (
+        f"{key.bot_id}:{key.chat_id}:{key.user_id}:{key.thread_id or ''}:"
+        f"{key.business_connection_id or ''}:{key.destiny}"
+    )
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    FSM storage in a SQLite database, safe to share between processes.
+
+    Entries not touched for `ttl` seconds are treated as absent and are
+    deleted by a sweep that runs at most every `sweep_interval` seconds.
+
+    Args:
+        path (str): Database file path.
+        ttl (float): Seconds of inactivity after which a user's state is dropped.
+        sweep_interval (float): Minimum seconds between cleanup runs.
+    """
+
+    def __init__(self, path: str, ttl: float = 24 * 3600, sweep_interval: float = 600):
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        self._last_sweep = time.time()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS fsm_updated_at ON fsm (updated_at)")
+        self._conn.commit()
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        state = state.state if isinstance(state, State) else state
+        await self._run(self._upsert, _key(key), "state", state)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        row = await self._run(self._select, _key(key))
+        return row[0] if row else None
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        await self._run(self._upsert, _key(key), "data", json.dumps(dict(data)))
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        row = await self._run(self._select, _key(key))
+        return json.loads(row[1]) if row else {}
+
+    async def update_data(self, key: StorageKey, data: Mapping[str, Any]) -> dict[str, Any]:
+        return await self._run(self._update_data, _key(key), dict(data))
+
+    async def sweep(self) -> int:
+        """
+        Delete entries idle for longer than the TTL.
+
+        Returns:
+            int: Number of removed entries.
+        """
+        return await self._run(self._sweep)
+
+    async def close(self) -> None:
+        await self._run(self._conn.close)
+
+    async def _run(self, fn, *args):
+        return await asyncio.to_thread(self._locked, fn, *args)
+
+    def _locked(self, fn, *args):
+        with self._lock:
+            result = fn(*args)
+            if time.time() - self._last_sweep > self.sweep_interval:
+                self._sweep()
+            return result
+
+    def _select(self, key: str) -> tuple[str | None, str] | None:
+        return self._conn.execute(
+            "SELECT state, data FROM fsm WHERE key = ? AND updated_at >= ?",
+            (key, time.time() - self.ttl),
+        ).fetchone()
+
+    def _upsert(self, key: str, column: str, value: str | None) -> None:
+        # Writing one column refreshes the whole row, so the other column of
+        # an expired row is reset instead of coming back to life
+        other, empty = ("data", "'{}'") if column == "state" else ("state", "NULL")
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                f"INSERT INTO fsm (key, {column}, updated_at) VALUES (?, ?, ?) "
+                f"ON CONFLICT (key) DO UPDATE SET "
+                f"{column} = excluded.{column}, "
+                f"{other} = CASE WHEN updated_at < ? THEN {empty} ELSE {other} END, "
+                f"updated_at = excluded.updated_at",
+                (key, value, now, now - self.ttl),
+            )
+
+    def _update_data(self, key: str, data: dict[str, Any]) -> dict[str, Any]:
+        with self._conn:
+            row = self._select(key)
+            current = json.loads(row[1]) if row else {}
+            current.update(data)
+            self._upsert(key, "data", json.dumps(current))
+        return current.copy()
+
+    def _sweep(self) -> int:
+        self._last_sweep = time.time()
+        with self._conn:
+            return self._conn.execute(
+                "DELETE FROM fsm WHERE updated_at < ?", (self._last_sweep - self.ttl,)
+            ).rowcount
+
+
+def create_storage(url: str | None, ttl: float) -> BaseStorage:
+    """
+    Create an FSM storage backend from a URL.
+
+    Supported forms:
+        - empty or ``memory://`` — aiogram's in-process `MemoryStorage`
+        - ``sqlite:///fsm.sqlite3`` (relative) or ``sqlite:////var/lib/fsm.sqlite3``
+          (absolute) — `SQLiteStorage`
+        - ``redis://host:port/db`` — aiogram's `RedisStorage` (requires `redis`)
+
+    Args:
+        url (str | None): Storage URL.
+        ttl (float): Seconds of inactivity after which a user's state is dropped.
+
+    Returns:
+        BaseStorage: Storage instance.
+
+    Raises:
+        ValueError: If the URL scheme is not supported.
+    """
+    if not url or url.startswith("memory://"):
+        return MemoryStorage()
+    if url.startswith("sqlite://"):
+        path = url.removeprefix("sqlite://").removeprefix("/")
+        return SQLiteStorage(path or ":memory:", ttl=ttl)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        from aiogram.fsm.storage.redis import RedisStorage
+
+        return RedisStorage.from_url(url, state_ttl=int(ttl), data_ttl=int(ttl))
+    raise ValueError(f"Unsupported FSM storage URL: {url!r}")
@@ -0,0 +1,125 @@
+"""
+Lightweight per-update tracing.
+
+A `Trace` is attached to the current context for every update by
+`TracingMiddleware`; code on the request path wraps its stages in
+`span(name)`. When an update takes longer than the configured threshold,
+its span breakdown is logged. Outside a traced context `span` is a no-op.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+from loguru import logger
+
+
+class Trace:
+    """
+    Timing spans collected while handling one update.
+    """
+
+    __slots__ = ("update_id", "started", "spans")
+
+    def __init__(self, update_id: int):
+        self.update_id = update_id
+        self.started = time.perf_counter()
+        self.spans: list[tuple[str, float, float]] = []
+
+    def add(self, name: str, started: float, duration: float) -> None:
+        self.spans.append((name, started - self.started, duration))
+
+    def breakdown(self) -> str:
+        """
+        Format spans as "name@offset+duration" entries in milliseconds.
+        """
+        return ", ".join(
+            f"{name}@{offset * 1000:.1f}+{duration * 1000:.1f}ms"
+            for name, offset, duration in self.spans
+        )
+
+
+current_trace: ContextVar[Trace | None] = ContextVar("current_trace", default=None)
+
+
+class _Span:
+    __slots__ = ("name", "trace", "started")
+
+    def __init__(self, name: str, trace: Trace):
+        self.name = name
+        self.trace = trace
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.add(self.name, self.started, time.perf_counter() - self.started)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str):
+    """
+    Time a stage of the current update.
+
+    Usable as `with span("fetch"):` in both sync and async code.
+
+    Args:
+        name (str): Stage name.
+
+    Returns:
+        Context manager recording the span, or a shared no-op one when
+        no trace is active.
+    """
+    trace = current_trace.get()
+    if trace is None:
+        return _NO_SPAN
+    return _Span(name, trace)
+
+
+class TracingMiddleware(BaseMiddleware):
+    """
+    Attach a `Trace` to each update and log slow ones with their spans.
+
+    Register as an outer middleware on `dp.update`.
+
+    Args:
+        slow_threshold (float): Seconds above which an update is logged.
+    """
+
+    def __init__(self, slow_threshold: float):
+        self.slow_threshold = slow_threshold
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: dict[str, Any],
+    ) -> Any:
+        trace = Trace(event.update_id)
+        token = current_trace.set(trace)
+        try:
+            return await handler(event, data)
+        finally:
+            current_trace.reset(token)
+            elapsed = time.perf_counter() - trace.started
+            if elapsed >= self.slow_threshold:
+                logger.warning(
+                    f"Slow update {trace.update_id} ({event.event_type}): "
+                    f"{elapsed * 1000:.1f}ms [{trace.breakdown()}]"
+                )
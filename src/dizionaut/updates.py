@@ -0,0 +1,126 @@
+"""
+Bounded queue of Telegram updates processed by a pool of worker tasks.
+
+Used in webhook mode so that the HTTP request from Telegram can be
+acknowledged as soon as the update is accepted, instead of staying open
+until the handlers (and the translation API round trip) finish.
+"""
+
+import asyncio
+
+from aiogram import Bot, Dispatcher
+from aiogram.methods import TelegramMethod
+from aiogram.types import Update
+from loguru import logger
+
+
+def webhook_reply_payload(bot: Bot, method: TelegramMethod) -> dict | None:
+    """
+    Serialize a Bot API call for use as the webhook response body.
+
+    Telegram executes a call returned in the response to a webhook
+    request, saving an outbound request to the Bot API.
+
+    Args:
+        bot (Bot): Bot whose defaults (e.g. parse mode) apply.
+        method (TelegramMethod): Call returned by a handler.
+
+    Returns:
+        dict | None: JSON body, or None if the call uploads files and
+            must be sent as a regular request.
+    """
+    files: dict = {}
+    payload = {"method": method.__api_method__}
+    for key, value in method.model_dump(warnings=False).items():
+        value = bot.session.prepare_value(value, bot=bot, files=files, _dumps_json=False)
+        if value is not None:
+            payload[key] = value
+    return None if files else payload
+
+
+class UpdateQueue:
+    """
+    Feed updates into the dispatcher from a bounded queue.
+
+    Args:
+        dp (Dispatcher): Dispatcher that handles updates.
+        bot (Bot): Bot instance passed to the dispatcher.
+        workers (int): Number of concurrent worker tasks.
+        maxsize (int): Maximum number of queued updates.
+    """
+
+    def __init__(self, dp: Dispatcher, bot: Bot, workers: int = 8, maxsize: int = 1000):
+        self.dp = dp
+        self.bot = bot
+        self.workers = workers
+        self._queue: asyncio.Queue[Update] = asyncio.Queue(maxsize=maxsize)
+        self._tasks: list[asyncio.Task] = []
+        self._accepting = False
+        self.rejected = 0
+
+    @property
+    def depth(self) -> int:
+        """
+        Number of updates waiting to be processed.
+        """
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """
+        Start the worker tasks and begin accepting updates.
+        """
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"update-worker-{i}")
+            for i in range(self.workers)
+        ]
+        self._accepting = True
+
+    def try_put(self, update: Update) -> bool:
+        """
+        Enqueue an update without waiting.
+
+        Args:
+            update (Update): Validated Telegram update.
+
+        Returns:
+            bool: False if the queue is full or shutting down.
+        """
+        if not self._accepting:
+            self.rejected += 1
+            return False
+        try:
+            self._queue.put_nowait(update)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+        return True
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop accepting updates, drain the queue and stop the workers.
+
+        Args:
+            timeout (float): Seconds to wait for queued updates to finish.
+        """
+        self._accepting = False
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Dropping {self.depth} queued updates on shutdown")
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self) -> None:
+        while True:
+            update = await self._queue.get()
+            try:
+                result = await self.dp.feed_update(self.bot, update)
+                if isinstance(result, TelegramMethod):
+                    await self.bot(result)
+            except Exception:
+                logger.exception(f"Failed to process update {update.update_id}")
+            finally:
+                self._queue.task_done()
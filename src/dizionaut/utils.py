@@ -4,50 +4,41 @@ Utility functions used throughout the bot.
 
 import textwrap
 
-# Supported languages with flags and codes
-LANGUAGES = (
-    ("🇧🇬 Bulgarian", "bg"),
-    ("🇨🇿 Czech", "cs"),
-    ("🇬🇧 English", "en"),
-    ("🇫🇷 French", "fr"),
-    ("🇩🇪 German", "de"),
-    ("🇭🇷 Croatian", "hr"),
-    ("🇮🇹 Italian", "it"),
-    ("🇵🇱 Polish", "pl"),
-    ("🇵🇹 Portuguese", "pt"),
-    ("🇷🇺 Russian", "ru"),
-    ("🇷🇸 Serbian", "sr"),
-    ("🇸🇰 Slovak", "sk"),
-    ("🇪🇸 Spanish", "es"),
-    ("🇺🇦 Ukrainian", "uk"),
-)
-
-
-def get_lang_name(lang_code: str) -> str:
+# Language data lives in the registry; re-exported here for existing imports
+from dizionaut.languages import LANGUAGES, get_lang_name  # noqa: F401
+
+
+def format_ml(text: str) -> str:
     """
-    Return the language name (with flag) for a given language code.
+    Normalize multi-line string by removing common indentation and trimming whitespace.
 
     Args:
-        lang_code (str): ISO language code.
+        text (str): A raw multi-line string.
 
     Returns:
-        str: Human-readable language name with flag, or raw code if not found.
+        str: Cleaned and dedented string.
     """
-    lang_name = next((name for name, code in LANGUAGES if code == lang_code), lang_code)
-    return lang_name
+    return textwrap.dedent(text).strip()
 
 
-def format_ml(text: str) -> str:
+def truncate_utf16(text: str, limit: int) -> str:
     """
-    Normalize multi-line string by removing common indentation and trimming whitespace.
+    Cut text to at most `limit` UTF-16 code units, as Telegram counts message length.
+
+    Characters outside the BMP (most emoji) count as two units; a pair is
+    never split.
 
     Args:
-        text (str): A raw multi-line string.
+        text (str): Text to shorten.
+        limit (int): Maximum length in UTF-16 code units.
 
     Returns:
-        str: Cleaned and dedented string.
+        str: The text, or its longest prefix that fits.
     """
-    return textwrap.dedent(text).strip()
+    encoded = text.encode("utf-16-le")
+    if len(encoded) <= 2 * limit:
+        return text
+    return encoded[: 2 * limit].decode("utf-16-le", errors="ignore")
 
 
 def format_translation_result(
@@ -56,6 +47,8 @@ def format_translation_result(
     to_lang: str,
     lang_name_fn: callable,
     quality_marker_fn: callable,
+    page: int = 1,
+    pages: int = 1,
 ) -> str:
     """
     Format a list of scored translations into a user-readable message.
@@ -66,6 +59,8 @@ def format_translation_result(
         to_lang (str): Target language code.
         lang_name_fn (callable): Function to get the human-readable name for a language code.
         quality_marker_fn (callable): Function to get a marker (emoji) for a score.
+        page (int): Number of the shown page, starting at 1.
+        pages (int): Total number of pages; a page footer is added if above 1.
 
     Returns:
         str: Formatted message string.
@@ -75,4 +70,46 @@ def format_translation_result(
         for t, score in translations
     ]
     lang_info = f"{lang_name_fn(from_lang)} → {lang_name_fn(to_lang)}"
+    text = f"📘 Translation ({lang_info}):\n\n" + "\n".join(lines)
+    if pages > 1:
+        text += f"\n\n📄 {page}/{pages}"
+    return text
+
+
+def format_batch_result(
+    rows: list[tuple[str, list[tuple[dict, float]] | Exception | None]],
+    from_lang: str,
+    to_lang: str,
+    lang_name_fn: callable,
+    quality_marker_fn: callable,
+) -> str:
+    """
+    Format the best translation of each phrase in a batch, one line per phrase.
+
+    Args:
+        rows (list): (phrase, translations) pairs in display order; translations
+            is None while the lookup is pending, empty if nothing was found and
+            the exception if the lookup failed (shown as unavailable).
+        from_lang (str): Source language code.
+        to_lang (str): Target language code.
+        lang_name_fn (callable): Function to get the human-readable name for a language code.
+        quality_marker_fn (callable): Function to get a marker (emoji) for a score.
+
+    Returns:
+        str: Formatted message string.
+    """
+    lines = []
+    for phrase, translations in rows:
+        if translations is None:
+            lines.append(f"⏳ {phrase}")
+        elif isinstance(translations, Exception):
+            lines.append(f"⛔ {phrase} → unavailable, try later")
+        elif translations:
+            t, score = translations[0]
+            lines.append(
+                f"{quality_marker_fn(score)} {phrase} → {t['translation']} ({int(score * 100)}%)"
+            )
+        else:
+            lines.append(f"⚠️ {phrase} → not found")
+    lang_info = f"{lang_name_fn(from_lang)} → {lang_name_fn(to_lang)}"
     return f"📘 Translation ({lang_info}):\n\n" + "\n".join(lines)
@@ -0,0 +1,181 @@
+import asyncio
+
+import httpx
+import pytest
+
+from dizionaut.services import api
+
+
+def _mock_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_fetch_translation_data_reuses_shared_client(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.params["langpair"])
+        return httpx.Response(200, json={"matches": []})
+
+    client = _mock_client(handler)
+    monkeypatch.setattr(api, "_client", client)
+
+    async def run():
+        await api.fetch_translation_data("en", "it", "house")
+        await api.fetch_translation_data("en", "de", "house")
+        assert api.get_client() is client
+        await api.close_client()
+
+    asyncio.run(run())
+    assert calls == ["en|it", "en|de"]
+    assert api._client is None
+
+
+def test_fetch_translation_data_raises_translation_error(monkeypatch):
+    client = _mock_client(lambda request: httpx.Response(500))
+    monkeypatch.setattr(api, "_client", client)
+
+    with pytest.raises(api.TranslationError):
+        asyncio.run(api.fetch_translation_data("en", "it", "house"))
+
+
+def test_create_client_applies_limits():
+    client = api.create_client(connect_timeout=1.5, read_timeout=3.0)
+    assert client.timeout.connect == 1.5
+    assert client.timeout.read == 3.0
+    asyncio.run(client.aclose())
+
+
+def test_translate_text_serves_repeat_lookups_from_cache(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.params["q"])
+        return httpx.Response(
+            200, json={"matches": [{"translation": "casa", "match": 1, "quality": 80}]}
+        )
+
+    monkeypatch.setattr(api, "_client", _mock_client(handler))
+    monkeypatch.setattr(api, "score", lambda t: 0.5)
+    api.translation_cache.clear()
+
+    async def run():
+        first = await api.translate_text("en", "it", "House")
+        second = await api.translate_text("en", "it", " house ")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == second == [({"translation": "casa", "match": 1, "quality": 80}, 0.5)]
+    assert calls == ["House"]
+    api.translation_cache.clear()
+
+
+def test_translate_text_caches_empty_results(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(1)
+        return httpx.Response(200, json={"matches": []})
+
+    monkeypatch.setattr(api, "_client", _mock_client(handler))
+    api.translation_cache.clear()
+
+    for _ in range(2):
+        with pytest.raises(api.TranslationError):
+            asyncio.run(api.translate_text("en", "it", "xyzzy"))
+    assert len(calls) == 1
+    api.translation_cache.clear()
+
+
+def test_single_flight_shares_one_call_and_survives_waiter_cancellation():
+    flight = api.SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "casa"
+
+    async def run():
+        first = asyncio.create_task(flight.do("k", work))
+        others = [asyncio.create_task(flight.do("k", work)) for _ in range(3)]
+        await asyncio.sleep(0)
+        first.cancel()
+        return await asyncio.gather(*others)
+
+    assert asyncio.run(run()) == ["casa"] * 3
+    assert calls == [1]
+    assert flight.stats() == {"calls": 4, "coalesced": 3, "abandoned": 0, "inflight": 0}
+
+
+def test_single_flight_delivers_errors_to_all_waiters():
+    flight = api.SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0)
+        raise api.TranslationError("API request failed")
+
+    async def run():
+        return await asyncio.gather(
+            flight.do("k", work), flight.do("k", work), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, api.TranslationError) for r in results)
+
+
+def test_single_flight_cancels_shared_call_when_last_waiter_leaves():
+    flight = api.SingleFlight()
+    started = asyncio.Event()
+
+    async def work():
+        started.set()
+        await asyncio.sleep(10)
+
+    async def run():
+        waiter = asyncio.create_task(flight.do("k", work))
+        await started.wait()
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        await asyncio.sleep(0)
+        return flight.stats()
+
+    stats = asyncio.run(run())
+    assert stats["abandoned"] == 1
+    assert stats["inflight"] == 0
+
+
+def test_unique_phrases_strips_and_deduplicates():
+    assert api.unique_phrases(["House", " house ", "", "cat", "HOUSE"]) == ["House", "cat"]
+
+
+def test_translate_many_runs_lookups_concurrently(monkeypatch):
+    active = []
+    peak = []
+
+    async def fake_translate(from_lang, to_lang, phrase):
+        active.append(phrase)
+        peak.append(len(active))
+        await asyncio.sleep(0.01)
+        active.remove(phrase)
+        if phrase == "xyzzy":
+            raise api.TranslationError("No translations found.")
+        return [({"translation": phrase.upper()}, 0.9)]
+
+    monkeypatch.setattr(api, "translate_text", fake_translate)
+
+    async def run():
+        return [r async for r in api.translate_many("en", "it", ["a", "b", "a", "xyzzy", "c"], concurrency=2)]
+
+    results = dict(asyncio.run(run()))
+    assert set(results) == {"a", "b", "xyzzy", "c"}
+    assert isinstance(results["xyzzy"], api.TranslationError)
+    assert results["a"] == [({"translation": "A"}, 0.9)]
+    assert max(peak) == 2
+
+
+def test_rank_matches_keeps_top_k(monkeypatch):
+    matches = [{"translation": f"word{i}", "match": i / 10} for i in range(10)]
+    full = api.rank_matches(matches)
+    monkeypatch.setattr(api, "_top_k", 3)
+    assert api.rank_matches(matches) == full[:3]
@@ -0,0 +1,170 @@
+import asyncio
+
+import httpx
+import pytest
+
+from dizionaut.services import api
+from dizionaut.services.backends import (
+    MERGE,
+    BackendStrategy,
+    DictionaryBackend,
+    HttpBackend,
+    TranslationBackend,
+    create_strategy,
+)
+
+
+class FakeBackend(TranslationBackend):
+    def __init__(self, name, translations=(), delay=0.0, error=None):
+        self.name = name
+        self.translations = translations
+        self.delay = delay
+        self.error = error
+        self.cancelled = False
+
+    async def lookup(self, from_lang, to_lang, phrase):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return [{"translation": t, "created-by": self.name} for t in self.translations]
+
+
+def test_dictionary_backend_loads_tsv_files(tmp_path):
+    (tmp_path / "en-it.tsv").write_text("House\tcasa\nhouse\tabitazione\n", encoding="utf-8")
+    backend = DictionaryBackend.from_directory(str(tmp_path))
+
+    matches = asyncio.run(backend.lookup("en", "it", " HOUSE "))
+    assert [m["translation"] for m in matches] == ["casa", "abitazione"]
+    assert matches[0]["created-by"] == "Dictionary"
+    assert asyncio.run(backend.lookup("it", "en", "casa")) == []
+
+
+def test_http_backend_normalizes_response(monkeypatch):
+    def handler(request):
+        assert request.url.params["target"] == "it"
+        return httpx.Response(200, json={"translations": ["casa", {"text": "dimora", "score": 0.5}]})
+
+    monkeypatch.setattr(
+        api, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    matches = asyncio.run(HttpBackend("http://example.test/", name="ext").lookup("en", "it", "house"))
+    assert [(m["translation"], m["match"], m["quality"]) for m in matches] == [
+        ("casa", 1.0, 100),
+        ("dimora", 0.5, 50),
+    ]
+    assert matches[1]["created-by"] == "ext"
+
+
+def test_http_backend_skips_items_with_invalid_scores(monkeypatch):
+    def handler(request):
+        return httpx.Response(200, json=[
+            {"text": "casa", "score": "high"},
+            {"text": "dimora", "score": "NaN"},
+            {"text": "abitazione", "score": [1]},
+            {"text": "magione", "score": 0.4},
+        ])
+
+    monkeypatch.setattr(
+        api, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    matches = asyncio.run(HttpBackend("http://example.test/").lookup("en", "it", "house"))
+    assert [(m["translation"], m["match"]) for m in matches] == [("magione", 0.4)]
+
+
+def test_http_backend_unexpected_response_is_a_translation_error(monkeypatch):
+    monkeypatch.setattr(
+        api, "_client",
+        httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(200, json=42))),
+    )
+    with pytest.raises(api.TranslationError):
+        asyncio.run(HttpBackend("http://example.test/").lookup("en", "it", "house"))
+
+
+def test_race_returns_first_non_empty_answer_and_cancels_the_rest():
+    empty = FakeBackend("empty")
+    fast = FakeBackend("fast", ["casa"], delay=0.01)
+    slow = FakeBackend("slow", ["dimora"], delay=1)
+    strategy = BackendStrategy([empty, fast, slow])
+
+    matches = asyncio.run(strategy.lookup("en", "it", "house"))
+    assert [m["translation"] for m in matches] == ["casa"]
+    assert slow.cancelled
+
+
+def test_race_raises_when_every_backend_fails():
+    strategy = BackendStrategy(
+        [FakeBackend("a", error=api.TranslationError()), FakeBackend("b", error=RuntimeError())]
+    )
+    with pytest.raises(api.TranslationError):
+        asyncio.run(strategy.lookup("en", "it", "house"))
+
+
+def test_race_timeout_or_partial_failure_is_not_an_empty_answer():
+    timed_out = BackendStrategy(
+        [FakeBackend("empty"), FakeBackend("slow", ["casa"], delay=1)], deadline=0.05
+    )
+    with pytest.raises(api.TranslationError):
+        asyncio.run(timed_out.lookup("en", "it", "house"))
+
+    partial = BackendStrategy([FakeBackend("empty"), FakeBackend("b", error=RuntimeError())])
+    with pytest.raises(api.TranslationError):
+        asyncio.run(partial.lookup("en", "it", "house"))
+
+    answered = BackendStrategy([FakeBackend("a"), FakeBackend("b")])
+    assert asyncio.run(answered.lookup("en", "it", "house")) == []
+
+
+def test_all_backends_over_quota_reraises_quota_exceeded():
+    for mode in ("race", MERGE):
+        strategy = BackendStrategy(
+            [FakeBackend("a", error=api.QuotaExceeded()), FakeBackend("b", error=api.QuotaExceeded())],
+            mode=mode,
+        )
+        with pytest.raises(api.QuotaExceeded):
+            asyncio.run(strategy.lookup("en", "it", "house"))
+
+
+def test_merge_with_nothing_found_and_a_missed_deadline_raises():
+    strategy = BackendStrategy(
+        [FakeBackend("a"), FakeBackend("late", ["tardi"], delay=1)], mode=MERGE, deadline=0.05
+    )
+    with pytest.raises(api.TranslationError):
+        asyncio.run(strategy.lookup("en", "it", "house"))
+
+
+def test_merge_combines_answers_received_before_the_deadline():
+    strategy = BackendStrategy(
+        [
+            FakeBackend("a", ["casa"]),
+            FakeBackend("b", ["dimora"], delay=0.01),
+            FakeBackend("c", error=RuntimeError()),
+            FakeBackend("late", ["tardi"], delay=1),
+        ],
+        mode=MERGE,
+        deadline=0.2,
+    )
+    matches = asyncio.run(strategy.lookup("en", "it", "house"))
+    assert sorted(m["translation"] for m in matches) == ["casa", "dimora"]
+
+
+def test_translate_text_ranks_merged_matches(monkeypatch):
+    strategy = BackendStrategy(
+        [FakeBackend("a", ["casa"]), FakeBackend("b", ["Casa", "dimora"])], mode=MERGE
+    )
+    monkeypatch.setattr(api, "_strategy", strategy)
+    api.translation_cache.clear()
+
+    ranked = asyncio.run(api.translate_text("en", "it", "house"))
+    assert sorted(m["translation"].lower() for m, _ in ranked) == ["casa", "dimora"]
+    api.translation_cache.clear()
+
+
+def test_create_strategy_rejects_unknown_backends():
+    with pytest.raises(ValueError):
+        create_strategy(["babelfish"])
+    with pytest.raises(ValueError):
+        create_strategy(["mymemory", "http"])
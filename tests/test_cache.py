@@ -0,0 +1,36 @@
+from dizionaut.services.cache import TranslationCache, make_key
+
+
+def test_make_key_normalizes_phrase():
+    assert make_key("en", "it", "  Big   House ") == ("en", "it", "big house")
+
+
+def test_cache_hit_and_miss_counters():
+    cache = TranslationCache(max_size=10)
+    key = make_key("en", "it", "house")
+    assert cache.get(key) is None
+    cache.set(key, [({"translation": "casa"}, 0.9)])
+    assert cache.get(key) == [({"translation": "casa"}, 0.9)]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TranslationCache(max_size=2)
+    cache.set("a", [1])
+    cache.set("b", [2])
+    cache.get("a")
+    cache.set("c", [3])
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.evictions == 1
+
+
+def test_cache_expires_entries_with_separate_negative_ttl(clock):
+    cache = TranslationCache(max_size=10, ttl=100, negative_ttl=10, clock=clock)
+    cache.set("found", [1])
+    cache.set("missing", [])
+    clock.now = 50
+    assert cache.get("found") == [1]
+    assert cache.get("missing") is None
+    assert cache.expirations == 1
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from dizionaut.services import api
+from dizionaut.services.dictionary import DictionaryIndex, compile_index, load_indexes, main
+
+
+def _index(tmp_path, pairs):
+    path = tmp_path / "en-it.idx"
+    compile_index(pairs, str(path))
+    return DictionaryIndex(str(path))
+
+
+def test_lookup_finds_normalized_phrases(tmp_path):
+    index = _index(
+        tmp_path,
+        [("House", "casa"), ("house", "abitazione"), ("house", "casa"), ("cat", "gatto"), ("città", "city")],
+    )
+    assert len(index) == 3
+    assert index.lookup("  HOUSE ") == ["casa", "abitazione"]
+    assert index.lookup("città") == ["city"]
+    assert index.lookup("dog") == []
+    assert index.lookup("") == []
+    index.close()
+
+
+def test_prefix_lists_entries_in_order(tmp_path):
+    index = _index(tmp_path, [("cat", "gatto"), ("car", "auto"), ("cart", "carrello"), ("dog", "cane")])
+    assert index.prefix("car") == [("car", ["auto"]), ("cart", ["carrello"])]
+    assert index.prefix("ca", limit=1) == [("car", ["auto"])]
+    assert index.prefix("x") == []
+    index.close()
+
+
+def test_sample_spreads_over_the_whole_index(tmp_path):
+    index = _index(tmp_path, [(f"{c}word", "x") for c in "abcdefghij"])
+    assert index.sample(3) == ["aword", "dword", "gword"]
+    assert len(index.sample(100)) == 10
+    assert index.sample(0) == []
+    index.close()
+
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / "en-it.idx"
+    path.write_bytes(b"not an index")
+    with pytest.raises(ValueError):
+        DictionaryIndex(str(path))
+
+
+def test_cli_compiles_csv_word_lists(tmp_path, capsys):
+    (tmp_path / "words.csv").write_text("house,casa\ncat,gatto\n", encoding="utf-8")
+    main([str(tmp_path / "words.csv"), "-o", str(tmp_path / "en-it.idx")])
+    assert "2 entries" in capsys.readouterr().out
+
+    indexes = load_indexes(str(tmp_path))
+    assert list(indexes) == [("en", "it")]
+    assert indexes["en", "it"].lookup("cat") == ["gatto"]
+    indexes["en", "it"].close()
+
+
+def test_translate_text_answers_from_dictionary_without_network(tmp_path, monkeypatch):
+    index = _index(tmp_path, [("house", "casa")])
+    monkeypatch.setattr(api, "_dictionaries", {("en", "it"): index})
+
+    async def no_network(*args):
+        raise AssertionError("network used")
+
+    monkeypatch.setattr(api, "fetch_translation_data", no_network)
+    api.translation_cache.clear()
+
+    ranked = asyncio.run(api.translate_text("en", "it", "House"))
+    assert ranked[0][0]["translation"] == "casa"
+    assert ranked[0][0]["created-by"] == "Dictionary"
+    api.translation_cache.clear()
+    index.close()
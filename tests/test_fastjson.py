@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from dizionaut import fastjson
+
+
+BODY = json.dumps(
+    {
+        "responseData": {"translatedText": "casa"},
+        "matches": [
+            {"id": "1", "segment": "house", "translation": "casa", "match": 1, "quality": "80",
+             "created-by": "MateCat", "usage-count": 3, "penalty": 0, "subject": "All"},
+            {"id": "2", "translation": None},
+            "garbage",
+        ],
+    }
+).encode()
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_parse_translation_response_keeps_only_match_fields(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(fastjson, "orjson", None)
+    assert fastjson.parse_translation_response(BODY) == {
+        "matches": [
+            {"translation": "casa", "match": 1, "quality": "80",
+             "created-by": "MateCat", "usage-count": 3, "penalty": 0},
+        ]
+    }
+
+
+def test_parse_translation_response_rejects_non_objects():
+    with pytest.raises(ValueError):
+        fastjson.parse_translation_response(b"[]")
+    with pytest.raises(ValueError):
+        fastjson.parse_translation_response(b"<html>")
+    assert fastjson.parse_translation_response(b'{"matches": null}') == {"matches": []}
@@ -0,0 +1,60 @@
+import asyncio
+
+from dizionaut.handlers import inline
+
+
+class FakeQuery:
+    def __init__(self, user_id, text):
+        self.from_user = type("User", (), {"id": user_id})()
+        self.query = text
+        self.answers = []
+
+    async def answer(self, results, **kwargs):
+        self.answers.append((results, kwargs))
+
+
+def test_parse_query_with_and_without_pair():
+    assert inline.parse_query("en-de house", ("en", "it")) == ("en", "de", "house")
+    assert inline.parse_query("big house", ("en", "it")) == ("en", "it", "big house")
+    assert inline.parse_query("xx-yy house", ("en", "it")) == ("en", "it", "xx-yy house")
+
+
+def test_newer_query_supersedes_pending_one(monkeypatch):
+    lookups = []
+
+    async def fake_translate(from_lang, to_lang, phrase):
+        lookups.append(phrase)
+        return [({"translation": "casa"}, 0.9)]
+
+    monkeypatch.setattr(inline, "translate_text", fake_translate)
+    first, second = FakeQuery(1, "ho"), FakeQuery(1, "house")
+
+    async def run():
+        await inline.handle_inline_query(first, inline_debounce=0.05)
+        await inline.handle_inline_query(second, inline_debounce=0.05)
+        await asyncio.gather(*inline._pending.values())
+
+    asyncio.run(run())
+    assert lookups == ["house"]
+    assert first.answers == []
+    results, kwargs = second.answers[0]
+    assert kwargs["cache_time"] == 300
+    assert results[0].title == "house → casa"
+
+
+def test_handler_returns_before_debounce(monkeypatch):
+    async def fake_translate(from_lang, to_lang, phrase):
+        return [({"translation": "casa"}, 0.9)]
+
+    monkeypatch.setattr(inline, "translate_text", fake_translate)
+    query = FakeQuery(2, "house")
+
+    async def run():
+        await inline.handle_inline_query(query, inline_debounce=0.05)
+        assert query.answers == []
+        task = inline._pending[2]
+        await task
+        assert 2 not in inline._pending
+
+    asyncio.run(run())
+    assert len(query.answers) == 1
@@ -0,0 +1,27 @@
+import pytest
+
+from dizionaut import languages
+
+
+def test_get_lang_name_known_and_unknown_codes():
+    assert languages.get_lang_name("it") == "🇮🇹 Italian"
+    assert languages.get_lang_name("xx") == "xx"
+
+
+def test_keyboards_are_prebuilt_and_shared():
+    assert languages.from_keyboard() is languages.from_keyboard()
+    assert languages.to_keyboard("en") is languages.TO_KEYBOARDS["en"]
+    assert len(languages.from_keyboard().inline_keyboard) == len(languages.LANGUAGES)
+
+
+def test_to_keyboard_for_unknown_code_is_built_on_demand():
+    keyboard = languages.to_keyboard("xx")
+    assert len(keyboard.inline_keyboard) == len(languages.LANGUAGES)
+
+
+def test_parse_pair():
+    assert languages.parse_pair("en-it") == ("en", "it")
+    assert languages.parse_pair(" DE-uk ") == ("de", "uk")
+    for text in ("enit", "en-", "en-xx", "en-en", "en-it-de"):
+        with pytest.raises(ValueError):
+            languages.parse_pair(text)
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from dizionaut.services import api
+from dizionaut.services.limits import KeyedRateLimiter, TokenBucket, UpstreamBudget
+
+
+def test_token_bucket_refills_over_time(clock):
+    bucket = TokenBucket(capacity=2, refill_rate=1, clock=clock)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock.now = 1.0
+    assert bucket.try_acquire()
+
+
+def test_upstream_budget_counts_requests_and_chars(clock):
+    budget = UpstreamBudget(requests_per_day=10, chars_per_day=8, clock=clock)
+    assert budget.try_spend(5)
+    assert not budget.try_spend(5)
+    assert budget.stats() == {"requests_left": 9, "chars_left": 3, "rejected": 1}
+
+
+def test_keyed_rate_limiter_is_per_key(clock):
+    limiter = KeyedRateLimiter(rate=0, burst=1, clock=clock)
+    assert limiter.hit(1)
+    assert not limiter.hit(1)
+    assert limiter.hit(2)
+
+
+def test_keyed_rate_limiter_charges_costly_events_as_debt(clock):
+    limiter = KeyedRateLimiter(rate=1, burst=5, clock=clock)
+    assert limiter.hit(1, cost=20)
+    clock.now = 10
+    assert not limiter.hit(1)
+    clock.now = 16
+    assert limiter.hit(1)
+
+
+def test_fetch_translation_data_rejects_over_budget(monkeypatch):
+    monkeypatch.setattr(api, "_budget", UpstreamBudget(chars_per_day=3))
+    with pytest.raises(api.QuotaExceeded):
+        asyncio.run(api.fetch_translation_data("en", "it", "house"))
+
+
+def test_chat_throttling_charges_each_distinct_line_of_a_word_list(clock):
+    from datetime import datetime
+
+    from aiogram.types import Chat, Message
+
+    from dizionaut.middlewares.throttling import ChatThrottlingMiddleware
+
+    middleware = ChatThrottlingMiddleware(rate=0, burst=5, clock=clock)
+    handled = []
+
+    async def handler(event, data):
+        handled.append(event.text)
+
+    def message(text):
+        return Message(message_id=1, date=datetime.now(), chat=Chat(id=7, type="private"), text=text)
+
+    async def run():
+        await middleware(handler, message("a\nb\nb\nc"), {})
+        assert middleware.limiter._buckets[7].tokens == 2
+        await middleware(handler, message("d\ne\nf"), {})
+        assert middleware.limiter._buckets[7].tokens == -1
+
+    asyncio.run(run())
+    assert handled == ["a\nb\nb\nc", "d\ne\nf"]
+
+
+def test_chat_throttling_forgets_notified_chats_after_refill(clock):
+    from dizionaut.middlewares.throttling import ChatThrottlingMiddleware
+
+    middleware = ChatThrottlingMiddleware(rate=1, burst=1, clock=clock)
+    replies = []
+
+    class FakeMessage:
+        def __init__(self, chat_id):
+            self.chat = type("Chat", (), {"id": chat_id})()
+            self.text = "house"
+
+        async def answer(self, text):
+            replies.append(self.chat.id)
+
+    async def handler(event, data):
+        pass
+
+    async def run():
+        for chat_id in (1, 1, 1, 2, 2):
+            await middleware(handler, FakeMessage(chat_id), {})
+        assert replies == [1, 2]
+        assert list(middleware._notified) == [1, 2]
+        clock.now = 1.0
+        for _ in range(2):
+            await middleware(handler, FakeMessage(3), {})
+        assert list(middleware._notified) == [3]
+
+    asyncio.run(run())
@@ -0,0 +1,19 @@
+import argparse
+import asyncio
+
+import pytest
+
+from benchmarks import loadtest
+from dizionaut.services import api
+
+
+@pytest.mark.parametrize("stateless", [False, True])
+def test_load_harness_runs_full_flow(monkeypatch, stateless):
+    monkeypatch.setattr(api, "TRANSLATION_API_URL", api.TRANSLATION_API_URL)
+    args = argparse.Namespace(
+        users=3, words=2, concurrency=3, latency=1, jitter=0, error_rate=0.0,
+        matches=5, connections=4, cache_size=100, stateless=stateless, seed=1, json=None,
+    )
+    report = asyncio.run(loadtest.run(args))
+    assert report["handlers"]["word"]["count"] == 6
+    assert report["bot_api_calls"]["SendMessage"] >= 6
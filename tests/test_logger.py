@@ -0,0 +1,61 @@
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+from loguru import logger
+
+from dizionaut.logger import ExceptionSampler, JsonSink, setup_logging
+
+
+def _record(error=ValueError, line=10):
+    exception = SimpleNamespace(type=error, value=error("boom"), traceback=None)
+    return {"name": "dizionaut.services.api", "line": line, "exception": exception, "extra": {}}
+
+
+def test_exception_sampler_limits_bursts_per_call_site(clock):
+    sampler = ExceptionSampler(burst=2, window=60, clock=clock)
+
+    assert [sampler(_record()) for _ in range(4)] == [True, True, False, False]
+    assert sampler(_record(line=11))
+    assert sampler({"exception": None, "extra": {}})
+
+    clock.now = 60
+    record = _record()
+    assert sampler(record)
+    assert record["extra"]["suppressed"] == 2
+
+
+def test_json_sink_writes_context_and_exception():
+    stream = io.StringIO()
+    handler_id = logger.add(
+        JsonSink(stream), format="{message}", enqueue=True, backtrace=False, diagnose=False
+    )
+    try:
+        with logger.contextualize(chat_id=42, from_lang="en", to_lang="it", update_started=0.0):
+            try:
+                raise RuntimeError("upstream down")
+            except RuntimeError:
+                logger.exception("Failed")
+        logger.complete()
+    finally:
+        logger.remove(handler_id)
+
+    entry = json.loads(stream.getvalue())
+    assert entry["message"] == "Failed"
+    assert entry["chat_id"] == 42
+    assert (entry["from_lang"], entry["to_lang"]) == ("en", "it")
+    assert entry["latency_ms"] > 0
+    exception = entry["exception"]
+    assert (exception["type"], exception["value"]) == ("RuntimeError", "upstream down")
+    assert exception["traceback"].startswith("Traceback (most recent call last):")
+    assert 'raise RuntimeError("upstream down")' in exception["traceback"]
+    assert exception["traceback"].endswith("RuntimeError: upstream down")
+
+
+def test_setup_logging_rejects_unknown_profiles():
+    try:
+        with pytest.raises(ValueError):
+            setup_logging("verbose")
+    finally:
+        setup_logging("dev")
@@ -0,0 +1,36 @@
+from dizionaut import metrics
+
+
+def _local(metric):
+    metrics.REGISTRY.remove(metric)
+    return metric
+
+
+def test_counter_renders_labelled_values():
+    counter = _local(metrics.Counter("test_total", "Test counter", labelnames=("status",)))
+    counter.labels("200").inc()
+    counter.labels("200").inc()
+    counter.labels("503").inc()
+    text = counter.render()
+    assert "# TYPE test_total counter" in text
+    assert 'test_total{status="200"} 2.0' in text
+    assert 'test_total{status="503"} 1.0' in text
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = _local(metrics.Histogram("test_seconds", "Test", buckets=(0.1, 1.0)))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    text = histogram.render()
+    assert 'test_seconds_bucket{le="0.1"} 2' in text
+    assert 'test_seconds_bucket{le="1.0"} 3' in text
+    assert 'test_seconds_bucket{le="+Inf"} 4' in text
+    assert "test_seconds_count 4" in text
+
+
+def test_render_includes_callback_metrics():
+    gauge = metrics.CallbackMetric("test_depth", "Test gauge", lambda: 7)
+    try:
+        assert "test_depth 7.0" in metrics.render()
+    finally:
+        metrics.REGISTRY.remove(gauge)
@@ -0,0 +1,112 @@
+import asyncio
+
+from dizionaut.services import api
+from dizionaut.services.cache import make_key
+from dizionaut.services.limits import UpstreamBudget
+from dizionaut.services.querylog import CachePrewarmer, QueryLog
+
+
+def test_query_log_counts_top_phrases_in_window(tmp_path, clock):
+    log = QueryLog(str(tmp_path / "queries.log"), clock=clock)
+
+    async def run():
+        log.record("en", "it", "old")
+        clock.now = 5000
+        for phrase in ["House", "house ", "cat", "house", "cat", "dog"]:
+            log.record("en", "it", phrase)
+        log.record("it", "en", "casa")
+        await log.flush()
+        return await log.top_phrases(window=3600, n=2)
+
+    top = asyncio.run(run())
+    assert top == {("en", "it"): ["house", "cat"], ("it", "en"): ["casa"]}
+
+
+def test_query_log_rotates_and_reads_backups(tmp_path):
+    path = tmp_path / "queries.log"
+    log = QueryLog(str(path), max_bytes=50, backups=2)
+
+    async def run():
+        for i in range(6):
+            log.record("en", "it", f"word{i % 2}")
+            await log.flush()
+        return await log.top_phrases(window=3600, n=5)
+
+    top = asyncio.run(run())
+    assert (tmp_path / "queries.log.1").exists()
+    assert not (tmp_path / "queries.log.3").exists()
+    assert set(top["en", "it"]) <= {"word0", "word1"}
+
+
+def test_prewarmer_fetches_missing_phrases_within_budget(tmp_path, monkeypatch):
+    log = QueryLog(str(tmp_path / "queries.log"))
+    fetched = []
+
+    async def fake_translate(from_lang, to_lang, phrase):
+        fetched.append(phrase)
+        api.get_budget().try_spend(len(phrase))
+        api.translation_cache.set(make_key(from_lang, to_lang, phrase), [])
+        return []
+
+    monkeypatch.setattr(api, "translate_text", fake_translate)
+    monkeypatch.setattr(api, "_budget", UpstreamBudget(requests_per_day=102))
+    api.translation_cache.clear()
+    api.translation_cache.set(make_key("en", "it", "cached"), [])
+
+    async def run():
+        for phrase in ["a", "a", "a", "b", "b", "cached", "c"]:
+            log.record("en", "it", phrase)
+        await log.flush()
+        prewarmer = CachePrewarmer(log, top_n=10, reserve=100, pause=0)
+        return await prewarmer.run_once()
+
+    assert asyncio.run(run()) == 2
+    assert fetched == ["a", "b"]
+    api.translation_cache.clear()
+
+
+def test_prewarmer_counts_only_cached_phrases(tmp_path, monkeypatch):
+    log = QueryLog(str(tmp_path / "queries.log"))
+
+    async def fake_translate(from_lang, to_lang, phrase):
+        if phrase == "a":
+            raise api.TranslationError("API request failed")
+        if phrase == "b":
+            raise api.NotFound("No translations found.")
+        return [({"translation": "c"}, 1.0)]
+
+    monkeypatch.setattr(api, "translate_text", fake_translate)
+    api.translation_cache.clear()
+
+    async def run():
+        for phrase in ["a", "b", "c"]:
+            log.record("en", "it", phrase)
+        await log.flush()
+        prewarmer = CachePrewarmer(log, top_n=10, pause=0)
+        return await prewarmer.run_once()
+
+    assert asyncio.run(run()) == 2
+
+
+def test_prewarmer_preserves_the_character_budget(tmp_path, monkeypatch):
+    log = QueryLog(str(tmp_path / "queries.log"))
+    fetched = []
+
+    async def fake_translate(from_lang, to_lang, phrase):
+        fetched.append(phrase)
+        api.get_budget().try_spend(len(phrase))
+        return []
+
+    monkeypatch.setattr(api, "translate_text", fake_translate)
+    monkeypatch.setattr(api, "_budget", UpstreamBudget(chars_per_day=1010))
+    api.translation_cache.clear()
+
+    async def run():
+        for phrase in ["house", "elephant"]:
+            log.record("en", "it", phrase)
+        await log.flush()
+        prewarmer = CachePrewarmer(log, top_n=10, chars_reserve=1000, pause=0)
+        return await prewarmer.run_once()
+
+    assert asyncio.run(run()) == 1
+    assert fetched == ["house"]
@@ -0,0 +1,157 @@
+import asyncio
+
+import httpx
+import pytest
+
+from dizionaut.services import api
+from dizionaut.services.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    LatencyTracker,
+    UpstreamPolicy,
+)
+
+
+def _client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_circuit_breaker_opens_and_recovers(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    clock.now = 10
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_latency_tracker_reports_quantile():
+    tracker = LatencyTracker(window=100, quantile=0.95, refresh_every=1)
+    for i in range(100):
+        tracker.add(i / 100)
+    assert tracker.estimate() == pytest.approx(0.95)
+
+
+def test_fetch_retries_server_errors(monkeypatch):
+    responses = iter([httpx.Response(503), httpx.Response(200, json={"matches": []})])
+    monkeypatch.setattr(api, "_client", _client(lambda r: next(responses)))
+    monkeypatch.setattr(api, "_policy", UpstreamPolicy(retries=1, backoff_base=0.001))
+
+    assert asyncio.run(api.fetch_translation_data("en", "it", "house")) == {"matches": []}
+
+
+def test_fetch_does_not_retry_client_errors(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(1)
+        return httpx.Response(404)
+
+    monkeypatch.setattr(api, "_client", _client(handler))
+    monkeypatch.setattr(api, "_policy", UpstreamPolicy(retries=3, backoff_base=0.001))
+
+    with pytest.raises(api.TranslationError):
+        asyncio.run(api.fetch_translation_data("en", "it", "house"))
+    assert len(calls) == 1
+
+
+def test_fetch_fails_fast_when_circuit_open(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    monkeypatch.setattr(api, "_client", _client(lambda r: httpx.Response(500)))
+    monkeypatch.setattr(api, "_policy", UpstreamPolicy(breaker=breaker))
+
+    with pytest.raises(api.TranslationError):
+        asyncio.run(api.fetch_translation_data("en", "it", "house"))
+    with pytest.raises(api.CircuitOpen):
+        asyncio.run(api.fetch_translation_data("en", "it", "house"))
+
+
+def test_client_errors_do_not_open_the_circuit(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    monkeypatch.setattr(api, "_client", _client(lambda r: httpx.Response(404)))
+    monkeypatch.setattr(api, "_policy", UpstreamPolicy(breaker=breaker))
+
+    for _ in range(3):
+        with pytest.raises(api.TranslationError) as error:
+            asyncio.run(api.fetch_translation_data("en", "it", "house"))
+        assert not isinstance(error.value, api.CircuitOpen)
+    assert breaker.state == CLOSED
+
+
+def test_fetch_hedges_slow_request(monkeypatch):
+    calls = []
+
+    async def handler(request):
+        calls.append(1)
+        if len(calls) == 1:
+            await asyncio.sleep(1)
+        return httpx.Response(200, json={"matches": [{"translation": str(len(calls))}]})
+
+    policy = UpstreamPolicy(hedge=True, hedge_min_delay=0.01)
+    policy.latency.add(0.01)
+    monkeypatch.setattr(api, "_client", _client(handler))
+    monkeypatch.setattr(api, "_policy", policy)
+
+    data = asyncio.run(api.fetch_translation_data("en", "it", "house"))
+    assert data["matches"][0]["translation"] == "2"
+
+
+def test_fetch_deadline_bounds_total_time(monkeypatch):
+    async def handler(request):
+        await asyncio.sleep(1)
+        return httpx.Response(200, json={})
+
+    monkeypatch.setattr(api, "_client", _client(handler))
+    monkeypatch.setattr(api, "_policy", UpstreamPolicy(deadline=0.05))
+
+    with pytest.raises(api.TranslationError):
+        asyncio.run(api.fetch_translation_data("en", "it", "house"))
+
+
+def test_cancelled_trial_releases_half_open_circuit(monkeypatch, clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+
+    async def hang(request):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(api, "_client", _client(hang))
+    monkeypatch.setattr(api, "_policy", UpstreamPolicy(breaker=breaker))
+
+    async def cancel_trial():
+        task = asyncio.create_task(api.fetch_translation_data("en", "it", "house"))
+        await asyncio.sleep(0.01)
+        assert breaker.state == HALF_OPEN
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_trial())
+    assert breaker.state == OPEN
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+
+
+def test_quota_exceeded_trial_releases_half_open_circuit(monkeypatch, clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+
+    async def over_quota(*args):
+        raise api.QuotaExceeded("Daily upstream budget exhausted")
+
+    monkeypatch.setattr(api, "_fetch_with_retries", over_quota)
+    monkeypatch.setattr(api, "_policy", UpstreamPolicy(breaker=breaker))
+
+    with pytest.raises(api.QuotaExceeded):
+        asyncio.run(api.fetch_translation_data("en", "it", "house"))
+    assert breaker.allow()
@@ -1,4 +1,3 @@
-import pytest
 from dizionaut.services import scoring
 
 
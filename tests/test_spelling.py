@@ -0,0 +1,130 @@
+from dizionaut.handlers.common import did_you_mean_keyboard
+import asyncio
+from datetime import datetime
+
+from aiogram import Bot
+from aiogram.types import Chat, Message
+
+from dizionaut.handlers import translate
+from dizionaut.services import api
+from dizionaut.services.cache import make_key
+from dizionaut.services.spelling import SpellIndex, SpellIndexes, edit_distance
+
+
+def test_edit_distance_counts_transpositions_and_caps_at_limit():
+    assert edit_distance("house", "house", 2) == 0
+    assert edit_distance("hosue", "house", 2) == 1
+    assert edit_distance("hous", "house", 2) == 1
+    assert edit_distance("cat", "house", 2) == 3
+
+
+def test_spell_index_suggests_close_phrases_by_distance_then_frequency():
+    index = SpellIndex()
+    index.add_many(["house", "horse", "mouse", "mouse", "hose", "elephant"])
+    assert "House" in index
+    assert index.suggest("hourse") == ["horse", "house", "mouse"]
+    assert index.suggest("houze") == ["house"]
+    assert index.suggest("mousse", limit=1) == ["mouse"]
+    assert index.suggest("elefant") == ["elephant"]
+    assert index.suggest("zzzzzz") == []
+    assert index.memory_bytes() > 0
+
+
+def test_spell_indexes_are_per_language():
+    indexes = SpellIndexes()
+    indexes.add("en", "house")
+    assert indexes.suggest("en", "hause") == ["house"]
+    assert indexes.suggest("it", "hause") == []
+    assert indexes.knows("en", "House")
+    assert indexes.stats()["en"]["phrases"] == 1
+
+
+def _message(text):
+    return Message(
+        message_id=1, date=datetime.now(), chat=Chat(id=5, type="private"), text=text
+    ).as_(Bot(token="42:TEST"))
+
+
+def test_suggestions_are_offered_only_when_nothing_is_found(monkeypatch):
+    indexes = SpellIndexes()
+    indexes.add("en", "house")
+    monkeypatch.setattr(translate, "spelling", indexes)
+
+    async def fake_translate(from_lang, to_lang, phrase):
+        if phrase == "horse":
+            return [({"translation": "cavallo"}, 0.9)]
+        raise api.NotFound("No translations found.")
+
+    monkeypatch.setattr(translate, "translate_text", fake_translate)
+
+    def run(phrase):
+        return asyncio.run(
+            translate.handle_text_input(
+                _message(phrase), None, "en", "it", phrase,
+                stateless=True, spellcheck=True, webhook_reply=True,
+            )
+        )
+
+    method = run("horse")
+    assert "cavallo" in method.text
+
+    method = run("hosue")
+    assert "Did you mean" in method.text
+    assert method.reply_markup.inline_keyboard[0][0].callback_data == "dym:en:it:house"
+
+
+def test_cached_close_forms_are_offered_before_any_upstream_call(monkeypatch):
+    indexes = SpellIndexes()
+    monkeypatch.setattr(translate, "spelling", indexes)
+    monkeypatch.setattr(api, "spelling", indexes)
+    api.translation_cache.clear()
+    api._remember(make_key("en", "it", "house"), [({"translation": "casa"}, 0.9)])
+    calls = []
+
+    async def fake_translate(from_lang, to_lang, phrase):
+        calls.append(phrase)
+        return api.translation_cache.get(make_key(from_lang, to_lang, phrase))
+
+    monkeypatch.setattr(translate, "translate_text", fake_translate)
+
+    method = asyncio.run(
+        translate.handle_text_input(
+            _message("hosue"), None, "en", "it", "hosue",
+            stateless=True, spellcheck=True, webhook_reply=True,
+        )
+    )
+    assert calls == []
+    assert "Did you mean" in method.text
+    data = [row[0].callback_data for row in method.reply_markup.inline_keyboard[:2]]
+    assert data == ["dym:en:it:house", "dym:en:it:hosue"]
+
+    method = asyncio.run(
+        translate.handle_text_input(
+            _message("house"), None, "en", "it", "house",
+            stateless=True, spellcheck=True, webhook_reply=True,
+        )
+    )
+    assert calls == ["house"]
+    assert "casa" in method.text
+    api.translation_cache.clear()
+
+
+def test_spell_index_drops_least_recently_used_phrases():
+    index = SpellIndex(max_phrases=2)
+    index.add_many(["house", "horse"])
+    index.add("house")
+    index.add("mouse")
+    assert len(index) == 2
+    assert "horse" not in index
+    assert index.evictions == 1
+    assert all("horse" not in phrases for phrases in index.deletes.values())
+    for i in range(100):
+        index.add(f"word{i}")
+    assert len(index) == 2
+    assert set(index.deletes) == set().union(*(index._variants(w) for w in index.words))
+
+
+def test_did_you_mean_keyboard_skips_oversized_callback_data():
+    keyboard = did_you_mean_keyboard("en", "it", ["horse", "h" * 60, "house"])
+    data = [row[0].callback_data for row in keyboard.inline_keyboard]
+    assert data == ["dym:en:it:horse", "dym:en:it:house"]
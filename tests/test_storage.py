@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+import pytest
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from dizionaut.states import TranslateState
+from dizionaut.storage import SQLiteStorage, create_storage
+
+KEY = StorageKey(bot_id=1, chat_id=2, user_id=3)
+
+
+def test_sqlite_storage_round_trip(tmp_path):
+    async def run():
+        storage = SQLiteStorage(str(tmp_path / "fsm.sqlite3"))
+        await storage.set_state(KEY, TranslateState.word)
+        await storage.update_data(KEY, {"from_lang": "en"})
+        await storage.update_data(KEY, {"to_lang": "it"})
+        result = await storage.get_state(KEY), await storage.get_data(KEY)
+        await storage.close()
+        return result
+
+    state, data = asyncio.run(run())
+    assert state == TranslateState.word.state
+    assert data == {"from_lang": "en", "to_lang": "it"}
+
+
+def test_sqlite_storage_evicts_idle_state(tmp_path, monkeypatch):
+    async def run():
+        storage = SQLiteStorage(str(tmp_path / "fsm.sqlite3"), ttl=60)
+        await storage.set_data(KEY, {"word": "house"})
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 120)
+        data = await storage.get_data(KEY)
+        removed = await storage.sweep()
+        await storage.close()
+        return data, removed
+
+    assert asyncio.run(run()) == ({}, 1)
+
+
+def test_sqlite_storage_does_not_resurrect_expired_columns(tmp_path, monkeypatch):
+    async def run():
+        storage = SQLiteStorage(str(tmp_path / "fsm.sqlite3"), ttl=60, sweep_interval=3600)
+        await storage.set_state(KEY, TranslateState.word)
+        await storage.set_data(KEY, {"from_lang": "en"})
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 120)
+        await storage.set_state(KEY, TranslateState.word)
+        data = await storage.get_data(KEY)
+        monkeypatch.setattr(time, "time", lambda: now + 240)
+        await storage.update_data(KEY, {"to_lang": "it"})
+        state = await storage.get_state(KEY)
+        await storage.close()
+        return data, state
+
+    assert asyncio.run(run()) == ({}, None)
+
+
+def test_create_storage_selects_backend(tmp_path):
+    assert isinstance(create_storage(None, ttl=60), MemoryStorage)
+    storage = create_storage(f"sqlite:///{tmp_path}/fsm.sqlite3", ttl=60)
+    assert isinstance(storage, SQLiteStorage)
+    asyncio.run(storage.close())
+    with pytest.raises(ValueError):
+        create_storage("mongodb://localhost", ttl=60)
@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+import httpx
+
+from dizionaut.services import api
+from dizionaut.services.store import TranslationStore
+
+KEY = ("en", "it", "house")
+MATCHES = [{"translation": "casa", "match": 1, "quality": 80}]
+
+
+def test_store_persists_batched_writes(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+
+    async def write():
+        store = TranslationStore(path)
+        await store.open()
+        store.put(KEY, MATCHES)
+        await store.close()
+
+    async def read():
+        store = TranslationStore(path)
+        await store.open()
+        try:
+            return await store.get(KEY), await store.load_recent(10)
+        finally:
+            await store.close()
+
+    asyncio.run(write())
+    stored, recent = asyncio.run(read())
+    assert stored[0] == MATCHES
+    assert recent[0][0] == KEY
+
+
+def test_store_compact_removes_expired_entries(tmp_path):
+    async def run():
+        store = TranslationStore(str(tmp_path / "store.sqlite3"), max_age=60)
+        await store.open()
+        store._pending[KEY] = (MATCHES, time.time() - 120)
+        await store.flush()
+        removed = await store.compact()
+        result = await store.get(KEY)
+        await store.close()
+        return removed, result
+
+    assert asyncio.run(run()) == (1, None)
+
+
+def test_translate_text_serves_stale_entry_when_upstream_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        api, "_client", httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(503)))
+    )
+    api.translation_cache.clear()
+
+    async def run():
+        store = TranslationStore(str(tmp_path / "store.sqlite3"), ttl=60)
+        await store.open()
+        store._pending[KEY] = (MATCHES, time.time() - 120)
+        await store.flush()
+        api.set_store(store)
+        try:
+            result = await api.translate_text("en", "it", "house")
+            await asyncio.gather(*api._refreshing.values())
+            return result
+        finally:
+            api.set_store(None)
+            await store.close()
+
+    result = asyncio.run(run())
+    assert result[0][0]["translation"] == "casa"
+    api.translation_cache.clear()
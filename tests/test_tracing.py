@@ -0,0 +1,40 @@
+import os
+import time
+
+from dizionaut import tracing
+from dizionaut.profiler import SamplingProfiler
+
+
+def test_span_is_noop_without_trace():
+    with tracing.span("fetch") as s:
+        pass
+    assert s is tracing._NO_SPAN
+
+
+def test_span_records_into_current_trace():
+    trace = tracing.Trace(update_id=1)
+    token = tracing.current_trace.set(trace)
+    try:
+        with tracing.span("fetch"):
+            pass
+        with tracing.span("send"):
+            pass
+    finally:
+        tracing.current_trace.reset(token)
+    assert [name for name, _, _ in trace.spans] == ["fetch", "send"]
+    assert "fetch@" in trace.breakdown()
+
+
+def test_sampling_profiler_writes_collapsed_stacks(tmp_path):
+    path = str(tmp_path / "out" / "profile.folded")
+    profiler = SamplingProfiler(interval=0.001)
+    assert profiler.start(0.05, path)
+    assert not profiler.start(0.05, path)
+    deadline = time.monotonic() + 0.1
+    while time.monotonic() < deadline:
+        sum(range(1000))
+    profiler._thread.join()
+    with open(path) as f:
+        line = f.readline()
+    assert os.path.exists(path)
+    assert line.rsplit(" ", 1)[1].strip().isdigit()
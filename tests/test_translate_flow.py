@@ -0,0 +1,237 @@
+import asyncio
+from datetime import datetime
+
+from aiogram import Bot
+from aiogram.methods import SendMessage
+from aiogram.types import Chat, Message
+
+from dizionaut.handlers import translate
+from dizionaut.handlers.common import restart_keyboard_for
+from dizionaut.handlers.translate import WORD_PROMPT, WORD_PROMPT_PATTERN
+from dizionaut.languages import to_keyboard
+from dizionaut.updates import webhook_reply_payload
+
+
+def test_word_prompt_carries_language_pair():
+    prompt = WORD_PROMPT.format(from_lang="en", to_lang="it")
+    assert WORD_PROMPT_PATTERN.search(prompt).groups() == ("en", "it")
+
+
+def test_target_keyboard_encodes_pair_in_callback_data():
+    keyboard = to_keyboard("en")
+    data = [row[0].callback_data for row in keyboard.inline_keyboard]
+    assert "to:en:it" in data
+    assert "to:en:en" not in data
+
+
+def test_restart_keyboard_for_carries_pair():
+    keyboard = restart_keyboard_for("en", "it")
+    assert keyboard.inline_keyboard[1][0].callback_data == "retry_word:en:it"
+
+
+def test_translation_and_buttons_are_one_reply_for_the_webhook(monkeypatch):
+    async def fake_translate(from_lang, to_lang, phrase):
+        return [({"translation": "casa"}, 0.9)]
+
+    monkeypatch.setattr(translate, "translate_text", fake_translate)
+    bot = Bot(token="42:TEST")
+    message = Message(
+        message_id=1,
+        date=datetime.now(),
+        chat=Chat(id=5, type="private"),
+        text="house",
+    ).as_(bot)
+
+    method = asyncio.run(
+        translate.handle_text_input(
+            message, None, "en", "it", "house", stateless=True, webhook_reply=True
+        )
+    )
+    assert isinstance(method, SendMessage)
+    assert "casa" in method.text
+    assert method.reply_markup is restart_keyboard_for("en", "it")
+
+    payload = webhook_reply_payload(bot, method)
+    assert payload["method"] == "sendMessage"
+    assert payload["chat_id"] == 5
+    assert payload["reply_markup"]["inline_keyboard"][1][0]["callback_data"] == "retry_word:en:it"
+
+
+def test_long_results_are_paged_by_lookup_id():
+    translations = [({"translation": f"word{i}"}, 1 - i / 100) for i in range(12)]
+    keyboard = restart_keyboard_for("en", "it")
+
+    text, markup = translate.render_page("en", "it", translations, 1, "abc", keyboard)
+    assert "word0" in text and "word5" not in text
+    assert "1/3" in text
+    assert [b.callback_data for b in markup.inline_keyboard[0]] == ["page:abc:2"]
+    assert markup.inline_keyboard[1:] == keyboard.inline_keyboard
+
+    text, markup = translate.render_page("en", "it", translations, 3, "abc", keyboard)
+    assert "word10" in text and "word9" not in text
+    assert [b.callback_data for b in markup.inline_keyboard[0]] == ["page:abc:2"]
+    assert markup.inline_keyboard[0][0].text == "◂ back"
+
+    text, markup = translate.render_page("en", "it", translations[:3], 1, None, keyboard)
+    assert "1/" not in text
+    assert markup is keyboard
+
+
+def test_pages_come_from_saved_results_without_a_new_lookup(monkeypatch):
+    from aiogram.fsm.context import FSMContext
+    from aiogram.fsm.storage.base import StorageKey
+    from aiogram.fsm.storage.memory import MemoryStorage
+
+    async def fail_translate(*args):
+        raise AssertionError("paging must not look up again")
+
+    monkeypatch.setattr(translate, "translate_text", fail_translate)
+    translations = [({"translation": f"word{i}"}, 1 - i / 100) for i in range(12)]
+    state = FSMContext(MemoryStorage(), StorageKey(bot_id=1, chat_id=5, user_id=5))
+    edits, answers = [], []
+
+    class FakeMessage:
+        async def edit_text(self, text, reply_markup=None):
+            edits.append((text, reply_markup))
+
+    class FakeCallback:
+        message = FakeMessage()
+
+        def __init__(self, data):
+            self.data = data
+
+        async def answer(self, text=None):
+            answers.append(text)
+
+    async def run():
+        ids = [await translate.save_results(state, "en", "it", translations) for _ in range(4)]
+        await translate.handle_page(FakeCallback(f"page:{ids[-1]}:2"), state, stateless=True)
+        await translate.handle_page(FakeCallback(f"page:{ids[0]}:2"), state)
+        await translate.handle_page(FakeCallback("page:en:it:2:house"), state)
+        return await state.get_data()
+
+    assert asyncio.run(run()) == {}
+    text, markup = edits[0]
+    assert "word5" in text and "2/3" in text
+    assert markup.inline_keyboard[-1][0].callback_data == "retry_word:en:it"
+    assert len(edits) == 1
+    assert answers[1:] == ["⌛ These results have expired, please search again."] * 2
+
+
+def test_non_text_message_as_the_word_asks_for_text(monkeypatch):
+    from aiogram import Dispatcher
+    from aiogram.fsm.storage.memory import MemoryStorage
+    from aiogram.types import Sticker, Update, User
+
+    from dizionaut.states import TranslateState
+
+    bot = Bot(token="42:TEST")
+    dp = Dispatcher(storage=MemoryStorage(), webhook_reply=True)
+    # The router may already be attached to the app's dispatcher
+    monkeypatch.setattr(translate.router, "_parent_router", None)
+    dp.include_router(translate.router)
+    sticker = Sticker(
+        file_id="s", file_unique_id="s", type="regular",
+        width=1, height=1, is_animated=False, is_video=False,
+    )
+    update = Update(
+        update_id=1,
+        message=Message(
+            message_id=1,
+            date=datetime.now(),
+            chat=Chat(id=5, type="private"),
+            from_user=User(id=5, is_bot=False, first_name="A"),
+            sticker=sticker,
+        ),
+    )
+
+    async def run():
+        state = dp.fsm.get_context(bot, chat_id=5, user_id=5)
+        await state.set_state(TranslateState.word)
+        await state.set_data({"from_lang": "en", "to_lang": "it"})
+        return await dp.feed_update(bot, update)
+
+    method = asyncio.run(run())
+    assert isinstance(method, SendMessage)
+    assert "text message" in method.text
+
+
+def test_old_target_buttons_without_the_source_language(monkeypatch):
+    from aiogram.fsm.context import FSMContext
+    from aiogram.fsm.storage.base import StorageKey
+    from aiogram.fsm.storage.memory import MemoryStorage
+
+    edits, answers = [], []
+
+    class FakeMessage:
+        async def edit_text(self, text, reply_markup=None):
+            edits.append(text)
+
+    class FakeCallback:
+        message = FakeMessage()
+        data = "to:it"
+
+        async def answer(self, text=None, show_alert=None):
+            answers.append(text)
+
+    async def run(data):
+        state = FSMContext(MemoryStorage(), StorageKey(bot_id=1, chat_id=5, user_id=5))
+        await state.set_data(data)
+        await translate.handle_to_lang(FakeCallback(), state)
+        return await state.get_data()
+
+    assert asyncio.run(run({})) == {}
+    assert "/start" in answers[-1]
+    assert not edits
+
+    assert asyncio.run(run({"from_lang": "en"})) == {"from_lang": "en", "to_lang": "it"}
+    assert edits == ["✏️ Please enter a word to translate:"]
+
+
+def test_batch_rows_tell_not_found_from_unavailable(monkeypatch):
+    from dizionaut.services.api import NotFound, QuotaExceeded
+
+    async def fake_many(from_lang, to_lang, phrases, concurrency):
+        yield "cat", [({"translation": "gatto"}, 0.9)]
+        yield "xyzzy", NotFound("No translations found.")
+        yield "dog", QuotaExceeded("Daily upstream budget exhausted")
+
+    monkeypatch.setattr(translate, "translate_many", fake_many)
+    sent = []
+
+    class FakeMessage:
+        async def answer(self, text):
+            sent.append(text)
+            return self
+
+        async def edit_text(self, text, reply_markup=None):
+            sent.append(text)
+
+    asyncio.run(translate.translate_batch(FakeMessage(), "en", "it", ["cat", "xyzzy", "dog"], 2))
+    assert "xyzzy → not found" in sent[-1]
+    assert "dog → unavailable, try later" in sent[-1]
+
+
+def test_single_phrase_is_looked_up_deduplicated_and_blank_input_is_not(monkeypatch):
+    looked_up = []
+
+    async def fake_translate(from_lang, to_lang, phrase):
+        looked_up.append(phrase)
+        return [({"translation": "casa"}, 0.9)]
+
+    monkeypatch.setattr(translate, "translate_text", fake_translate)
+
+    def run(text):
+        message = Message(
+            message_id=1, date=datetime.now(), chat=Chat(id=5, type="private"), text=text
+        ).as_(Bot(token="42:TEST"))
+        return asyncio.run(
+            translate.handle_text_input(
+                message, None, "en", "it", text, stateless=True, webhook_reply=True
+            )
+        )
+
+    assert "casa" in run("house\n House ").text
+    assert looked_up == ["house"]
+    assert "enter a word" in run(" \n ").text
+    assert looked_up == ["house"]
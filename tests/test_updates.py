@@ -0,0 +1,41 @@
+import asyncio
+
+from aiogram.types import Update
+
+from dizionaut.updates import UpdateQueue
+
+
+class FakeDispatcher:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.handled = []
+
+    async def feed_update(self, bot, update):
+        await asyncio.sleep(self.delay)
+        self.handled.append(update.update_id)
+
+
+def test_update_queue_drains_on_stop():
+    dp = FakeDispatcher(delay=0.01)
+
+    async def run():
+        queue = UpdateQueue(dp, bot=None, workers=2, maxsize=10)
+        queue.start()
+        for i in range(5):
+            assert queue.try_put(Update(update_id=i))
+        await queue.stop(timeout=1)
+        assert not queue.try_put(Update(update_id=99))
+
+    asyncio.run(run())
+    assert sorted(dp.handled) == [0, 1, 2, 3, 4]
+
+
+def test_update_queue_rejects_when_full():
+    async def run():
+        queue = UpdateQueue(FakeDispatcher(), bot=None, workers=1, maxsize=1)
+        queue._accepting = True  # accept without workers so the queue stays full
+        assert queue.try_put(Update(update_id=1))
+        assert not queue.try_put(Update(update_id=2))
+        return queue.rejected
+
+    assert asyncio.run(run()) == 1
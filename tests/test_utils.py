@@ -1,4 +1,4 @@
-from dizionaut.utils import format_translation_result
+from dizionaut.utils import format_translation_result, truncate_utf16
 
 def test_format_translation_result_basic():
     translations = [
@@ -19,3 +19,28 @@ def test_format_translation_result_basic():
     assert "🟢 gatto (82%)" in result
     assert "🟡 micio (70%)" in result
     assert "🇮🇹 Italian → 🇬🇧 English" in result
+
+
+def test_format_batch_result_marks_pending_and_failed_rows():
+    from dizionaut.utils import format_batch_result
+
+    rows = [
+        ("cat", [({"translation": "gatto"}, 0.82)]),
+        ("dog", None),
+        ("xyzzy", []),
+        ("bird", TimeoutError()),
+    ]
+    result = format_batch_result(
+        rows, "en", "it", lang_name_fn=lambda c: c, quality_marker_fn=lambda s: "🟢"
+    )
+    assert "🟢 cat → gatto (82%)" in result
+    assert "⏳ dog" in result
+    assert "⚠️ xyzzy → not found" in result
+    assert "⛔ bird → unavailable, try later" in result
+
+
+def test_truncate_utf16_counts_emoji_as_two_units_and_keeps_pairs_whole():
+    assert truncate_utf16("abc", 3) == "abc"
+    assert truncate_utf16("🟢🟢", 3) == "🟢"
+    assert truncate_utf16("a🟢b", 2) == "a"
+    assert len(truncate_utf16("🟢" * 3000, 4096).encode("utf-16-le")) == 2 * 4096